@@ -1,7 +1,17 @@
-from infrastructure.models import EventModel, MediaModel
-from infrastructure.metadata_utils import MetadataExtractor
+from infrastructure.models import EventModel, EventCounter, MediaModel
+from infrastructure import media_pipeline, regions
+from inehss.models import HazardReport
+from interfaces.broadcast import queue_events_created
+from domain.entities import EventSeverity, EventStatus
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
-import hashlib
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from datetime import datetime, timedelta
+from collections import Counter
+import time
 
 class EventReportingService:
     @staticmethod
@@ -13,34 +23,210 @@ class EventReportingService:
             # 1. Create Event
             event = EventModel.objects.create(**data)
 
-            # 2. Process Files
-            media_instances = []
+            # 2. Store files; hashing and metadata extraction run in the
+            # media pipeline once the transaction commits
             for file in files:
-                # Calculate hash for integrity (basic implementation)
-                # Note: In production, large files should be chunked or hashed on client
-                file_hash = EventReportingService._calculate_hash(file)
-                
-                # Determine type based on content_type
-                file_type = 'image'
-                if 'video' in file.content_type:
-                    file_type = 'video'
-                elif 'audio' in file.content_type:
-                    file_type = 'audio'
-
                 media = MediaModel.objects.create(
                     event=event,
                     file=file,
-                    file_type=file_type,
-                    file_hash=file_hash,
-                    metadata=MetadataExtractor.extract_from_file(file)
+                    file_type=media_pipeline.file_type_for(file.content_type),
+                    metadata={'original_filename': file.name, 'content_type': file.content_type},
                 )
-                media_instances.append(media)
+                media_pipeline.enqueue(media.id, header=getattr(file, 'header', None))
             
             return event
     
+
+    @staticmethod
+    def bulk_create_events(rows, batch_size=1000):
+        """
+        Insert many validated events in one transaction with chunked bulk_create.
+
+        bulk_create skips save() and post_save, so the geohash, region code and
+        counter buckets are filled here, and the events are queued for
+        broadcast in one go once the transaction commits.
+        Returns the created events.
+        """
+        events = []
+        for row in rows:
+            event = EventModel(**row)
+            event.assign_geohash()
+            event.assign_region()
+            events.append(event)
+
+        counter_deltas = Counter()
+        created = []
+        with transaction.atomic():
+            for start in range(0, len(events), batch_size):
+                created.extend(EventModel.objects.bulk_create(events[start:start + batch_size]))
+            # created_at is only final after the insert
+            for event in created:
+                counter_deltas[EventCounter.bucket_for(event)] += 1
+            EventCounter.apply_deltas(counter_deltas)
+            transaction.on_commit(EventStatsService.invalidate)
+            queue_events_created([event.pk for event in created])
+        return created
+
+
+class EventStatsService:
+    """
+    Aggregated event counts for the HUD, served from a versioned cache snapshot.
+
+    The snapshot key embeds a version number. EventModel signals bump the
+    version, so the next read recomputes with one aggregate query while
+    unchanged data costs no queries at all.
+    """
+    VERSION_KEY = 'event_stats:version'
+    SNAPSHOT_KEY = 'event_stats:summary:v{version}'
+
+    @staticmethod
+    def get_summary():
+        version = EventStatsService._current_version()
+        key = EventStatsService.SNAPSHOT_KEY.format(version=version)
+        summary = cache.get(key)
+        if summary is None:
+            summary = EventStatsService.compute_summary()
+            cache.set(key, summary, settings.STATS_SNAPSHOT_TTL)
+        return summary
+
+    @staticmethod
+    def compute_summary():
+        """
+        Compute all HUD counts with a single conditional-aggregation query
+        over the EventCounter buckets (O(buckets), not O(events)).
+        """
+        totals = EventCounter.objects.aggregate(
+            total=Sum('count'),
+            critical=Sum('count', filter=Q(severity=EventSeverity.CRITICAL.value)),
+            high=Sum('count', filter=Q(severity=EventSeverity.HIGH.value)),
+            # Simulated events use the upper-case label
+            verified=Sum('count', filter=Q(status__in=[EventStatus.VERIFIED.value, 'VERIFIED'])),
+        )
+        return {key: value or 0 for key, value in totals.items()}
+
+    @staticmethod
+    def invalidate():
+        """Move to a new snapshot version; old snapshots simply expire."""
+        try:
+            cache.incr(EventStatsService.VERSION_KEY)
+        except ValueError:
+            EventStatsService._current_version()
+
     @staticmethod
-    def _calculate_hash(file_obj):
-        sha256 = hashlib.sha256()
-        for chunk in file_obj.chunks():
-            sha256.update(chunk)
-        return sha256.hexdigest()
+    def _current_version():
+        # Seed with a timestamp so an evicted counter never reuses an old version
+        cache.add(EventStatsService.VERSION_KEY, int(time.time() * 1000), None)
+        return cache.get(EventStatsService.VERSION_KEY)
+
+    TIMESERIES_BUCKETS = {
+        'hour': (TruncHour, timedelta(hours=1)),
+        'day': (TruncDay, timedelta(days=1)),
+    }
+
+    @staticmethod
+    def timeseries(bucket, start, end, category=None, queryset=None):
+        """
+        Event counts per time bucket and severity between start and end.
+
+        Day buckets without a custom queryset are read from EventCounter;
+        otherwise a Trunc* GROUP BY runs over `events.created_at`.
+        Returns a zero-filled list of {'bucket', 'total', 'severity'} dicts.
+        """
+        trunc, step = EventStatsService.TIMESERIES_BUCKETS[bucket]
+        tz = timezone.get_current_timezone()
+        first = EventStatsService._truncate(start, bucket, tz)
+        last = EventStatsService._truncate(end, bucket, tz)
+
+        counts = {}
+        if bucket == 'day' and queryset is None:
+            rows = EventCounter.objects.filter(day__gte=first.date(), day__lte=last.date())
+            if category:
+                rows = rows.filter(category=category)
+            rows = rows.values('day', 'severity').annotate(total=Sum('count'))
+            for row in rows:
+                day_start = timezone.make_aware(datetime.combine(row['day'], datetime.min.time()), tz)
+                counts[(day_start, row['severity'])] = row['total']
+        else:
+            rows = (queryset if queryset is not None else EventModel.objects.all()).filter(
+                created_at__gte=first, created_at__lt=last + step
+            )
+            if category:
+                rows = rows.filter(category=category)
+            rows = (
+                rows.annotate(bucket=trunc('created_at', tzinfo=tz))
+                .values('bucket', 'severity')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            for row in rows:
+                counts[(row['bucket'], row['severity'])] = row['total']
+
+        levels = [tag.value for tag in EventSeverity]
+        series = []
+        current = first
+        while current <= last:
+            breakdown = {level: counts.get((current, level), 0) for level in levels}
+            series.append({
+                'bucket': current,
+                'total': sum(breakdown.values()),
+                'severity': breakdown,
+            })
+            current += step
+        return series
+
+    @staticmethod
+    def _truncate(value, bucket, tz):
+        value = timezone.localtime(value, tz)
+        if bucket == 'day':
+            return value.replace(hour=0, minute=0, second=0, microsecond=0)
+        return value.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def region_counts(level='country', parent=None, category=None):
+        """
+        Event and hazard report counts per administrative region.
+
+        Rows are grouped by the stored `region_code` in the database and rolled
+        up to the requested level ('country', 'state' or 'lga') in Python;
+        `parent` restricts the result to regions under that code.
+        Returns dicts sorted by event count, descending.
+        """
+        index = regions.get_region_index()
+        levels = [tag.value for tag in EventSeverity]
+        result = {}
+
+        def bucket(code):
+            region = regions.region_ancestor(code, level)
+            if not region or (parent and not (region == parent or region.startswith(parent + '.'))):
+                return None
+            if region not in result:
+                result[region] = {
+                    'code': region,
+                    'name': index.names.get(region, region),
+                    'events': 0,
+                    'severity': {value: 0 for value in levels},
+                    'hazard_reports': 0,
+                }
+            return result[region]
+
+        events = EventModel.objects.exclude(region_code='')
+        if parent:
+            events = events.filter(region_code__startswith=parent)
+        if category:
+            events = events.filter(category=category)
+        for row in events.values('region_code', 'severity').annotate(total=Count('id')).order_by():
+            entry = bucket(row['region_code'])
+            if entry is not None:
+                entry['events'] += row['total']
+                if row['severity'] in entry['severity']:
+                    entry['severity'][row['severity']] += row['total']
+
+        reports = HazardReport.objects.exclude(region_code='')
+        if parent:
+            reports = reports.filter(region_code__startswith=parent)
+        for row in reports.values('region_code').annotate(total=Count('id')).order_by():
+            entry = bucket(row['region_code'])
+            if entry is not None:
+                entry['hazard_reports'] += row['total']
+
+        return sorted(result.values(), key=lambda entry: (-entry['events'], entry['code']))
@@ -56,13 +56,64 @@ INSTALLED_APPS = [
 # Django Channels configuration
 ASGI_APPLICATION = 'config.asgi.application'
 
-# Channel layer - using in-memory for demo
-# For production, use Redis: channels_redis.core.RedisChannelLayer
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+# Channel layer - in-memory by default, which only reaches clients of the
+# sending process. Running several workers needs a shared layer: set
+# CHANNEL_LAYER_PATH to a SQLite file for workers on one host, or
+# REDIS_CHANNEL_URL (requires channels_redis) for several hosts.
+if os.getenv('REDIS_CHANNEL_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.getenv('REDIS_CHANNEL_URL')]},
+        }
     }
-}
+elif os.getenv('CHANNEL_LAYER_PATH'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'infrastructure.channel_layer.SQLiteChannelLayer',
+            'CONFIG': {
+                'path': os.getenv('CHANNEL_LAYER_PATH'),
+                'poll_interval': int(os.getenv('CHANNEL_LAYER_POLL_MS', 10)) / 1000,
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer'
+        }
+    }
+# Real-time broadcasts are batched: flushed this long after the first change,
+# or once this many changes are waiting. 0 ms flushes inline on commit.
+REALTIME_BATCH_INTERVAL_MS = int(os.getenv('REALTIME_BATCH_INTERVAL_MS', 100))
+REALTIME_BATCH_SIZE = int(os.getenv('REALTIME_BATCH_SIZE', 200))
+# Recent changes kept for reconnecting clients, and the most one resume may replay
+CHANGE_LOG_SIZE = int(os.getenv('CHANGE_LOG_SIZE', 10000))
+REALTIME_REPLAY_LIMIT = int(os.getenv('REALTIME_REPLAY_LIMIT', 1000))
+# A logged change not broadcast within this long is taken to be lost with its
+# process and no longer holds back the seq frames carry
+REALTIME_FLUSH_GRACE_SECONDS = int(os.getenv('REALTIME_FLUSH_GRACE_SECONDS', 60))
+
+# Cache - files in CACHE_DIR by default, shared by all worker processes on
+# one host so cache invalidation (e.g. the stats snapshot) reaches every
+# worker. Deployments spanning several hosts should set REDIS_CACHE_URL.
+if os.getenv('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')),
+        }
+    }
+
+# Upper bound (seconds) on how long a cached stats snapshot is served
+STATS_SNAPSHOT_TTL = int(os.getenv('STATS_SNAPSHOT_TTL', '300'))
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
@@ -147,6 +198,41 @@ STATIC_URL = 'static/'
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Uploads are hashed as they stream in; large ones spool to UPLOAD_TEMP_DIR.
+# It sits beside MEDIA_ROOT (same filesystem, so saving is a rename rather
+# than a copy) but outside it, so partial files are never served. The upload
+# handlers create it on first use.
+FILE_UPLOAD_HANDLERS = [
+    'infrastructure.upload_handlers.HashingMemoryFileUploadHandler',
+    'infrastructure.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+UPLOAD_TEMP_DIR = os.getenv('UPLOAD_TEMP_DIR', str(BASE_DIR / 'upload_tmp'))
+# Partial files of resumable (chunked) uploads
+RESUMABLE_UPLOAD_DIR = os.getenv('RESUMABLE_UPLOAD_DIR', os.path.join(UPLOAD_TEMP_DIR, 'resumable'))
+RESUMABLE_UPLOAD_MAX_SIZE = int(os.getenv('RESUMABLE_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024))
+# Unfinished resumable uploads one user (or one anonymous report) may hold at once
+RESUMABLE_UPLOAD_MAX_OPEN_SESSIONS = int(os.getenv('RESUMABLE_UPLOAD_MAX_OPEN_SESSIONS', 5))
+RESUMABLE_UPLOAD_MAX_OPEN_BYTES = int(os.getenv('RESUMABLE_UPLOAD_MAX_OPEN_BYTES', 4 * 1024 * 1024 * 1024))
+# Lifetime (seconds) of the upload token returned with a new public report
+REPORT_UPLOAD_TOKEN_MAX_AGE = int(os.getenv('REPORT_UPLOAD_TOKEN_MAX_AGE', 72 * 3600))
+# Threads hashing/inspecting uploaded media in the background; 0 runs jobs inline
+MEDIA_PIPELINE_WORKERS = int(os.getenv('MEDIA_PIPELINE_WORKERS', 2))
+
+# Administrative boundaries used to assign region codes (finest layer first).
+# Defaults to the GeoJSON files shipped with the frontend.
+REGION_BOUNDARY_DIR = Path(os.getenv('REGION_BOUNDARY_DIR', BASE_DIR.parent.parent / 'frontend' / 'public'))
+REGION_BOUNDARY_LAYERS = [
+    {
+        'path': REGION_BOUNDARY_DIR / 'nigeria_optimized.json',
+        'code_property': 'ID_2',
+        'name_property': 'NAME_2',
+        'state_property': 'NAME_1',
+    },
+    {
+        'path': REGION_BOUNDARY_DIR / 'world.geojson',
+        'name_property': 'name',
+    },
+]
 
 # CORS - Restrict to specific origins
 CORS_ALLOWED_ORIGINS = os.getenv(
@@ -178,6 +264,9 @@ REST_FRAMEWORK = {
         'anon': '100/day',
         'user': '1000/day',
         'login': '5/minute',
+        'uploads': '5000/hour',
+        'upload_sessions': '30/hour',
+        'bulk_ingest': '600/hour',
     },
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -0,0 +1,33 @@
+"""
+Management command to discard abandoned resumable uploads.
+"""
+
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from inehss.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = 'Deletes unfinished upload sessions (and their partial files) idle for longer than --max-age-hours'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-hours', type=float, default=72, help='Idle time before a session is discarded')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['max_age_hours'])
+        # A finalizing session this old lost its request midway
+        stale = UploadSession.objects.filter(status__in=['uploading', 'finalizing'], updated_at__lt=cutoff)
+
+        freed = 0
+        count = 0
+        for session in stale:
+            if os.path.exists(session.partial_path):
+                freed += os.path.getsize(session.partial_path)
+                os.remove(session.partial_path)
+            session.delete()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Discarded {count} upload sessions ({freed} bytes)'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inehss', '0004_officerassignment_lifecycle_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hazardreport',
+            name='region_code',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=32),
+        ),
+    ]
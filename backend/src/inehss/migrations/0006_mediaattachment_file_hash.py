@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:14
+
+import infrastructure.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inehss', '0005_hazardreport_region_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaattachment',
+            name='file_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='mediaattachment',
+            name='file',
+            field=models.FileField(storage=infrastructure.storage.get_content_storage, upload_to='inehss/attachments/%Y/%m/'),
+        ),
+    ]
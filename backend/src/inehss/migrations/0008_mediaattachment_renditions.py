@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inehss', '0007_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaattachment',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inehss', '0008_mediaattachment_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediaattachment',
+            name='file_size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inehss', '0009_mediaattachment_file_size_bigint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Uploading'), ('finalizing', 'Finalizing'), ('completed', 'Completed')], default='uploading', max_length=20),
+        ),
+    ]
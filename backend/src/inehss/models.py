@@ -8,10 +8,16 @@ Models:
 - FormSubmission: Officer inspection responses
 """
 
+import os
 import uuid
+from django.conf import settings
+from django.core import signing
 from django.db import models
 from django.contrib.auth.models import User
 
+from infrastructure.regions import lookup_region
+from infrastructure.storage import content_hash, get_content_storage
+
 
 class FormTemplate(models.Model):
     """
@@ -83,6 +89,8 @@ class HazardReport(models.Model):
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
     address = models.TextField(blank=True)
+    # Administrative region containing the point (see infrastructure.regions)
+    region_code = models.CharField(max_length=32, blank=True, default='', db_index=True, editable=False)
     
     # Status tracking
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
@@ -120,7 +128,33 @@ class HazardReport(models.Model):
             date_str = datetime.now().strftime('%Y%m%d')
             random_suffix = ''.join([str(random.randint(0, 9)) for _ in range(4)])
             self.tracking_id = f"INH-{date_str}-{random_suffix}"
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.assign_region()
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'region_code'}
         super().save(*args, **kwargs)
+
+    def assign_region(self):
+        """Recompute the region code from the current coordinates."""
+        self.region_code = lookup_region(self.latitude, self.longitude)
+
+    def make_upload_token(self):
+        """
+        Signed token letting the (possibly anonymous) submitter attach large
+        files to this report through the resumable upload API.
+        """
+        return signing.TimestampSigner(salt='inehss.report-upload').sign(str(self.id))
+
+    @staticmethod
+    def upload_token_matches(report_id, token):
+        try:
+            value = signing.TimestampSigner(salt='inehss.report-upload').unsign(
+                token or '', max_age=settings.REPORT_UPLOAD_TOKEN_MAX_AGE,
+            )
+        except signing.BadSignature:
+            return False
+        return value == str(report_id)
     
     def __str__(self):
         return f"{self.tracking_id} - {self.form_template.name}"
@@ -259,12 +293,60 @@ class MediaAttachment(models.Model):
         related_name='attachments'
     )
     
-    file = models.FileField(upload_to='inehss/attachments/%Y/%m/')
+    # Stored content-addressed (cas/ab/cd/<sha256>.ext); upload_to only applies to legacy rows
+    file = models.FileField(upload_to='inehss/attachments/%Y/%m/', storage=get_content_storage)
     file_type = models.CharField(max_length=20, choices=ATTACHMENT_TYPE_CHOICES)
     original_filename = models.CharField(max_length=255)
-    file_size = models.PositiveIntegerField(default=0)  # bytes
+    file_size = models.PositiveBigIntegerField(default=0)  # bytes
+    file_hash = models.CharField(max_length=64, blank=True)  # SHA-256
+    # Downscaled WebP copies: {'thumb': name, 'medium': name} (see infrastructure.renditions)
+    renditions = models.JSONField(default=dict, blank=True)
     
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return f"{self.original_filename} ({self.file_type})"
+
+    def save(self, *args, **kwargs):
+        if self.file and not self.file._committed:
+            self.file_hash = content_hash(self.file.file)
+        super().save(*args, **kwargs)
+
+
+class UploadSession(models.Model):
+    """
+    Resumable (tus-style) upload of a large attachment.
+    Chunks are appended to a partial file at `offset`; finalize turns the
+    completed file into a MediaAttachment, holding the session in
+    `finalizing` meanwhile so only one request does so.
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('finalizing', 'Finalizing'),
+        ('completed', 'Completed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_sessions')
+    report = models.ForeignKey(HazardReport, on_delete=models.CASCADE, null=True, blank=True, related_name='upload_sessions')
+    submission = models.ForeignKey(FormSubmission, on_delete=models.CASCADE, null=True, blank=True, related_name='upload_sessions')
+
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    total_size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    attachment = models.OneToOneField(MediaAttachment, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_session')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+    @property
+    def partial_path(self):
+        return os.path.join(settings.RESUMABLE_UPLOAD_DIR, f'{self.id}.part')
@@ -3,6 +3,8 @@ INEHSS Serializers for API
 """
 
 from rest_framework import serializers
+from infrastructure.renditions import rendition_urls
+from interfaces.fieldsets import SparseFieldsetMixin
 from .models import FormTemplate, HazardReport, OfficerAssignment, FormSubmission, MediaAttachment
 
 
@@ -19,6 +21,14 @@ class FormTemplateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+class FormTemplateSummarySerializer(serializers.ModelSerializer):
+    """Just enough of a FormTemplate to label it in lists"""
+
+    class Meta:
+        model = FormTemplate
+        fields = ['id', 'name', 'form_type', 'map_icon', 'map_color']
+
+
 class FormSchemaSerializer(serializers.ModelSerializer):
     """Serializer for FormTemplate with full schema - used when rendering forms"""
     
@@ -29,11 +39,22 @@ class FormSchemaSerializer(serializers.ModelSerializer):
 
 class MediaAttachmentSerializer(serializers.ModelSerializer):
     """Serializer for media attachments"""
+    renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = MediaAttachment
-        fields = ['id', 'file', 'file_type', 'original_filename', 'file_size', 'uploaded_at']
-        read_only_fields = ['id', 'file_size', 'uploaded_at']
+        fields = ['id', 'file', 'file_type', 'original_filename', 'file_size', 'file_hash', 'renditions', 'uploaded_at']
+        read_only_fields = ['id', 'file_size', 'file_hash', 'uploaded_at']
+
+    def get_renditions(self, obj):
+        return rendition_urls(obj.file.storage, obj.renditions, self.context.get('request'))
+
+    # Row-based get_renditions for interfaces.fastpath
+    values_sources = {'renditions': ['renditions']}
+
+    def values_renditions(self, row):
+        storage = MediaAttachment._meta.get_field('file').storage
+        return rendition_urls(storage, row['renditions'], self.context.get('request'))
 
 
 class HazardReportCreateSerializer(serializers.ModelSerializer):
@@ -78,7 +99,7 @@ class HazardReportCreateSerializer(serializers.ModelSerializer):
         return request.META.get('REMOTE_ADDR')
 
 
-class HazardReportSerializer(serializers.ModelSerializer):
+class HazardReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Full serializer for viewing hazard reports"""
     form_template = FormTemplateSerializer(read_only=True)
     attachments = MediaAttachmentSerializer(many=True, read_only=True)
@@ -96,8 +117,33 @@ class HazardReportSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'tracking_id', 'created_at', 'updated_at']
 
 
-class OfficerAssignmentSerializer(serializers.ModelSerializer):
-    """Serializer for officer assignments"""
+class HazardReportSummarySerializer(serializers.ModelSerializer):
+    """Compact hazard report for list views: no form data, schema or attachments"""
+    form_template = FormTemplateSummarySerializer(read_only=True)
+
+    class Meta:
+        model = HazardReport
+        fields = [
+            'id', 'tracking_id', 'form_template',
+            'latitude', 'longitude', 'address',
+            'status', 'priority', 'created_at'
+        ]
+
+
+class FormSubmissionSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FormSubmission
+        fields = ['id', 'is_draft', 'submitted_at']
+
+
+class OfficerAssignmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Serializer for officer assignments.
+
+    With `compact` in the context (the list view) the report, inspection form
+    and latest submissions are summarised; `?expand=report,inspection_form,
+    latest_draft,latest_submission` brings back their full form.
+    """
     officer_username = serializers.CharField(source='officer.username', read_only=True)
     latest_draft = serializers.SerializerMethodField()
     latest_submission = serializers.SerializerMethodField()
@@ -117,12 +163,21 @@ class OfficerAssignmentSerializer(serializers.ModelSerializer):
         """Use nested serializers for the response representation"""
         ret = super().to_representation(instance)
         # Add detailed objects for the frontend to render properly
-        if instance.report:
-            ret['report'] = HazardReportSerializer(instance.report).data
-        if instance.inspection_form:
-            ret['inspection_form'] = FormSchemaSerializer(instance.inspection_form).data
+        if instance.report and 'report' in ret:
+            serializer = HazardReportSerializer if self._is_full('report') else HazardReportSummarySerializer
+            ret['report'] = serializer(instance.report).data
+        if instance.inspection_form and 'inspection_form' in ret:
+            serializer = FormSchemaSerializer if self._is_full('inspection_form') else FormTemplateSummarySerializer
+            ret['inspection_form'] = serializer(instance.inspection_form).data
         return ret
 
+    def _is_full(self, name):
+        return not self.context.get('compact') or self.is_expanded(name)
+
+    def _submission_data(self, submission, name):
+        serializer = FormSubmissionSerializer if self._is_full(name) else FormSubmissionSummarySerializer
+        return serializer(submission).data
+
     def create(self, validated_data):
         # Automatically set assigned_by to the current user (admin)
         request = self.context.get('request')
@@ -130,22 +185,30 @@ class OfficerAssignmentSerializer(serializers.ModelSerializer):
             validated_data['assigned_by'] = request.user
         return super().create(validated_data)
 
+    def _latest_submission(self, obj):
+        # Prefetched by OfficerAssignmentViewSet; fall back to a query otherwise
+        if hasattr(obj, 'latest_submissions'):
+            return obj.latest_submissions[0] if obj.latest_submissions else None
+        return obj.submissions.order_by('-submitted_at').first()
+
     def get_latest_draft(self, obj):
         # Only return draft if the most recent submission is a draft
-        last_submission = obj.submissions.order_by('-submitted_at').first()
+        last_submission = self._latest_submission(obj)
         if last_submission and last_submission.is_draft:
-            return FormSubmissionSerializer(last_submission).data
+            return self._submission_data(last_submission, 'latest_draft')
         return None
 
     def get_latest_submission(self, obj):
         # Return the most recent submission regardless of draft status
-        last_submission = obj.submissions.order_by('-submitted_at').first()
+        last_submission = self._latest_submission(obj)
         if last_submission:
-            return FormSubmissionSerializer(last_submission).data
+            return self._submission_data(last_submission, 'latest_submission')
         return None
 
     def get_submission_count(self, obj):
         """Count non-draft submissions for patrol mode assignments"""
+        if hasattr(obj, 'final_submission_count'):
+            return obj.final_submission_count
         return obj.submissions.filter(is_draft=False).count()
 
 
@@ -177,7 +240,7 @@ class FormSubmissionCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class FormSubmissionSerializer(serializers.ModelSerializer):
+class FormSubmissionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Full serializer for viewing form submissions"""
     submitted_by_username = serializers.CharField(source='submitted_by.username', read_only=True)
     attachments = MediaAttachmentSerializer(many=True, read_only=True)
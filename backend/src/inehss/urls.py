@@ -12,6 +12,7 @@ router.register(r'reports', views.HazardReportViewSet, basename='hazard-report')
 router.register(r'assignments', views.OfficerAssignmentViewSet, basename='officer-assignment')
 router.register(r'submissions', views.FormSubmissionViewSet, basename='form-submission')
 router.register(r'attachments', views.MediaAttachmentViewSet, basename='media-attachment')
+router.register(r'uploads', views.UploadSessionViewSet, basename='upload-session')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -6,11 +6,27 @@ from django.contrib.auth import get_user_model
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
+from rest_framework.exceptions import NotAuthenticated, NotFound
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle
 from rest_framework.views import APIView
-from django.db.models import Q
-
-from .models import FormTemplate, HazardReport, OfficerAssignment, FormSubmission, MediaAttachment
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+import os
+import shutil
+import tempfile
+
+from .models import FormTemplate, HazardReport, OfficerAssignment, FormSubmission, MediaAttachment, UploadSession
+from infrastructure import media_pipeline
+from interfaces.conditional import conditional_response
+from interfaces.fastpath import ValuesSerializer
+from interfaces.fieldsets import SparseFieldsetViewMixin, requested_expansions, requested_fields
+from interfaces.renderers import FastJSONRenderer
 from .serializers import (
     FormTemplateSerializer, FormSchemaSerializer,
     HazardReportSerializer, HazardReportCreateSerializer,
@@ -104,18 +120,20 @@ class FormTemplateViewSet(viewsets.ModelViewSet):
     def public(self, request):
         """Get only public form templates"""
         templates = FormTemplate.objects.filter(is_active=True, form_type='public')
-        serializer = FormTemplateSerializer(templates, many=True)
-        return Response(serializer.data)
+        return conditional_response(
+            request, [templates], lambda: Response(FormTemplateSerializer(templates, many=True).data)
+        )
 
 
 
-class HazardReportViewSet(viewsets.ModelViewSet):
+class HazardReportViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for hazard reports.
     - POST (create): Public access with throttling
     - GET/PUT/DELETE: Authenticated staff only
     """
     queryset = HazardReport.objects.all()
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     def get_queryset(self):
         queryset = HazardReport.objects.all().order_by('-created_at')
@@ -161,6 +179,24 @@ class HazardReportViewSet(viewsets.ModelViewSet):
         if self.action == 'create':
             return HazardReportCreateSerializer
         return HazardReportSerializer
+
+    def list(self, request, *args, **kwargs):
+        # Reports embed their form template, so template edits change the page too
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(
+            request, [queryset, FormTemplate.objects.all()], lambda: self._list(request, *args, **kwargs)
+        )
+
+    def _list(self, request, *args, **kwargs):
+        # Build rows straight from .values() (see interfaces.fastpath)
+        fast = ValuesSerializer.compile(self.get_serializer())
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        queryset = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(fast.serialize(queryset))
+        return self.get_paginated_response(fast.serialize(page))
     
     def get_permissions(self):
         if self.action == 'create':
@@ -194,7 +230,9 @@ class HazardReportViewSet(viewsets.ModelViewSet):
             if instance.latitude is None or instance.longitude is None:
                 print(f"Skipping event creation for report {instance.id} (No location data)")
                 return Response({
+                    'id': str(instance.id),
                     'tracking_id': instance.tracking_id,
+                    'upload_token': instance.make_upload_token(),
                     'message': 'Report created. Event generation pending location data.'
                 }, status=status.HTTP_201_CREATED)
 
@@ -222,6 +260,7 @@ class HazardReportViewSet(viewsets.ModelViewSet):
         return Response({
             'id': str(instance.id),
             'tracking_id': instance.tracking_id,
+            'upload_token': instance.make_upload_token(),
             'message': 'Report submitted successfully. Save your tracking ID for follow-up.'
         }, status=status.HTTP_201_CREATED)
     
@@ -247,12 +286,71 @@ class OfficerAssignmentViewSet(viewsets.ModelViewSet):
     """
     serializer_class = OfficerAssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Actions that return serialized assignments; status-change actions skip the joins
+    serialized_actions = {'list', 'retrieve', 'update', 'partial_update', 'reassign'}
     
     def get_queryset(self):
         user = self.request.user
-        if user.is_staff:
-            return OfficerAssignment.objects.all()
-        return OfficerAssignment.objects.filter(officer=user)
+        queryset = OfficerAssignment.objects.all()
+        if not user.is_staff:
+            queryset = queryset.filter(officer=user)
+        if self.action in self.serialized_actions:
+            queryset = self.with_serializer_data(queryset)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # The list only carries summaries; detail keeps the nested report and form
+        context['compact'] = self.action == 'list'
+        return context
+
+    def with_serializer_data(self, queryset):
+        """
+        Load what OfficerAssignmentSerializer will read, so a page of
+        assignments costs a fixed number of queries regardless of its size.
+        Relations left out by ?fields= or only summarised on the list are
+        not fetched.
+        """
+        fields = requested_fields(self.request)
+        expansions = requested_expansions(self.request)
+        compact = self.action == 'list'
+
+        def wanted(name):
+            return fields is None or name in fields
+
+        def full(name):
+            return wanted(name) and (not compact or name in expansions)
+
+        select_related = ['officer'] if wanted('officer_username') else []
+        prefetch_related = []
+        if wanted('inspection_form'):
+            select_related.append('inspection_form')
+        if wanted('report'):
+            select_related.append('report__form_template')
+            if full('report'):
+                prefetch_related.append('report__attachments')
+        if wanted('latest_draft') or wanted('latest_submission'):
+            submissions = FormSubmission.objects.all()
+            if full('latest_draft') or full('latest_submission'):
+                submissions = submissions.select_related('submitted_by').prefetch_related('attachments')
+            latest = FormSubmission.objects.filter(
+                assignment=OuterRef('assignment'),
+            ).order_by('-submitted_at').values('pk')[:1]
+            prefetch_related.append(Prefetch(
+                'submissions',
+                queryset=submissions.filter(pk=Subquery(latest)),
+                to_attr='latest_submissions',
+            ))
+
+        queryset = queryset.select_related(*select_related).prefetch_related(*prefetch_related)
+        if wanted('submission_count'):
+            final_count = FormSubmission.objects.filter(
+                assignment=OuterRef('pk'), is_draft=False,
+            ).order_by().values('assignment').annotate(n=Count('pk')).values('n')
+            queryset = queryset.annotate(
+                final_submission_count=Coalesce(Subquery(final_count, output_field=IntegerField()), 0),
+            )
+        return queryset
 
     def _ensure_owner_or_staff(self, assignment, request):
         return assignment.officer == request.user or request.user.is_staff
@@ -396,7 +494,7 @@ class OfficerAssignmentViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Assignment completed'})
 
 
-class FormSubmissionViewSet(viewsets.ModelViewSet):
+class FormSubmissionViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for officer form submissions.
     """
@@ -503,10 +601,59 @@ class FormSubmissionViewSet(viewsets.ModelViewSet):
                 print(f"Error propagating location data: {e}")
 
 
+ALLOWED_ATTACHMENT_TYPES = {
+    'image/jpeg', 'image/png', 'image/webp',
+    'video/mp4', 'video/webm',
+    'application/pdf',
+}
+
+
+def attachment_file_type(content_type):
+    if content_type.startswith('image/'):
+        return 'image'
+    if content_type.startswith('video/'):
+        return 'video'
+    return 'document'
+
+
+def sync_attachment_to_event(attachment, header=None):
+    """
+    Mirror an attachment into the event system as a MediaModel when its
+    report (directly or through a submission) is linked to an event.
+    """
+    try:
+        from infrastructure.models import MediaModel
+        
+        event = None
+        if attachment.report and attachment.report.event:
+            event = attachment.report.event
+        elif attachment.submission and attachment.submission.assignment.report.event:
+            event = attachment.submission.assignment.report.event
+            
+        if event:
+            media = MediaModel.objects.create(
+                event=event,
+                # Shares the attachment's content-addressed file: no second write
+                file=attachment.file,
+                file_type=attachment.file_type,
+                file_hash=attachment.file_hash,
+                metadata={
+                    'source': 'inehss', 
+                    'original_filename': attachment.original_filename,
+                    'inehss_attachment_id': str(attachment.id)
+                }
+            )
+            media_pipeline.enqueue(media.id, header=header)
+            print(f"Synced attachment {attachment.id} to Event {event.id}")
+    except Exception as e:
+        print(f"Failed to sync attachment to event system: {e}")
+
+
 class MediaAttachmentViewSet(viewsets.ModelViewSet):
     """
     API endpoint for file uploads.
     Supports uploading attachments for reports and submissions.
+    Files larger than 20MB go through the resumable /uploads/ API instead.
     """
     queryset = MediaAttachment.objects.all()
     serializer_class = MediaAttachmentSerializer
@@ -526,27 +673,14 @@ class MediaAttachmentViewSet(viewsets.ModelViewSet):
         if file.size > max_file_size:
             return Response({'error': 'File too large. Max size is 20MB.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Determine file type
         content_type = file.content_type
-        if content_type.startswith('image/'):
-            file_type = 'image'
-        elif content_type.startswith('video/'):
-            file_type = 'video'
-        else:
-            file_type = 'document'
-
-        allowed_types = {
-            'image/jpeg', 'image/png', 'image/webp',
-            'video/mp4', 'video/webm',
-            'application/pdf',
-        }
-        if content_type not in allowed_types:
+        if content_type not in ALLOWED_ATTACHMENT_TYPES:
             return Response({'error': f'Unsupported file type: {content_type}'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Create attachment
         attachment = MediaAttachment(
             file=file,
-            file_type=file_type,
+            file_type=attachment_file_type(content_type),
             original_filename=file.name,
             file_size=file.size,
             report_id=request.data.get('report'),
@@ -554,31 +688,241 @@ class MediaAttachmentViewSet(viewsets.ModelViewSet):
         )
         attachment.save()
         
+        media_pipeline.enqueue_attachment(attachment.id)
         serializer = self.get_serializer(attachment)
         
         # Sync to Infrastructure Event System
+        sync_attachment_to_event(attachment, header=getattr(file, 'header', None))
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class PartialUploadFile(File):
+    """A completed partial upload; exposing its path lets storage move it into place."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class UploadSessionViewSet(viewsets.ViewSet):
+    """
+    Resumable chunked uploads for large attachments (tus-style).
+
+    - POST   /uploads/                  {filename, content_type, size, report|submission}
+    - HEAD   /uploads/{id}/             Upload-Offset / Upload-Length headers
+    - PATCH  /uploads/{id}/             raw bytes at the Upload-Offset header
+    - POST   /uploads/{id}/finalize/    hash and create the MediaAttachment
+
+    A PATCH whose Upload-Offset is not the stored offset gets 409 with the
+    current offset, so a client retrying after a dropped connection resends
+    only the missing bytes.
+
+    Sessions need an authenticated user, or for a report, the report's
+    upload token (returned when the report was submitted) in the
+    Upload-Token header of every request. Creating sessions has its own
+    throttle, and each user or anonymous report may only hold a few
+    unfinished sessions at once.
+    """
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'uploads'
+    chunk_size = 64 * 1024
+
+    def get_permissions(self):
+        # Anonymous sessions are checked against the report's upload token instead
+        if self.action == 'create' and not self.request.data.get('report'):
+            return [permissions.IsAuthenticated()]
+        return [permissions.AllowAny()]
+
+    def get_throttles(self):
+        if self.action == 'create':
+            self.throttle_scope = 'upload_sessions'
+        return super().get_throttles()
+
+    def _has_token(self, request, report_id):
+        return bool(report_id) and HazardReport.upload_token_matches(report_id, request.headers.get('Upload-Token'))
+
+    def _get_session(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk)
+        if session.owner_id:
+            if session.owner_id != request.user.id:
+                raise NotFound()
+        elif not self._has_token(request, session.report_id):
+            raise NotFound()
+        return session
+
+    def _open_sessions(self, request, report_id):
+        if request.user.is_authenticated:
+            sessions = UploadSession.objects.filter(owner=request.user)
+        else:
+            sessions = UploadSession.objects.filter(owner__isnull=True, report_id=report_id)
+        return sessions.filter(status='uploading').aggregate(count=Count('id'), size=Sum('total_size'))
+
+    def _headers(self, session):
+        return {
+            'Upload-Offset': str(session.offset),
+            'Upload-Length': str(session.total_size),
+            'Cache-Control': 'no-store',
+        }
+
+    def _state(self, session):
+        return {
+            'id': session.id,
+            'filename': session.filename,
+            'offset': session.offset,
+            'size': session.total_size,
+            'status': session.status,
+            'attachment': session.attachment_id,
+        }
+
+    def create(self, request):
+        filename = request.data.get('filename')
+        content_type = request.data.get('content_type', '')
         try:
-            from infrastructure.models import MediaModel
-            
-            event = None
-            if attachment.report and attachment.report.event:
-                event = attachment.report.event
-            elif attachment.submission and attachment.submission.assignment.report.event:
-                event = attachment.submission.assignment.report.event
-                
-            if event:
-                MediaModel.objects.create(
-                    event=event,
-                    file=attachment.file,
-                    file_type=attachment.file_type,
-                    metadata={
-                        'source': 'inehss', 
-                        'original_filename': attachment.original_filename,
-                        'inehss_attachment_id': str(attachment.id)
-                    }
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'size is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not filename:
+            return Response({'error': 'filename is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if content_type not in ALLOWED_ATTACHMENT_TYPES:
+            return Response({'error': f'Unsupported file type: {content_type}'}, status=status.HTTP_400_BAD_REQUEST)
+        if size <= 0 or size > settings.RESUMABLE_UPLOAD_MAX_SIZE:
+            return Response({'error': f'size must be between 1 and {settings.RESUMABLE_UPLOAD_MAX_SIZE} bytes'}, status=status.HTTP_400_BAD_REQUEST)
+        if not request.data.get('report') and not request.data.get('submission'):
+            return Response({'error': 'report or submission is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not request.user.is_authenticated and not self._has_token(request, request.data.get('report')):
+            raise NotAuthenticated('Log in or send the report\'s Upload-Token header')
+
+        open_sessions = self._open_sessions(request, request.data.get('report'))
+        if open_sessions['count'] >= settings.RESUMABLE_UPLOAD_MAX_OPEN_SESSIONS:
+            return Response(
+                {'error': f'At most {settings.RESUMABLE_UPLOAD_MAX_OPEN_SESSIONS} unfinished uploads at a time'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        if (open_sessions['size'] or 0) + size > settings.RESUMABLE_UPLOAD_MAX_OPEN_BYTES:
+            return Response(
+                {'error': f'Unfinished uploads may total at most {settings.RESUMABLE_UPLOAD_MAX_OPEN_BYTES} bytes'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+
+        session = UploadSession.objects.create(
+            owner=request.user if request.user.is_authenticated else None,
+            report_id=request.data.get('report'),
+            submission_id=request.data.get('submission'),
+            filename=os.path.basename(filename)[:255],
+            content_type=content_type,
+            total_size=size,
+        )
+        os.makedirs(settings.RESUMABLE_UPLOAD_DIR, exist_ok=True)
+        open(session.partial_path, 'wb').close()
+
+        response = Response(self._state(session), status=status.HTTP_201_CREATED, headers=self._headers(session))
+        response['Location'] = request.build_absolute_uri(f'{session.id}/')
+        return response
+
+    def retrieve(self, request, pk=None):
+        session = self._get_session(request, pk)
+        return Response(self._state(session), headers=self._headers(session))
+
+    def partial_update(self, request, pk=None):
+        session = self._get_session(request, pk)
+        if session.status != 'uploading':
+            return Response({'error': 'Upload already finalized'}, status=status.HTTP_409_CONFLICT)
+        try:
+            offset = int(request.headers.get('Upload-Offset'))
+        except (TypeError, ValueError):
+            return Response({'error': 'Upload-Offset header is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if offset != session.offset:
+            return Response(
+                {'error': 'Offset mismatch', 'offset': session.offset},
+                status=status.HTTP_409_CONFLICT, headers=self._headers(session),
+            )
+
+        remaining = session.total_size - offset
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if length > remaining:
+            return Response({'error': f'Chunk exceeds declared size ({remaining} bytes left)'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Receive the body into a spool file first, so the session is only
+        # locked for the local copy below and not for the whole network read
+        os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+        with tempfile.TemporaryFile(dir=settings.UPLOAD_TEMP_DIR) as spool:
+            written = 0
+            while written < length:
+                chunk = request.stream.read(min(self.chunk_size, length - written)) if request.stream else b''
+                if not chunk:
+                    break
+                spool.write(chunk)
+                written += len(chunk)
+            spool.seek(0)
+
+            with transaction.atomic():
+                # Claim the range by advancing the offset first. The UPDATE
+                # holds the session's row lock (SQLite's write lock) until the
+                # bytes are in, so a concurrent PATCH at the same offset waits
+                # and then matches no row.
+                claimed = UploadSession.objects.filter(pk=session.pk, offset=offset, status='uploading').update(
+                    offset=offset + written, updated_at=timezone.now(),
                 )
-                print(f"Synced attachment {attachment.id} to Event {event.id}")
-        except Exception as e:
-            print(f"Failed to sync attachment to event system: {e}")
+                if claimed:
+                    # Anything past the offset is a leftover from an interrupted request
+                    with open(session.partial_path, 'r+b') as fh:
+                        fh.seek(offset)
+                        fh.truncate()
+                        shutil.copyfileobj(spool, fh, self.chunk_size)
+
+        session.refresh_from_db()
+        if not claimed:
+            return Response(
+                {'error': 'Offset mismatch', 'offset': session.offset},
+                status=status.HTTP_409_CONFLICT, headers=self._headers(session),
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT, headers=self._headers(session))
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        session = self._get_session(request, pk)
+        # Claim the completed session first, so a concurrent or retried
+        # finalize cannot build a second attachment from the same file
+        claimed = UploadSession.objects.filter(
+            pk=session.pk, status='uploading', offset=F('total_size'),
+        ).update(status='finalizing', updated_at=timezone.now())
+        if not claimed:
+            session.refresh_from_db()
+            if session.status == 'completed':
+                return Response(MediaAttachmentSerializer(session.attachment).data)
+            if session.status == 'finalizing':
+                return Response({'error': 'Upload is being finalized'}, status=status.HTTP_409_CONFLICT)
+            return Response(
+                {'error': 'Upload incomplete', 'offset': session.offset, 'size': session.total_size},
+                status=status.HTTP_409_CONFLICT, headers=self._headers(session),
+            )
+
+        try:
+            with open(session.partial_path, 'rb') as fh:
+                content = PartialUploadFile(fh, name=session.filename)
+                header = fh.read(media_pipeline.HEADER_BYTES)
+                attachment = MediaAttachment(
+                    file=content,
+                    file_type=attachment_file_type(session.content_type),
+                    original_filename=session.filename,
+                    file_size=session.total_size,
+                    report_id=session.report_id,
+                    submission_id=session.submission_id,
+                )
+                # Hashes the file once, then the storage renames it into cas/
+                attachment.save()
+        except Exception:
+            # Let the client retry
+            UploadSession.objects.filter(pk=session.pk, status='finalizing').update(status='uploading')
+            raise
+
+        if os.path.exists(session.partial_path):
+            os.remove(session.partial_path)
+        session.status = 'completed'
+        session.attachment = attachment
+        session.save(update_fields=['status', 'attachment', 'updated_at'])
+        media_pipeline.enqueue_attachment(attachment.id)
+
+        sync_attachment_to_event(attachment, header=header)
+        return Response(MediaAttachmentSerializer(attachment).data, status=status.HTTP_201_CREATED)
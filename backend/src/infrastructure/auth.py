@@ -18,6 +18,7 @@ def setup_user_roles():
     public_group, _ = Group.objects.get_or_create(name='Public')
     supervisor_group, _ = Group.objects.get_or_create(name='Supervisor')
     analyst_group, _ = Group.objects.get_or_create(name='Analyst')
+    feed_group, _ = Group.objects.get_or_create(name='Feed')
     
     # Get all permissions
     perms = {p.codename: p for p in Permission.objects.all()}
@@ -30,6 +31,7 @@ def setup_user_roles():
         'add_formsubmission', 'change_formsubmission', 'delete_formsubmission', 'view_formsubmission',
         'add_user', 'change_user', 'delete_user', 'view_user',
         'view_aiinteractionlog',
+        'bulk_ingest_events',
     ]
     admin_group.permissions.set([perms.get(p) for p in admin_perms if p in perms])
     
@@ -72,8 +74,12 @@ def setup_user_roles():
 
     ]
     analyst_group.permissions.set([perms.get(p) for p in analyst_perms if p in perms])
+
+    # Feed: sensor and API feed accounts pushing events in bulk
+    feed_perms = ['bulk_ingest_events']
+    feed_group.permissions.set([perms.get(p) for p in feed_perms if p in perms])
     
-    print("✅ User roles created: Admin, Supervisor, Analyst, Officer, Public")
+    print("✅ User roles created: Admin, Supervisor, Analyst, Officer, Public, Feed")
 
 
 class UserRole(models.TextChoices):
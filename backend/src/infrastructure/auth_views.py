@@ -4,14 +4,26 @@ Authentication API views - Login, Token generation, User management
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.models import User
 from django.db import IntegrityError
+from django.shortcuts import get_object_or_404
 from infrastructure.auth import UserProfile, UserRole
+from infrastructure.models import EventModel
+from interfaces.conditional import conditional_response
+from interfaces.fastpath import ValuesSerializer
+from interfaces.fieldsets import SparseFieldsetMixin, requested_fields
+from interfaces.filters import filter_events
+from interfaces.pagination import EventPageNumberPagination, EventKeysetPagination, use_keyset
+from interfaces.renderers import FastJSONRenderer
+from interfaces.streaming import wants_ndjson, ndjson_response
 from rest_framework import serializers
+from rest_framework.renderers import BrowsableAPIRenderer
+import uuid
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -123,29 +135,78 @@ class HealthCheckView(viewsets.ViewSet):
 
 
 # Events Endpoint for Admin
+ADMIN_EVENT_FIELDS = [
+    'id', 'title', 'description', 'category', 'severity', 'status',
+    'latitude', 'longitude', 'accuracy', 'altitude', 'trust_score',
+    'version', 'created_at', 'updated_at'
+]
+
+
+class AdminEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Flat event serializer for the admin list (no nested media)"""
+
+    class Meta:
+        model = EventModel
+        fields = ADMIN_EVENT_FIELDS
+
+
 class AdminEventsViewSet(viewsets.ViewSet):
-    """Admin events endpoint - returns paginated events"""
+    """
+    Admin events endpoint - returns paginated events.
+
+    Query Parameters:
+        - bbox, severity, status: Same filters as the event list API
+        - limit / page: Page-number pagination (max 100 per page)
+        - mode=cursor / cursor: Keyset pagination
+        - count=false: Skip the total count query
+        - stream=ndjson: Stream every matching event as NDJSON
+        - fields: Comma-separated subset of the event fields to return
+
+    `retrieve` returns a single event, e.g. for a real-time client that
+    missed a version. Pages and streams support conditional GET (ETag / Last-Modified, see interfaces.conditional).
+    """
     permission_classes = [IsAuthenticated]
-    
+    pagination_class = EventPageNumberPagination
+    keyset_pagination_class = EventKeysetPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    stream_chunk_size = 2000
+    lookup_value_regex = '[0-9a-fA-F-]{32,36}'
+
     def list(self, request):
-        """Get all events (admin view)"""
-        from infrastructure.models import EventModel
-        from rest_framework.serializers import ModelSerializer
-        
-        class EventSerializer(ModelSerializer):
-            class Meta:
-                model = EventModel
-                fields = ['id', 'title', 'description', 'category', 'severity', 'status', 
-                         'latitude', 'longitude', 'accuracy', 'altitude', 'trust_score', 
-                         'created_at', 'updated_at']
-        
-        # Get all events ordered by created_at descending
-        events = EventModel.objects.all().order_by('-created_at')
-        serializer = EventSerializer(events, many=True)
-        
-        return Response({
-            'count': events.count(),
-            'next': None,
-            'previous': None,
-            'results': serializer.data
-        }, status=status.HTTP_200_OK)
+        """Get events (admin view)"""
+        events = filter_events(EventModel.objects.all(), request.query_params)
+
+        if wants_ndjson(request):
+            return conditional_response(request, [events], lambda: self._stream(request, events))
+        return conditional_response(request, [events], lambda: self._page(request, events))
+
+    def retrieve(self, request, pk=None):
+        """Get one event (admin view)"""
+        # The route lets through anything hex-and-dashes shaped, e.g. 36 dashes
+        try:
+            pk = uuid.UUID(pk)
+        except ValueError:
+            raise NotFound()
+        event = get_object_or_404(EventModel, pk=pk)
+        return Response(AdminEventSerializer(event, context={'request': request}).data)
+
+    def _stream(self, request, events):
+        fields = requested_fields(request)
+        rows = (
+            events.order_by('-created_at', '-id')
+            .values(*[name for name in ADMIN_EVENT_FIELDS if fields is None or name in fields])
+            .iterator(chunk_size=self.stream_chunk_size)
+        )
+        return ndjson_response(request, rows)
+
+    def _page(self, request, events):
+        if use_keyset(request):
+            paginator = self.keyset_pagination_class()
+        else:
+            events = events.order_by('-created_at', '-id')
+            paginator = self.pagination_class()
+
+        # Flat rows straight from .values(); created_at is read by the keyset paginator
+        fast = ValuesSerializer.compile(AdminEventSerializer(context={'request': request}))
+        page = paginator.paginate_queryset(fast.values(events, 'created_at'), request, view=self)
+        return paginator.get_paginated_response(fast.serialize(page))
@@ -0,0 +1,300 @@
+"""
+A channel layer shared by all worker processes on one host, backed by a
+SQLite file instead of Redis.
+
+The in-memory layer only reaches consumers in the process that sent the
+message, so a broadcast from one Daphne worker never reaches clients
+connected to another. Here messages and group memberships are rows in a
+WAL-mode SQLite database that every worker opens.
+
+Consumer channels are process-specific (`<process prefix>!<name>`, as with
+channels_redis). A group send writes one row per worker *process* holding
+members, listing the member channels. One poller task per process collects
+its rows and hands each message to the local channel queues. Fan-out
+therefore costs one insert per worker rather than one per connected client.
+Pollers read past a cursor without taking the write lock and delete what
+they delivered about once a second, so an idle worker costs one indexed
+read per poll interval and rarely competes with senders for the lock. Plain channels
+(no `!`) may be read by any process and are claimed row by row.
+
+Messages must be JSON-serializable; channels_redis has the same restriction
+through msgpack. Database calls run on a small thread pool so they never
+block the event loop.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_message (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    inbox TEXT NOT NULL,
+    channels TEXT,
+    body TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_message_inbox ON channel_message (inbox, id);
+CREATE TABLE IF NOT EXISTS channel_group (
+    name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (name, channel)
+);
+"""
+
+# Seconds between deletes of the rows a poller has already delivered
+PURGE_INTERVAL = 1.0
+
+INSERT_MESSAGE = 'INSERT INTO channel_message (inbox, channels, body, expires) VALUES (?, ?, ?, ?)'
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    extensions = ['groups', 'flush']
+
+    def __init__(self, path, expiry=60, group_expiry=86400, capacity=100, channel_capacity=None,
+                 poll_interval=0.01, poll_batch=500, threads=4):
+        super().__init__(expiry=expiry, capacity=capacity)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.poll_batch = poll_batch
+        self.threads = threads
+        self._pid = None
+        self._check_process()
+
+    # Per-process state
+
+    def _check_process(self):
+        """Start over with a new identity in a forked worker."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.client_prefix = f'sqlite.{uuid.uuid4().hex[:16]}'
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='channel-layer')
+        self._queues = {}
+        self._loop = None
+        self._poller = None
+        self._cursor = 0
+        self._purged_at = 0.0
+        self._cleaned_at = 0.0
+
+    def _bind_loop(self):
+        # asyncio queues belong to one event loop; a new loop (e.g. another
+        # async_to_sync call) starts with fresh ones
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queues = {}
+            self._poller = None
+
+    def _queue(self, channel):
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = self._queues[channel] = asyncio.Queue()
+        return queue
+
+    # Database access
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        """Send a message onto a (general or specific) channel."""
+        assert isinstance(message, dict), 'message is not a dict'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        assert '__asgi_channel__' not in message
+        self._check_process()
+        await self._run(self._send, channel, json.dumps(message))
+
+    def _send(self, channel, body):
+        inbox = self.non_local_name(channel)
+        expires = time.time() + self.expiry
+        if inbox != channel:
+            # Bounded by the receiving process's local queue instead
+            self._connection().execute(INSERT_MESSAGE, (inbox, json.dumps([channel]), body, expires))
+            return
+        with self._transaction() as connection:
+            (waiting,) = connection.execute(
+                'SELECT COUNT(*) FROM channel_message WHERE inbox = ? AND expires > ?', (inbox, time.time())
+            ).fetchone()
+            if waiting >= self.get_capacity(channel):
+                raise ChannelFull(channel)
+            connection.execute(INSERT_MESSAGE, (inbox, None, body, expires))
+
+    async def receive(self, channel):
+        """Receive the first message that arrives on the channel."""
+        assert self.valid_channel_name(channel)
+        self._check_process()
+        if '!' not in channel:
+            return await self._receive_plain(channel)
+
+        self._bind_loop()
+        queue = self._queue(channel)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        try:
+            return await queue.get()
+        except asyncio.CancelledError:
+            # The consumer is gone; stop collecting its messages
+            if queue.empty() and self._queues.get(channel) is queue:
+                del self._queues[channel]
+            raise
+
+    async def new_channel(self, prefix='specific'):
+        """A new process-specific channel, already collecting messages."""
+        self._check_process()
+        self._bind_loop()
+        channel = f'{self.client_prefix}!{prefix}.{uuid.uuid4().hex}'
+        self._queue(channel)
+        return channel
+
+    async def _receive_plain(self, channel):
+        while True:
+            body = await self._run(self._claim, channel)
+            if body is not None:
+                return json.loads(body)
+            await asyncio.sleep(self.poll_interval)
+
+    def _claim(self, channel):
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT id, body FROM channel_message WHERE inbox = ? AND expires > ? ORDER BY id LIMIT 1',
+                (channel, time.time()),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute('DELETE FROM channel_message WHERE id = ?', (row[0],))
+            return row[1]
+
+    async def _poll(self):
+        """Deliver this process's rows to its local channels while any are open."""
+        inbox = self.client_prefix + '!'
+        queues = self._queues
+        while queues and queues is self._queues:
+            rows = await self._run(self._take, inbox)
+            for channels, body in rows:
+                for channel in json.loads(channels):
+                    queue = queues.get(channel)
+                    if queue is not None and queue.qsize() < self.get_capacity(channel):
+                        # Every receiver gets its own copy, like the in-memory layer
+                        queue.put_nowait(json.loads(body))
+            if len(rows) < self.poll_batch:
+                await asyncio.sleep(self.poll_interval)
+
+    def _take(self, inbox):
+        connection = self._connection()
+        now = time.time()
+        # Only this process reads its inbox, so it reads past a cursor without
+        # the write lock and deletes delivered rows now and then. Ids only
+        # grow (AUTOINCREMENT), so the cursor never skips a row.
+        rows = connection.execute(
+            'SELECT id, channels, body, expires FROM channel_message WHERE inbox = ? AND id > ? ORDER BY id LIMIT ?',
+            (inbox, self._cursor, self.poll_batch),
+        ).fetchall()
+        if rows:
+            self._cursor = rows[-1][0]
+        if now - self._purged_at > PURGE_INTERVAL:
+            self._purged_at = now
+            connection.execute('DELETE FROM channel_message WHERE inbox = ? AND id <= ?', (inbox, self._cursor))
+        if now - self._cleaned_at > self.expiry:
+            self._cleaned_at = now
+            self._clean_expired(now)
+        return [(channels, body) for _, channels, body, expires in rows if expires > now]
+
+    def _clean_expired(self, now):
+        """Drop messages and memberships left behind by stopped workers."""
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM channel_message WHERE expires <= ?', (now,))
+            connection.execute('DELETE FROM channel_group WHERE expires <= ?', (now,))
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._run(
+            self._execute,
+            'INSERT OR REPLACE INTO channel_group (name, channel, expires) VALUES (?, ?, ?)',
+            (group, channel, time.time() + self.group_expiry),
+        )
+
+    async def group_discard(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._run(self._execute, 'DELETE FROM channel_group WHERE name = ? AND channel = ?', (group, channel))
+
+    async def group_send(self, group, message):
+        """Send a message to every channel in the group, one row per receiving process."""
+        assert isinstance(message, dict), 'message is not a dict'
+        assert self.valid_group_name(group), 'Group name not valid'
+        self._check_process()
+        await self._run(self._group_send, group, json.dumps(message))
+
+    def _group_send(self, group, body):
+        now = time.time()
+        with self._transaction() as connection:
+            inboxes = {}
+            for (channel,) in connection.execute(
+                'SELECT channel FROM channel_group WHERE name = ? AND expires > ?', (group, now)
+            ):
+                inboxes.setdefault(self.non_local_name(channel), []).append(channel)
+            rows = []
+            for inbox, channels in inboxes.items():
+                if inbox.endswith('!'):
+                    rows.append((inbox, json.dumps(channels), body, now + self.expiry))
+                    continue
+                (waiting,) = connection.execute(
+                    'SELECT COUNT(*) FROM channel_message WHERE inbox = ? AND expires > ?', (inbox, now)
+                ).fetchone()
+                # A full channel misses group messages rather than failing the send
+                if waiting < self.get_capacity(inbox):
+                    rows.append((inbox, None, body, now + self.expiry))
+            connection.executemany(INSERT_MESSAGE, rows)
+
+    def _execute(self, sql, params):
+        self._connection().execute(sql, params)
+
+    # Flush extension
+
+    async def flush(self):
+        await self._run(self._flush)
+
+    def _flush(self):
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM channel_message')
+            connection.execute('DELETE FROM channel_group')
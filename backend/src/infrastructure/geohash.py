@@ -0,0 +1,183 @@
+"""
+Pure Python geohash helpers.
+
+Events store a precomputed geohash so bounding-box queries can be answered with
+a handful of prefix range scans on a plain B-tree index (no PostGIS/GDAL).
+"""
+
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+MAX_PRECISION = 12
+# Hard limit on the cells bbox_cells will enumerate, whatever the caller asks
+MAX_COVER_CELLS = 4096
+
+
+def encode(latitude, longitude, precision=MAX_PRECISION):
+    """Encode a coordinate pair into a geohash string of the given precision."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lon_range[0] = mid
+            else:
+                value <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[value])
+            bit = 0
+            value = 0
+
+    return ''.join(chars)
+
+
+def decode_bbox(geohash):
+    """Return the (min_lon, min_lat, max_lon, max_lat) cell covered by a geohash."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if (value >> shift) & 1:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
+
+
+def cell_size(precision):
+    """Return the (width, height) in degrees of a cell at the given precision."""
+    bits = precision * 5
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 360.0 / (1 << lon_bits), 180.0 / (1 << lat_bits)
+
+
+def precision_for_zoom(zoom, max_precision=8):
+    """
+    Geohash precision for clustering at a web-map zoom level.
+    Picks the coarsest cell that is at most a quarter of a 256px tile wide.
+    """
+    target_width = 360.0 / (1 << max(zoom, 0)) / 4
+    for precision in range(1, max_precision + 1):
+        if cell_size(precision)[0] <= target_width:
+            return precision
+    return max_precision
+
+
+def _grid_span(low, high, origin, size):
+    first = math.floor((low - origin) / size)
+    last = math.floor((high - origin) / size)
+    return first, last
+
+
+def _cover_count(bbox, precision):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    width, height = cell_size(precision)
+    lon_first, lon_last = _grid_span(min_lon, max_lon, -180.0, width)
+    lat_first, lat_last = _grid_span(min_lat, max_lat, -90.0, height)
+    return (lon_last - lon_first + 1) * (lat_last - lat_first + 1)
+
+
+def cover_precision(bbox, max_cells=32):
+    """Largest precision whose covering of bbox stays within max_cells."""
+    precision = 1
+    while precision < MAX_PRECISION:
+        count = _cover_count(bbox, precision + 1)
+        # A reversed (empty) box counts <= 0 cells at every precision
+        if count <= 0 or count > max_cells:
+            break
+        precision += 1
+    return precision
+
+
+def bbox_cells(bbox, precision):
+    """
+    All geohash cells at the given precision that intersect the bbox.
+    bbox is (min_lon, min_lat, max_lon, max_lat).
+    """
+    min_lon, min_lat, max_lon, max_lat = _clamp(bbox)
+    width, height = cell_size(precision)
+    lon_first, lon_last = _grid_span(min_lon, max_lon, -180.0, width)
+    lat_first, lat_last = _grid_span(min_lat, max_lat, -90.0, height)
+    if lon_last < lon_first or lat_last < lat_first:
+        return []
+    if (lon_last - lon_first + 1) * (lat_last - lat_first + 1) > MAX_COVER_CELLS:
+        raise ValueError(f'bbox covers more than {MAX_COVER_CELLS} cells at precision {precision}')
+
+    cells = set()
+    for lat_index in range(lat_first, lat_last + 1):
+        center_lat = min(-90.0 + (lat_index + 0.5) * height, 90.0)
+        for lon_index in range(lon_first, lon_last + 1):
+            center_lon = min(-180.0 + (lon_index + 0.5) * width, 180.0)
+            cells.add(encode(center_lat, center_lon, precision))
+    return sorted(cells)
+
+
+def successor(prefix):
+    """
+    Smallest string greater than every string starting with prefix, within the
+    geohash alphabet. Returns None when no upper bound exists (prefix of all 'z').
+    """
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index < len(BASE32) - 1:
+            chars[-1] = BASE32[index + 1]
+            return ''.join(chars)
+        chars.pop()
+    return None
+
+
+def prefix_ranges(cells):
+    """
+    Merge sorted geohash prefixes into contiguous [low, high) string ranges.
+    high is None for an open upper bound.
+    """
+    ranges = []
+    for cell in sorted(cells):
+        if ranges:
+            low, high = ranges[-1]
+            if high is not None and cell.startswith(high) and not cell[len(high):].strip('0'):
+                ranges[-1] = (low, successor(cell))
+                continue
+        ranges.append((cell, successor(cell)))
+    return ranges
+
+
+def bbox_ranges(bbox, max_cells=32):
+    """Geohash [low, high) ranges that together cover the bbox."""
+    bbox = _clamp(bbox)
+    return prefix_ranges(bbox_cells(bbox, cover_precision(bbox, max_cells)))
+
+
+def _clamp(bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return (
+        max(min_lon, -180.0),
+        max(min_lat, -90.0),
+        min(max_lon, 180.0),
+        min(max_lat, 90.0),
+    )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from infrastructure.models import EventModel
+
+
+class Command(BaseCommand):
+    help = 'Fills the geohash spatial key for events that do not have one yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows updated per query')
+        parser.add_argument('--all', action='store_true', help='Recompute every event, not only missing keys')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        queryset = EventModel.objects.filter(latitude__isnull=False, longitude__isnull=False)
+        if not options['all']:
+            queryset = queryset.filter(geohash='')
+
+        total = 0
+        batch = []
+        for event in queryset.only('id', 'latitude', 'longitude').iterator(chunk_size=batch_size):
+            event.assign_geohash()
+            batch.append(event)
+            if len(batch) >= batch_size:
+                EventModel.objects.bulk_update(batch, ['geohash'])
+                total += len(batch)
+                batch = []
+                self.stdout.write(f'Updated {total} events...')
+
+        if batch:
+            EventModel.objects.bulk_update(batch, ['geohash'])
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled geohash for {total} events'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from infrastructure.models import EventModel
+from inehss.models import HazardReport
+
+
+class Command(BaseCommand):
+    help = 'Assigns administrative region codes to events and hazard reports.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows updated per query')
+        parser.add_argument('--all', action='store_true', help='Recompute every row, not only missing codes')
+
+    def handle(self, *args, **options):
+        for model in (EventModel, HazardReport):
+            total = self._backfill(model, options['batch_size'], options['all'])
+            self.stdout.write(self.style.SUCCESS(f'Assigned regions for {total} {model._meta.verbose_name_plural}'))
+
+    def _backfill(self, model, batch_size, recompute):
+        queryset = model.objects.filter(latitude__isnull=False, longitude__isnull=False)
+        if not recompute:
+            queryset = queryset.filter(region_code='')
+
+        total = 0
+        batch = []
+        for obj in queryset.only('id', 'latitude', 'longitude').iterator(chunk_size=batch_size):
+            obj.assign_region()
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, ['region_code'])
+                total += len(batch)
+                batch = []
+                self.stdout.write(f'Updated {total} {model._meta.verbose_name_plural}...')
+
+        if batch:
+            model.objects.bulk_update(batch, ['region_code'])
+            total += len(batch)
+        return total
@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.channel_layer import SQLiteChannelLayer
+
+GROUP = 'benchmark'
+# A receiver that hears nothing for this long has missed the rest
+IDLE_TIMEOUT = 5
+
+
+def _make_layer(path, messages):
+    if path:
+        return SQLiteChannelLayer(path, capacity=messages)
+    import django
+    from channels.layers import DEFAULT_CHANNEL_LAYER, channel_layers
+    django.setup()
+    return channel_layers.make_backend(DEFAULT_CHANNEL_LAYER)
+
+
+async def _drain(layer, channel, messages):
+    received = 0
+    last = time.monotonic()
+    while received < messages:
+        try:
+            await asyncio.wait_for(layer.receive(channel), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            break
+        received += 1
+        last = time.monotonic()
+    return received, last
+
+
+def _worker(path, clients, messages, ready, results):
+    """One worker process with `clients` consumers in the benchmark group."""
+    layer = _make_layer(path, messages)
+
+    async def run():
+        channels = [await layer.new_channel() for _ in range(clients)]
+        for channel in channels:
+            await layer.group_add(GROUP, channel)
+        ready.put(os.getpid())
+        drained = await asyncio.gather(*(_drain(layer, channel, messages) for channel in channels))
+        return sum(received for received, _ in drained), max(last for _, last in drained)
+
+    results.put(asyncio.run(run()))
+
+
+class Command(BaseCommand):
+    help = 'Measures channel-layer group fan-out throughput against the number of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help='Comma-separated worker process counts to compare')
+        parser.add_argument('--clients', type=int, default=100, help='Group members (WebSocket clients) per worker')
+        parser.add_argument('--messages', type=int, default=200, help='Group messages sent per run')
+        parser.add_argument('--payload', type=int, default=2000, help='Approximate message size in bytes')
+        parser.add_argument(
+            '--configured', action='store_true',
+            help='Use the CHANNEL_LAYERS default (must be cross-process) instead of a temporary SQLite file',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            worker_counts = [int(count) for count in options['workers'].split(',')]
+        except ValueError:
+            raise CommandError('--workers must be a comma-separated list of integers')
+        if options['configured']:
+            from django.conf import settings
+            backend = settings.CHANNEL_LAYERS['default']['BACKEND']
+            if backend.endswith('InMemoryChannelLayer'):
+                raise CommandError('The in-memory channel layer does not reach other processes')
+            self.stdout.write(f'channel layer: {backend}')
+        else:
+            self.stdout.write('channel layer: SQLiteChannelLayer (temporary file)')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for workers in worker_counts:
+                path = None if options['configured'] else os.path.join(directory, f'layer-{workers}.sqlite3')
+                self._run(path, workers, options['clients'], options['messages'], options['payload'])
+
+    def _run(self, path, workers, clients, messages, payload):
+        context = multiprocessing.get_context('spawn')
+        ready = context.Queue()
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(path, clients, messages, ready, results), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.get(timeout=60)
+
+        layer = _make_layer(path, messages)
+        body = 'x' * payload
+
+        async def send():
+            for seq in range(messages):
+                await layer.group_send(GROUP, {'type': 'benchmark', 'seq': seq, 'data': body})
+
+        start = time.monotonic()
+        asyncio.run(send())
+        sent = time.monotonic() - start
+        outcomes = [results.get(timeout=IDLE_TIMEOUT * 2 + 60) for _ in processes]
+        for process in processes:
+            process.join()
+        if not path:
+            asyncio.run(layer.flush())
+
+        delivered = sum(received for received, _ in outcomes)
+        expected = workers * clients * messages
+        elapsed = max(last for _, last in outcomes) - start
+        self.stdout.write(
+            f'{workers} worker(s) x {clients} clients: {delivered:,}/{expected:,} deliveries in {elapsed:.2f}s, '
+            f'{delivered / elapsed:,.0f} deliveries/s, {messages / sent:,.0f} group sends/s'
+        )
@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from infrastructure.models import EventModel, MediaModel
+from inehss.models import FormTemplate, HazardReport
+from inehss.serializers import HazardReportSerializer
+from interfaces.fastpath import ValuesSerializer
+from interfaces.renderers import ORJSON_AVAILABLE, FastJSONRenderer
+from interfaces.serializers import EventReportSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compares rows/sec of the DRF serializers and the .values() fast path on the hot list endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows serialized per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per variant; the best one is reported')
+        parser.add_argument('--existing', action='store_true', help='Use existing rows instead of temporary fixtures')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        self.repeat = options['repeat']
+        self.stdout.write(f'orjson available: {ORJSON_AVAILABLE}')
+
+        with transaction.atomic():
+            if not options['existing']:
+                self._create_fixtures(rows)
+
+            events = EventModel.objects.order_by('-created_at', '-id')[:rows]
+            reports = HazardReport.objects.order_by('-created_at')[:rows]
+            self._compare('events', events, EventReportSerializer, ['media_attachments'])
+            self._compare('hazard reports', reports, HazardReportSerializer, ['form_template', 'attachments'])
+
+            # Temporary fixtures are never committed
+            transaction.set_rollback(True)
+
+    def _create_fixtures(self, rows):
+        events = EventModel.objects.bulk_create(
+            EventModel(
+                title=f'Benchmark event {i}', description='Benchmark event description ' * 4,
+                category='benchmark', severity='high', latitude=9.0, longitude=7.4,
+            )
+            for i in range(rows)
+        )
+        # bulk_create skips storage and blob bookkeeping; the names are never opened
+        MediaModel.objects.bulk_create(
+            MediaModel(event=event, file=f'cas/be/nc/{event.id.hex}.jpg', processing_status=MediaModel.STATUS_DONE)
+            for event in events[::10]
+        )
+
+        form = FormTemplate.objects.create(name='Benchmark form', schema=[{'name': 'summary', 'type': 'text'}])
+        HazardReport.objects.bulk_create(
+            HazardReport(
+                form_template=form, tracking_id=f'BENCH-{i:08d}', data={'summary': 'Benchmark report'},
+                latitude=9.0, longitude=7.4,
+            )
+            for i in range(rows)
+        )
+
+    def _compare(self, label, queryset, serializer_class, prefetch):
+        def drf():
+            data = serializer_class(queryset.prefetch_related(*prefetch), many=True).data
+            return len(data), JSONRenderer().render(data)
+
+        def fast():
+            values = ValuesSerializer.compile(serializer_class())
+            data = values.serialize(values.values(queryset))
+            return len(data), FastJSONRenderer().render(data)
+
+        baseline = self._rows_per_second(drf)
+        optimized = self._rows_per_second(fast)
+        self.stdout.write(
+            f'{label}: ModelSerializer + JSONRenderer {baseline:,.0f} rows/s, '
+            f'values() + FastJSONRenderer {optimized:,.0f} rows/s '
+            f'({optimized / baseline:.1f}x)'
+        )
+
+    def _rows_per_second(self, run):
+        best = None
+        count = 0
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            count, _ = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return count / best if best else 0.0
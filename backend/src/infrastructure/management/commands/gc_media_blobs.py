@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from infrastructure.models import MediaBlob, MediaModel
+from infrastructure.storage import CAS_PREFIX, content_addressed_storage, hash_from_name
+from infrastructure.renditions import rendition_names
+from inehss.models import MediaAttachment
+
+
+class Command(BaseCommand):
+    help = 'Deletes content-addressed media files (and their renditions) that no MediaModel or MediaAttachment references.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24, help='Keep unreferenced blobs this long before deleting')
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts from the media tables first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self._recount()
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        deleted = freed = 0
+        for blob in MediaBlob.objects.filter(ref_count__lte=0, updated_at__lte=cutoff):
+            with transaction.atomic():
+                # Hold the row while deleting: an upload reusing the blob
+                # (ContentAddressedStorage.save) bumps updated_at under this lock
+                blob = MediaBlob.objects.select_for_update().filter(
+                    pk=blob.pk, ref_count__lte=0, updated_at__lte=cutoff,
+                ).first()
+                if blob is None:
+                    continue
+                # Re-check the tables: a new upload may have matched the blob just now
+                references = self._references(blob.name)
+                if references:
+                    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=references)
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f'Would delete {blob.name} ({blob.size} bytes)')
+                else:
+                    blob.delete()
+                    for name in [blob.name] + rendition_names(blob.name):
+                        content_addressed_storage.delete(name)
+            deleted += 1
+            freed += blob.size
+
+        verb = 'Would free' if options['dry_run'] else 'Freed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {freed} bytes from {deleted} unreferenced blobs'))
+
+    def _references(self, name):
+        return MediaModel.objects.filter(file=name).count() + MediaAttachment.objects.filter(file=name).count()
+
+    def _recount(self):
+        counts = {}
+        for model in (MediaModel, MediaAttachment):
+            rows = model.objects.filter(file__startswith=CAS_PREFIX + '/').values('file').annotate(total=Count('id')).order_by()
+            for row in rows:
+                counts[row['file']] = counts.get(row['file'], 0) + row['total']
+
+        fixed = 0
+        for blob in MediaBlob.objects.all():
+            actual = counts.pop(blob.name, 0)
+            if blob.ref_count != actual:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+                fixed += 1
+        for name, total in counts.items():
+            size = content_addressed_storage.size(name) if content_addressed_storage.exists(name) else 0
+            MediaBlob.objects.create(name=name, file_hash=hash_from_name(name), size=size, ref_count=total)
+            fixed += 1
+        self.stdout.write(f'Corrected {fixed} blob reference counts')
@@ -1,8 +1,10 @@
 import random
+from collections import Counter
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from infrastructure.models import EventModel
+from infrastructure.models import EventModel, EventCounter
+from application.services import EventStatsService
 
 class Command(BaseCommand):
     help = 'Generates a large dataset of events for stress testing.'
@@ -38,6 +40,7 @@ class Command(BaseCommand):
 
         batch_size = 1000
         events = []
+        counter_deltas = Counter()
         
         for i in range(count):
             # 70% chance to be near a hotspot, 30% random global
@@ -63,14 +66,26 @@ class Command(BaseCommand):
                 status='VERIFIED' if random.random() > 0.5 else 'PENDING',
                 trust_score=random.uniform(0.1, 1.0)
             )
+            # bulk_create bypasses save(), so fill the spatial keys here
+            event.assign_geohash()
+            event.assign_region()
             events.append(event)
 
             if len(events) >= batch_size:
-                EventModel.objects.bulk_create(events)
+                self._insert(events, counter_deltas)
                 events = []
                 self.stdout.write(f'Created {i+1} events...')
 
         if events:
-            EventModel.objects.bulk_create(events)
+            self._insert(events, counter_deltas)
+
+        EventCounter.apply_deltas(counter_deltas)
+        EventStatsService.invalidate()
 
         self.stdout.write(self.style.SUCCESS(f'Successfully created {count} events'))
+
+    def _insert(self, events, counter_deltas):
+        # Signals do not fire for bulk_create, so collect counter deltas from the
+        # saved instances (created_at is only final after the insert)
+        for event in EventModel.objects.bulk_create(events):
+            counter_deltas[EventCounter.bucket_for(event)] += 1
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from infrastructure import renditions
+from infrastructure.media_pipeline import process_attachment, process_media
+from infrastructure.models import MediaModel
+from inehss.models import MediaAttachment
+
+
+class Command(BaseCommand):
+    help = 'Processes media left pending by the background pipeline (e.g. after a restart).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--failed', action='store_true', help='Also retry media whose processing failed')
+        parser.add_argument('--stale', action='store_true', help='Also reset media stuck in processing')
+        parser.add_argument('--renditions', action='store_true', help='Generate missing renditions for processed images')
+
+    def handle(self, *args, **options):
+        statuses = [MediaModel.STATUS_PENDING]
+        if options['failed']:
+            statuses.append(MediaModel.STATUS_FAILED)
+        if options['stale']:
+            MediaModel.objects.filter(processing_status=MediaModel.STATUS_PROCESSING).update(
+                processing_status=MediaModel.STATUS_PENDING
+            )
+
+        media_ids = list(MediaModel.objects.filter(processing_status__in=statuses).values_list('id', flat=True))
+        done = failed = 0
+        for media_id in media_ids:
+            media = process_media(media_id)
+            if media is None:
+                continue
+            if media.processing_status == MediaModel.STATUS_DONE:
+                done += 1
+            else:
+                failed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} media files ({failed} failed)'))
+
+        if options['renditions']:
+            self._backfill_renditions()
+
+    def _backfill_renditions(self):
+        count = 0
+        for media in MediaModel.objects.filter(file_type='image', processing_status=MediaModel.STATUS_DONE, renditions={}):
+            try:
+                media.renditions = renditions.generate_renditions(media.file)
+            except Exception as e:
+                self.stderr.write(f'Skipping {media.id}: {e}')
+                continue
+            media.save(update_fields=['renditions'])
+            count += 1
+        for attachment_id in MediaAttachment.objects.filter(file_type='image', renditions={}).values_list('id', flat=True):
+            if process_attachment(attachment_id) is not None:
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {count} files'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from infrastructure.models import EventCounter
+from application.services import EventStatsService
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the event counters table from the events table to reconcile drift.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = EventCounter.compute_buckets()
+            current = {
+                (c.severity, c.status, c.category, c.day): c.count
+                for c in EventCounter.objects.select_for_update()
+            }
+
+            drifted = sum(
+                1 for bucket in set(expected) | set(current)
+                if expected.get(bucket, 0) != current.get(bucket, 0)
+            )
+
+            EventCounter.objects.all().delete()
+            EventCounter.objects.bulk_create(
+                [
+                    EventCounter(severity=severity, status=status, category=category, day=day, count=count)
+                    for (severity, status, category, day), count in expected.items()
+                ],
+                batch_size=1000,
+            )
+
+        EventStatsService.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(expected)} counter buckets ({drifted} had drifted)'
+        ))
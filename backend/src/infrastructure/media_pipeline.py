@@ -0,0 +1,233 @@
+"""
+Background processing for uploaded media.
+
+Report creation only stores the file and a `pending` MediaModel row. Hashing,
+type sniffing, EXIF extraction and image renditions run afterwards in an
+in-process thread pool, so request latency no longer depends on file size.
+Jobs are submitted once the surrounding transaction commits, and each
+finished job is announced as `media_processed` to the WebSocket clients
+subscribed to its event, batched with other real-time messages. When the hashing upload handlers already produced the
+hash and header bytes, the stored file is only read again to render images.
+
+The MediaModel row is the job record: anything left `pending` (e.g. after a
+restart) is picked up again by `manage.py process_media`.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from infrastructure import renditions
+from infrastructure.metadata_utils import MetadataExtractor
+from interfaces.broadcast import queue_message
+from interfaces.subscriptions import event_route
+
+logger = logging.getLogger(__name__)
+
+HEADER_BYTES = 64 * 1024
+
+# (offset, signature, mime type); RIFF/ISO containers are refined in sniff_content_type
+SIGNATURES = [
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'%PDF', 'application/pdf'),
+    (0, b'\x1a\x45\xdf\xa3', 'video/webm'),
+    (0, b'OggS', 'audio/ogg'),
+    (0, b'ID3', 'audio/mpeg'),
+    (0, b'\xff\xfb', 'audio/mpeg'),
+    (4, b'ftyp', 'video/mp4'),
+]
+
+
+def sniff_content_type(header):
+    """Identify a file from its leading bytes. Returns a MIME type or None."""
+    if header[:4] == b'RIFF':
+        return {b'WEBP': 'image/webp', b'WAVE': 'audio/wav', b'AVI ': 'video/x-msvideo'}.get(header[8:12])
+    for offset, signature, content_type in SIGNATURES:
+        if header[offset:offset + len(signature)] == signature:
+            if content_type == 'video/mp4' and header[8:12] in (b'M4A ', b'M4B '):
+                return 'audio/mp4'
+            if content_type == 'video/mp4' and header[8:12] == b'qt  ':
+                return 'video/quicktime'
+            return content_type
+    return None
+
+
+def file_type_for(content_type, default='image'):
+    """Map a MIME type onto MediaModel.file_type."""
+    if not content_type:
+        return default
+    if content_type.startswith('video/'):
+        return 'video'
+    if content_type.startswith('audio/'):
+        return 'audio'
+    if content_type.startswith('image/'):
+        return 'image'
+    return 'document'
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.MEDIA_PIPELINE_WORKERS,
+                    thread_name_prefix='media-pipeline',
+                )
+    return _executor
+
+
+def enqueue(media_id, header=None):
+    """
+    Schedule processing for a MediaModel once the current transaction commits.
+    `header` is the leading bytes captured by the upload handler, if any.
+    With MEDIA_PIPELINE_WORKERS = 0 the job runs inline (tests, management commands).
+    """
+    transaction.on_commit(lambda: submit(media_id, header))
+
+
+def enqueue_attachment(attachment_id):
+    """Schedule rendition generation for an INEHSS MediaAttachment after commit."""
+    transaction.on_commit(lambda: _dispatch(process_attachment, attachment_id))
+
+
+def submit(media_id, header=None):
+    _dispatch(process_media, media_id, header)
+
+
+def _dispatch(job, *args):
+    if settings.MEDIA_PIPELINE_WORKERS <= 0:
+        job(*args)
+    else:
+        _get_executor().submit(_run_in_worker, job, *args)
+
+
+def _run_in_worker(job, *args):
+    close_old_connections()
+    try:
+        job(*args)
+    finally:
+        close_old_connections()
+
+
+def _extract_metadata(file_obj, content_type):
+    file_obj.content_type = content_type
+    return MetadataExtractor.extract_from_file(file_obj)
+
+
+def process_media(media_id, header=None):
+    """
+    Hash, sniff and extract metadata for one MediaModel. Returns the updated
+    instance, or None if another worker already claimed it.
+
+    When the upload handler already supplied the hash and header bytes the
+    stored file is not read at all, unless EXIF lies beyond the header.
+    """
+    from infrastructure.models import MediaModel
+
+    claimed = MediaModel.objects.filter(
+        pk=media_id,
+        processing_status__in=[MediaModel.STATUS_PENDING, MediaModel.STATUS_FAILED],
+    ).update(processing_status=MediaModel.STATUS_PROCESSING)
+    if not claimed:
+        return None
+
+    media = MediaModel.objects.get(pk=media_id)
+    try:
+        metadata = dict(media.metadata)
+        extracted = None
+        if media.file_hash and header:
+            content_type = sniff_content_type(header)
+            if content_type:
+                extracted = _extract_metadata(ContentFile(header), content_type)
+                if 'error' in extracted and len(header) >= HEADER_BYTES:
+                    extracted = None
+            else:
+                extracted = {}
+
+        if extracted is None:
+            sha256 = hashlib.sha256()
+            header = b''
+            with media.file.open('rb') as fh:
+                for chunk in fh.chunks():
+                    if len(header) < HEADER_BYTES:
+                        header += chunk[:HEADER_BYTES - len(header)]
+                    sha256.update(chunk)
+                content_type = sniff_content_type(header)
+                extracted = _extract_metadata(fh, content_type) if content_type else {}
+            media.file_hash = sha256.hexdigest()
+
+        if content_type:
+            metadata['content_type'] = content_type
+        metadata.update(extracted)
+
+        media.file_type = file_type_for(content_type, media.file_type)
+        if media.file_type == 'image':
+            try:
+                media.renditions = renditions.generate_renditions(media.file)
+            except Exception as e:
+                # An undecodable image still gets its hash and metadata
+                metadata['rendition_error'] = str(e)
+        media.metadata = metadata
+        media.processing_status = MediaModel.STATUS_DONE
+        media.processing_error = ''
+    except Exception as e:
+        logger.exception(f"Media processing failed for {media_id}")
+        media.processing_status = MediaModel.STATUS_FAILED
+        media.processing_error = str(e)
+
+    media.processed_at = timezone.now()
+    media.save(update_fields=[
+        'file_hash', 'file_type', 'metadata', 'renditions',
+        'processing_status', 'processing_error', 'processed_at',
+    ])
+    _broadcast(media)
+    return media
+
+
+def process_attachment(attachment_id):
+    """Generate renditions for an image attachment; returns the attachment or None."""
+    from inehss.models import MediaAttachment
+
+    attachment = MediaAttachment.objects.filter(pk=attachment_id, file_type='image').first()
+    if attachment is None:
+        return None
+    try:
+        attachment.renditions = renditions.generate_renditions(attachment.file)
+    except Exception:
+        logger.exception(f"Rendition generation failed for attachment {attachment_id}")
+        return attachment
+    attachment.save(update_fields=['renditions'])
+    return attachment
+
+
+def _broadcast(media):
+    queue_message(
+        ('media', media.id),
+        {
+            'type': 'media_processed',
+            'media': {
+                'id': str(media.id),
+                'event_id': str(media.event_id),
+                'processing_status': media.processing_status,
+                'file_type': media.file_type,
+                'file_hash': media.file_hash,
+                'metadata': media.metadata,
+                'renditions': renditions.rendition_urls(media.file.storage, media.renditions),
+            }
+        },
+        event_route(media.event),
+    )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0007_alter_userprofile_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['-created_at', '-id'], name='events_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:00
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_counters(apps, schema_editor):
+    EventModel = apps.get_model('infrastructure', 'EventModel')
+    EventCounter = apps.get_model('infrastructure', 'EventCounter')
+    rows = (
+        EventModel.objects.annotate(day=TruncDate('created_at'))
+        .values('severity', 'status', 'category', 'day')
+        .annotate(total=Count('id'))
+    )
+    EventCounter.objects.bulk_create(
+        [
+            EventCounter(
+                severity=row['severity'], status=row['status'],
+                category=row['category'], day=row['day'], count=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0009_eventmodel_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('severity', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('category', models.CharField(max_length=100)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'event_counters',
+                'indexes': [models.Index(fields=['day'], name='event_counters_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('severity', 'status', 'category', 'day'), name='event_counters_bucket_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0010_eventcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['category', 'created_at'], name='events_category_created_idx'),
+        ),
+    ]
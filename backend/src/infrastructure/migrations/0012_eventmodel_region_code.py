@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0011_event_category_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='region_code',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=32),
+        ),
+    ]
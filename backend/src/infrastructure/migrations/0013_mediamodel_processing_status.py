@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:08
+
+from django.db import migrations, models
+
+
+def mark_existing_processed(apps, schema_editor):
+    # Media uploaded before the pipeline existed was hashed synchronously
+    MediaModel = apps.get_model('infrastructure', 'MediaModel')
+    MediaModel.objects.exclude(file_hash='').update(processing_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0012_eventmodel_region_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediamodel',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mediamodel',
+            name='processing_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='mediamodel',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_processed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:14
+
+import infrastructure.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0013_mediamodel_processing_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('file_hash', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'media_blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='mediamodel',
+            name='file',
+            field=models.FileField(storage=infrastructure.storage.get_content_storage, upload_to='uploads/%Y/%m/%d/'),
+        ),
+    ]
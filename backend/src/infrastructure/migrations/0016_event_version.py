@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0015_mediamodel_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventmodel',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0017_change_log'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='eventmodel',
+            options={'ordering': ['-created_at'], 'permissions': [('bulk_ingest_events', 'Can bulk ingest events from sensor and API feeds')]},
+        ),
+    ]
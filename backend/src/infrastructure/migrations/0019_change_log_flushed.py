@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:15
+
+from django.db import migrations, models
+
+
+def mark_existing_flushed(apps, schema_editor):
+    # Entries logged before the flag existed were broadcast already
+    ChangeLogEntry = apps.get_model('infrastructure', 'ChangeLogEntry')
+    ChangeLogEntry.objects.update(flushed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0018_event_bulk_ingest_permission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelogentry',
+            name='flushed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_existing_flushed, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(condition=models.Q(('flushed', False)), fields=['seq'], name='change_log_unflushed_idx'),
+        ),
+    ]
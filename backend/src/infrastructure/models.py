@@ -1,6 +1,13 @@
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction, IntegrityError
+from django.db.models import Count, Expression, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import timedelta
 import uuid
 from domain.entities import EventSeverity, EventStatus
+from infrastructure import geohash, regions
+from infrastructure.storage import content_hash, get_content_storage, hash_from_name, is_cas_name
 
 class EventModel(models.Model):
     """
@@ -28,8 +35,15 @@ class EventModel(models.Model):
     longitude = models.FloatField(null=True, blank=True, db_index=True)
     accuracy = models.FloatField(default=0.0)  # in meters
     altitude = models.FloatField(null=True, blank=True)
+    # Precomputed spatial key for bbox prefix scans (see infrastructure.geohash)
+    geohash = models.CharField(max_length=geohash.MAX_PRECISION, blank=True, default='', db_index=True, editable=False)
+    # Administrative region containing the point (see infrastructure.regions)
+    region_code = models.CharField(max_length=32, blank=True, default='', db_index=True, editable=False)
     
     trust_score = models.FloatField(default=0.0)
+    # Bumped by saves that change a VERSIONED_FIELDS value; real-time clients
+    # use it to spot missed updates
+    version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -38,26 +52,327 @@ class EventModel(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['latitude', 'longitude'], name='events_coords_idx'),
+            # Backs keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='events_created_id_idx'),
+            # Backs category-filtered time-series range scans
+            models.Index(fields=['category', 'created_at'], name='events_category_created_idx'),
         ]
+        permissions = [
+            ('bulk_ingest_events', 'Can bulk ingest events from sensor and API feeds'),
+        ]
+
+    # Plain columns of the real-time payload (see interfaces.broadcast)
+    VERSIONED_FIELDS = (
+        'title', 'description', 'category', 'severity', 'status',
+        'latitude', 'longitude', 'accuracy', 'altitude', 'trust_score',
+    )
 
     def __str__(self):
         return f"{self.title or 'Untitled'} ({self.status})"
 
+    def versioned_fields_changed(self):
+        """
+        Whether a VERSIONED_FIELDS value differs from the state recorded when
+        the instance was loaded or last saved. True when none was recorded.
+        """
+        previous = getattr(self, '_broadcast_state', None)
+        return previous is None or any(getattr(self, name) != previous[name] for name in self.VERSIONED_FIELDS)
+
+    def assign_geohash(self):
+        """Recompute the geohash from the current coordinates."""
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ''
+        else:
+            self.geohash = geohash.encode(self.latitude, self.longitude)
+
+    def assign_region(self):
+        """Recompute the region code from the current coordinates."""
+        self.region_code = regions.lookup_region(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.assign_geohash()
+            self.assign_region()
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash', 'region_code'}
+        if self._state.adding or not self.versioned_fields_changed():
+            super().save(*args, **kwargs)
+            return
+        # Incremented in the UPDATE itself, so concurrent saves of stale
+        # copies each get a version of their own
+        self.version = F('version') + 1
+        if update_fields is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'version'}
+        # The row stays locked until the new value has been read back
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.resolve_version()
+
+    def resolve_version(self):
+        """Read back the version a save incremented in the database."""
+        if isinstance(self.version, Expression):
+            self.refresh_from_db(fields=['version'])
+
+class EventCounter(models.Model):
+    """
+    Materialized event counts per (severity, status, category, day).
+
+    Kept up to date incrementally by EventModel signals using F() expressions,
+    so dashboards read a handful of rows instead of scanning `events`.
+    `rebuild_event_counters` reconciles any drift from bulk writes.
+    """
+    severity = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    category = models.CharField(max_length=100)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'event_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['severity', 'status', 'category', 'day'], name='event_counters_bucket_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='event_counters_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category}/{self.severity}/{self.status}: {self.count}"
+
+    @staticmethod
+    def bucket_for(event):
+        """Return the (severity, status, category, day) bucket of an event, or None."""
+        if event.created_at is None:
+            return None
+        day = timezone.localtime(event.created_at).date() if timezone.is_aware(event.created_at) else event.created_at.date()
+        return (event.severity, event.status, event.category, day)
+
+    @classmethod
+    def apply_delta(cls, bucket, delta):
+        """Atomically add delta to a bucket, creating the row on first use."""
+        severity, status, category, day = bucket
+        lookup = {'severity': severity, 'status': status, 'category': category, 'day': day}
+        if cls.objects.filter(**lookup).update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Another writer created the row first
+            cls.objects.filter(**lookup).update(count=F('count') + delta)
+
+    @classmethod
+    def compute_buckets(cls):
+        """Recount every bucket from the events table: {bucket: count}."""
+        rows = (
+            EventModel.objects.annotate(day=TruncDate('created_at'))
+            .values('severity', 'status', 'category', 'day')
+            .annotate(total=Count('id'))
+        )
+        return {
+            (row['severity'], row['status'], row['category'], row['day']): row['total']
+            for row in rows
+        }
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Apply a {bucket: delta} mapping, e.g. collected from a bulk insert."""
+        for bucket, delta in deltas.items():
+            if delta:
+                cls.apply_delta(bucket, delta)
+
+
 class MediaModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     event = models.ForeignKey(EventModel, on_delete=models.CASCADE, related_name='media_attachments')
-    file = models.FileField(upload_to='uploads/%Y/%m/%d/')
+    # Stored content-addressed (cas/ab/cd/<sha256>.ext); upload_to only applies to legacy rows
+    file = models.FileField(upload_to='uploads/%Y/%m/%d/', storage=get_content_storage)
     file_type = models.CharField(max_length=50, default='image') # image, video, audio
     file_hash = models.CharField(max_length=64, blank=True) # SHA-256
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Background processing (see infrastructure.media_pipeline)
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    PROCESSING_STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    processing_status = models.CharField(max_length=20, choices=PROCESSING_STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    processing_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Downscaled WebP copies: {'thumb': name, 'medium': name} (see infrastructure.renditions)
+    renditions = models.JSONField(default=dict, blank=True)
+
     class Meta:
         db_table = 'event_media'
 
     def __str__(self):
         return f"Media {self.id} for {self.event.id}"
 
+    def save(self, *args, **kwargs):
+        if self.file and not self.file._committed:
+            self.file_hash = content_hash(self.file.file)
+        super().save(*args, **kwargs)
+
+
+class MediaBlob(models.Model):
+    """
+    Reference count for a content-addressed media file.
+    MediaModel and INEHSS MediaAttachment rows sharing the same bytes share
+    one blob; blobs whose count drops to zero are collected by gc_media_blobs.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    file_hash = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'media_blobs'
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @classmethod
+    def retain(cls, field_file):
+        """Count one more reference to the blob behind a FieldFile."""
+        if not is_cas_name(field_file.name):
+            return
+        if cls.objects.filter(name=field_file.name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    name=field_file.name,
+                    file_hash=hash_from_name(field_file.name),
+                    size=field_file.size,
+                    ref_count=1,
+                )
+        except IntegrityError:
+            cls.objects.filter(name=field_file.name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+    @classmethod
+    def release(cls, field_file):
+        if is_cas_name(field_file.name):
+            cls.objects.filter(name=field_file.name).update(ref_count=F('ref_count') - 1, updated_at=timezone.now())
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Bounded log of event and hazard report changes for real-time replay.
+
+    The auto-increment primary key is the change sequence number WebSocket
+    clients resume from (see interfaces.broadcast). Only the newest
+    CHANGE_LOG_SIZE entries are kept; older ones are trimmed as new ones
+    are written.
+
+    Sequence numbers are assigned after the change itself has committed, by
+    one writer at a time, so they commit in order. Were they taken inside
+    the writing transaction, a lower seq could commit after a client had
+    already resumed past it, and that change would never be replayed. The
+    cost: a change whose process dies between its commit and its log entry
+    is missing from the log.
+
+    Commit order is not send order, though: each process broadcasts its own
+    entries from its own buffer, so a higher seq can reach clients first.
+    An entry is marked `flushed` once its frame has been sent, and frames
+    carry the `watermark` below which every entry has been sent, never a seq
+    that would let a resuming client skip one still in flight.
+    """
+    KIND_EVENT = 'event'
+    KIND_HAZARD_REPORT = 'hazard_report'
+    ACTION_CREATED = 'created'
+    ACTION_UPDATED = 'updated'
+    ACTION_DELETED = 'deleted'
+    # Trim once every this many entries rather than on every write
+    TRIM_EVERY = 100
+    # PostgreSQL advisory lock serialising writers (see record_many)
+    WRITER_LOCK_ID = 0x6368616E6765  # 'change'
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10)
+    created_at = models.DateTimeField(auto_now_add=True)
+    flushed = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'change_log'
+        indexes = [
+            # Only the few entries still waiting for a broadcast
+            models.Index(fields=['seq'], condition=models.Q(flushed=False), name='change_log_unflushed_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.kind} {self.object_id} {self.action}"
+
+    @classmethod
+    def record(cls, kind, object_id, action):
+        """Append one change and return its sequence number."""
+        return cls.record_many(kind, [object_id], action)[-1]
+
+    @classmethod
+    def record_many(cls, kind, object_ids, action):
+        """
+        Append changes with one insert; returns their sequence numbers in order.
+
+        Call once the changes have committed (transaction.on_commit). Writers
+        hold a lock until their entries commit: an advisory lock on
+        PostgreSQL, SQLite's database write lock on SQLite.
+        """
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(%s)', [cls.WRITER_LOCK_ID])
+            entries = cls.objects.bulk_create(
+                cls(kind=kind, object_id=str(object_id), action=action) for object_id in object_ids
+            )
+            seqs = [entry.seq for entry in entries]
+            if seqs and seqs[-1] // cls.TRIM_EVERY != (seqs[0] - 1) // cls.TRIM_EVERY:
+                cls.objects.filter(seq__lte=seqs[-1] - settings.CHANGE_LOG_SIZE).delete()
+        return seqs
+
+    @classmethod
+    def latest_seq(cls):
+        return cls.objects.order_by('-seq').values_list('seq', flat=True).first() or 0
+
+    @classmethod
+    def mark_flushed(cls, seqs, chunk_size=500):
+        """Record that the frames announcing these entries have been sent."""
+        seqs = list(seqs)
+        for start in range(0, len(seqs), chunk_size):
+            cls.objects.filter(seq__in=seqs[start:start + chunk_size]).update(flushed=True)
+
+    @classmethod
+    def watermark(cls, sending=()):
+        """
+        The highest seq at or below which every entry has been sent, counting
+        `sending`, the entries of the frame about to go out, as sent.
+
+        Entries unflushed for longer than REALTIME_FLUSH_GRACE_SECONDS are
+        skipped: their process died before broadcasting them, and they would
+        otherwise hold the watermark back for good. Resuming clients still
+        get them through replay.
+        """
+        latest = cls.latest_seq()
+        cutoff = timezone.now() - timedelta(seconds=settings.REALTIME_FLUSH_GRACE_SECONDS)
+        sending = set(sending)
+        in_flight = (
+            cls.objects.filter(flushed=False, seq__lte=latest, created_at__gt=cutoff)
+            .order_by('seq').values_list('seq', flat=True)
+        )
+        for seq in in_flight.iterator():
+            if seq not in sending:
+                return seq - 1
+        return latest
 
 
 class AuditLog(models.Model):
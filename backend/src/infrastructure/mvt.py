@@ -0,0 +1,139 @@
+"""
+Minimal Mapbox Vector Tile (MVT v2) encoder for point layers.
+
+Pure Python protobuf encoding, so tiles can be served without GDAL, PostGIS
+or a protobuf dependency. Only the subset needed for point features is
+implemented: layers, features with tags, and MoveTo point geometry.
+"""
+
+import math
+import struct
+
+DEFAULT_EXTENT = 4096
+
+# Protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+
+# MVT geometry types / commands
+_GEOM_POINT = 1
+_CMD_MOVE_TO = 1
+
+
+def tile_bounds(z, x, y):
+    """Return the (min_lon, min_lat, max_lon, max_lat) of an XYZ tile."""
+    n = 1 << z
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def project(latitude, longitude, z, x, y, extent=DEFAULT_EXTENT):
+    """Project a coordinate into integer tile-local coordinates."""
+    n = 1 << z
+    lat = max(min(latitude, 85.05112878), -85.05112878)
+    tile_x = (longitude + 180.0) / 360.0 * n
+    lat_rad = math.radians(lat)
+    tile_y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return int(round((tile_x - x) * extent)), int(round((tile_y - y) * extent))
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field_number, wire_type):
+    return _varint((field_number << 3) | wire_type)
+
+
+def _length_delimited(field_number, payload):
+    return _key(field_number, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed(field_number, values):
+    return _length_delimited(field_number, b''.join(_varint(v) for v in values))
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return _key(7, _VARINT) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _key(5, _VARINT) + _varint(value)
+        return _key(6, _VARINT) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, _FIXED64) + struct.pack('<d', value)
+    return _length_delimited(1, str(value).encode('utf-8'))
+
+
+class PointLayer:
+    """
+    Accumulates point features for one MVT layer.
+
+    Keys and values are de-duplicated as the spec requires, so repeated
+    properties (severity, status...) cost a couple of bytes per feature.
+    """
+
+    def __init__(self, name, extent=DEFAULT_EXTENT):
+        self.name = name
+        self.extent = extent
+        self._keys = {}
+        self._values = {}
+        self._features = []
+
+    def __len__(self):
+        return len(self._features)
+
+    def _index(self, table, item):
+        if item not in table:
+            table[item] = len(table)
+        return table[item]
+
+    def add_point(self, tile_x, tile_y, properties):
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(self._index(self._keys, key))
+            tags.append(self._index(self._values, (type(value).__name__, value)))
+
+        geometry = [(_CMD_MOVE_TO & 0x7) | (1 << 3), _zigzag(tile_x), _zigzag(tile_y)]
+        feature = (
+            _packed(2, tags)
+            + _key(3, _VARINT) + _varint(_GEOM_POINT)
+            + _packed(4, geometry)
+        )
+        self._features.append(feature)
+
+    def encode(self):
+        # Appending to a bytearray; bytes += would copy the layer per feature
+        body = bytearray(_key(15, _VARINT) + _varint(2))
+        body += _length_delimited(1, self.name.encode('utf-8'))
+        for feature in self._features:
+            body += _length_delimited(2, feature)
+        for key in self._keys:
+            body += _length_delimited(3, key.encode('utf-8'))
+        for _, value in self._values:
+            body += _length_delimited(4, _encode_value(value))
+        body += _key(5, _VARINT) + _varint(self.extent)
+        return bytes(body)
+
+
+def encode_tile(layers):
+    """Encode non-empty layers into a tile (bytes)."""
+    return b''.join(_length_delimited(3, layer.encode()) for layer in layers if len(layer))
@@ -0,0 +1,155 @@
+"""
+Administrative region lookup for event and report coordinates.
+
+Boundaries are read once from the GeoJSON files the frontend ships
+(`nigeria_optimized.json` LGAs and `world.geojson` countries). Polygons are
+bucketed into a coarse lat/lon grid, so a lookup only runs point-in-polygon
+tests against the few polygons whose bounding box covers the point.
+
+Region codes are hierarchical: 'NGA' (country), 'NGA.25' (state) and
+'NGA.25.3_1' (LGA). `region_ancestor` derives the coarser levels from a code.
+"""
+
+import json
+import logging
+import math
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ('country', 'state', 'lga')
+
+
+def region_ancestor(code, level):
+    """Return the code of `code` at the given level, or '' if it is coarser than that."""
+    if not code:
+        return ''
+    parts = code.split('.')
+    depth = LEVELS.index(level) + 1
+    if len(parts) < depth:
+        return ''
+    return '.'.join(parts[:depth])
+
+
+def _ring_contains(ring, lon, lat):
+    """Ray-casting test for a single linear ring of [lon, lat] pairs."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _polygon_contains(polygon, lon, lat):
+    if not polygon or not _ring_contains(polygon[0], lon, lat):
+        return False
+    return not any(_ring_contains(hole, lon, lat) for hole in polygon[1:])
+
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+class RegionIndex:
+    """Grid-bucketed point-in-polygon index over region boundaries."""
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self.names = {}
+        self._cells = defaultdict(list)
+        self._next_priority = 0
+
+    def __len__(self):
+        return self._next_priority
+
+    def _cell(self, lon, lat):
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def add(self, code, geometry):
+        """
+        Register a boundary. Regions added earlier win when boundaries
+        overlap, so finer layers should be added before coarser ones.
+        """
+        priority = self._next_priority
+        self._next_priority += 1
+        for polygon in _polygons(geometry):
+            outer = polygon[0]
+            min_lon = min(p[0] for p in outer)
+            max_lon = max(p[0] for p in outer)
+            min_lat = min(p[1] for p in outer)
+            max_lat = max(p[1] for p in outer)
+            entry = (priority, code, (min_lon, min_lat, max_lon, max_lat), polygon)
+            x0, y0 = self._cell(min_lon, min_lat)
+            x1, y1 = self._cell(max_lon, max_lat)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self._cells[(x, y)].append(entry)
+
+    def finalize(self):
+        for entries in self._cells.values():
+            entries.sort(key=lambda entry: entry[0])
+
+    def lookup(self, latitude, longitude):
+        """Return the region code containing the point, or '' if none does."""
+        if latitude is None or longitude is None:
+            return ''
+        for _, code, (min_lon, min_lat, max_lon, max_lat), polygon in self._cells.get(self._cell(longitude, latitude), ()):
+            if min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat:
+                if _polygon_contains(polygon, longitude, latitude):
+                    return code
+        return ''
+
+    def load_layer(self, path, code_property=None, name_property='name', state_property=None):
+        """
+        Load a GeoJSON FeatureCollection. The code comes from `code_property`
+        (or the feature id); state names are recorded for hierarchical codes.
+        """
+        with open(path, encoding='utf-8') as fh:
+            collection = json.load(fh)
+        for feature in collection.get('features', []):
+            properties = feature.get('properties') or {}
+            code = properties.get(code_property) if code_property else feature.get('id')
+            if not code or not feature.get('geometry'):
+                continue
+            self.names[code] = properties.get(name_property) or code
+            if state_property and properties.get(state_property):
+                self.names.setdefault(region_ancestor(code, 'state'), properties[state_property])
+            self.add(code, feature['geometry'])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_region_index():
+    """Build the process-wide index from settings.REGION_BOUNDARY_LAYERS on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = RegionIndex()
+                for layer in settings.REGION_BOUNDARY_LAYERS:
+                    layer = dict(layer)
+                    path = layer.pop('path')
+                    try:
+                        index.load_layer(path, **layer)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Region boundaries not loaded from {path}: {e}")
+                index.finalize()
+                _index = index
+    return _index
+
+
+def lookup_region(latitude, longitude):
+    return get_region_index().lookup(latitude, longitude)
@@ -0,0 +1,75 @@
+"""
+Downscaled WebP renditions of uploaded images.
+
+Renditions live next to the original (cas/ab/cd/<sha256>.thumb.webp), so
+they are shared by every row pointing at the same bytes and only ever
+generated once per content hash.
+"""
+
+import io
+import os
+
+try:
+    from PIL import Image, ImageOps
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+from django.core.files.base import ContentFile
+
+# label -> longest edge in pixels
+RENDITION_SIZES = {
+    'thumb': 320,
+    'medium': 1280,
+}
+WEBP_QUALITY = 80
+
+
+def rendition_name(name, label):
+    return f'{os.path.splitext(name)[0]}.{label}.webp'
+
+
+def rendition_names(name):
+    return [rendition_name(name, label) for label in RENDITION_SIZES]
+
+
+def generate_renditions(field_file):
+    """
+    Create any missing renditions for an image FieldFile.
+    Returns {label: storage name}; {} when Pillow is unavailable.
+    """
+    if not PILLOW_AVAILABLE:
+        return {}
+
+    storage = field_file.storage
+    names = {label: rendition_name(field_file.name, label) for label in RENDITION_SIZES}
+    missing = [label for label, name in names.items() if not storage.exists(name)]
+    if not missing:
+        return names
+
+    largest = max(RENDITION_SIZES[label] for label in missing)
+    with field_file.open('rb') as fh:
+        with Image.open(fh) as image:
+            # Let the JPEG decoder downscale while decoding
+            image.draft('RGB', (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+            for label in sorted(missing, key=lambda label: -RENDITION_SIZES[label]):
+                size = RENDITION_SIZES[label]
+                image.thumbnail((size, size), Image.LANCZOS)
+                buffer = io.BytesIO()
+                image.save(buffer, 'WEBP', quality=WEBP_QUALITY)
+                save = getattr(storage, 'save_derivative', storage.save)
+                names[label] = save(names[label], ContentFile(buffer.getvalue()))
+    return names
+
+
+def rendition_urls(storage, renditions, request=None):
+    """Map stored rendition names to URLs (absolute when a request is given)."""
+    urls = {}
+    for label, name in (renditions or {}).items():
+        url = storage.url(name)
+        urls[label] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -2,33 +2,132 @@
 Signal handlers to broadcast real-time events via WebSocket.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-from infrastructure.models import EventModel
-from interfaces.serializers import EventReportSerializer
+from django.utils import timezone
+from infrastructure.models import ChangeLogEntry, EventModel, EventCounter, MediaBlob, MediaModel
+from inehss.models import HazardReport, MediaAttachment
+from interfaces.broadcast import queue_event_deleted, queue_event_save, queue_report, remember_state
+from application.services import EventStatsService
 
 
 @receiver(post_save, sender=EventModel)
 def broadcast_event(sender, instance, created, **kwargs):
     """
-    Broadcast event creation/update to all connected WebSocket clients.
+    Broadcast event creation/update to the WebSocket clients subscribed to it.
+    Serialization and sending happen in batches after commit, and updates of
+    unrouted fields go out as patches (see interfaces.broadcast).
     """
-    channel_layer = get_channel_layer()
-    if not channel_layer:
+    # Runs inside save(), before it reads back the incremented version
+    instance.resolve_version()
+    queue_event_save(instance, created)
+
+
+@receiver(post_init, sender=EventModel)
+def remember_broadcast_state(sender, instance, **kwargs):
+    remember_state(instance)
+
+
+@receiver(post_delete, sender=EventModel)
+def broadcast_event_deleted(sender, instance, **kwargs):
+    queue_event_deleted(instance)
+
+
+@receiver(post_save, sender=HazardReport)
+def broadcast_hazard_report(sender, instance, created, raw=False, **kwargs):
+    """
+    Hazard report changes are announced and logged for replay like events.
+    """
+    if raw:
+        return
+    queue_report(instance, ChangeLogEntry.ACTION_CREATED if created else ChangeLogEntry.ACTION_UPDATED)
+
+
+@receiver(post_delete, sender=HazardReport)
+def broadcast_hazard_report_deleted(sender, instance, **kwargs):
+    queue_report(instance, ChangeLogEntry.ACTION_DELETED)
+
+
+@receiver(post_save, sender=EventModel)
+@receiver(post_delete, sender=EventModel)
+def invalidate_event_stats(sender, instance, **kwargs):
+    """
+    Any event write makes the cached HUD snapshot stale, once it commits: a
+    read between an earlier bump and the commit would cache the old counts
+    under the new version.
+    """
+    transaction.on_commit(EventStatsService.invalidate)
+
+
+@receiver(post_init, sender=EventModel)
+def remember_counter_bucket(sender, instance, **kwargs):
+    """
+    Snapshot the counter bucket as loaded, so a later save can move the event
+    between buckets without re-reading the row.
+    """
+    if instance.get_deferred_fields() & {'severity', 'status', 'category', 'created_at'}:
+        instance._counter_bucket = None
+        return
+    instance._counter_bucket = EventCounter.bucket_for(instance)
+
+
+@receiver(post_save, sender=EventModel)
+def update_event_counters(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep EventCounter in step with inserts and severity/status/category changes.
+    """
+    if raw:
+        return
+    new_bucket = EventCounter.bucket_for(instance)
+    old_bucket = None if created else getattr(instance, '_counter_bucket', None)
+
+    if created:
+        EventCounter.apply_delta(new_bucket, 1)
+    elif old_bucket is not None and old_bucket != new_bucket:
+        EventCounter.apply_delta(old_bucket, -1)
+        EventCounter.apply_delta(new_bucket, 1)
+    instance._counter_bucket = new_bucket
+
+
+@receiver(post_delete, sender=EventModel)
+def decrement_event_counters(sender, instance, **kwargs):
+    bucket = EventCounter.bucket_for(instance)
+    if bucket is not None:
+        EventCounter.apply_delta(bucket, -1)
+
+
+@receiver(post_save, sender=MediaModel)
+@receiver(post_save, sender=MediaAttachment)
+def retain_media_blob(sender, instance, created, raw=False, **kwargs):
+    """
+    Each row pointing at a content-addressed file holds one reference,
+    including an event MediaModel that shares an INEHSS attachment's file.
+    """
+    if created and not raw and instance.file:
+        MediaBlob.retain(instance.file)
+
+
+@receiver(post_delete, sender=MediaModel)
+@receiver(post_delete, sender=MediaAttachment)
+def release_media_blob(sender, instance, **kwargs):
+    if instance.file:
+        MediaBlob.release(instance.file)
+
+
+@receiver(post_save, sender=MediaModel)
+@receiver(post_delete, sender=MediaModel)
+@receiver(post_save, sender=MediaAttachment)
+@receiver(post_delete, sender=MediaAttachment)
+def touch_media_parent(sender, instance, raw=False, **kwargs):
+    """
+    Media is rendered inside event and report lists, so a change bumps the
+    parent's updated_at and with it the list ETag (see interfaces.conditional).
+    A queryset update skips the parent's own signals.
+    """
+    if raw:
         return
-    
-    serializer = EventReportSerializer(instance)
-    event_data = serializer.data
-    
-    message_type = 'event_created' if created else 'event_updated'
-    
-    # Broadcast to all connected clients
-    async_to_sync(channel_layer.group_send)(
-        'events_live',
-        {
-            'type': message_type,
-            'data': event_data
-        }
-    )
+    if sender is MediaModel:
+        EventModel.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
+    elif instance.report_id:
+        HazardReport.objects.filter(pk=instance.report_id).update(updated_at=timezone.now())
@@ -0,0 +1,109 @@
+"""
+Content-addressed media storage.
+
+Files are stored under cas/<h0h1>/<h2h3>/<sha256><ext>, whatever name the
+caller asked for, so identical uploads map to the same path. Saving content
+that already exists is a no-op: no bytes written, the existing name returned.
+Rows referencing a blob are counted in MediaBlob, and unreferenced blobs are
+removed by `manage.py gc_media_blobs` rather than on delete.
+
+Reusing an existing file and collecting it are serialised on the MediaBlob
+row. The collector locks the row and deletes the blob only if it has been
+untouched for the grace period; save() bumps the row's updated_at (waiting
+on that lock) before re-checking the file. A save therefore either pushes
+the blob back into the grace period or, if the collector got there first,
+finds the file gone and writes it again. The reference itself is counted
+when the media row is created, so the grace period must outlast a request.
+"""
+
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+CAS_PREFIX = 'cas'
+
+
+def content_hash(content):
+    """
+    SHA-256 of a File. Reuses the digest set by the hashing upload handlers,
+    otherwise streams the content once and caches the result on the object.
+    """
+    digest = getattr(content, 'sha256', None)
+    if not digest:
+        sha256 = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        digest = sha256.hexdigest()
+        content.sha256 = digest
+    return digest
+
+
+def cas_name(digest, original_name=''):
+    ext = os.path.splitext(original_name)[1].lower()[:10]
+    return f'{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def hash_from_name(name):
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def is_cas_name(name):
+    return bool(name) and name.startswith(CAS_PREFIX + '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = cas_name(content_hash(content), name)
+        if self._claim(name):
+            return name
+
+        saved = self._save(name, content)
+        if saved != name:
+            # Lost a race with an identical upload; keep the canonical copy
+            self.delete(saved)
+        return name
+
+    def _claim(self, name):
+        """
+        Reuse an existing blob, keeping gc_media_blobs away from it. Returns
+        False if the file must be (re)written instead.
+        """
+        from infrastructure.models import MediaBlob
+
+        if not self.exists(name):
+            return False
+        # Waits while the collector holds the row lock; if it went on to
+        # delete the blob, the file is gone by the time the update returns
+        MediaBlob.objects.filter(name=name).update(updated_at=timezone.now())
+        return self.exists(name)
+
+    def save_derivative(self, name, content):
+        """
+        Store a file derived from a blob (e.g. a rendition) under the exact
+        name given, rather than its own hash. Existing files are left alone.
+        """
+        if self.exists(name):
+            return name
+        saved = super().save(name, content)
+        if saved != name:
+            self.delete(saved)
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def get_content_storage():
+    return content_addressed_storage
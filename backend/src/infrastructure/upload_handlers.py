@@ -0,0 +1,78 @@
+"""
+Upload handlers that hash files while they stream in.
+
+Each chunk is fed to SHA-256 and the first HEADER_BYTES are kept as they
+arrive, so the resulting UploadedFile carries `sha256` and `header` and
+nothing downstream needs to re-read it. Large uploads go to
+UPLOAD_TEMP_DIR, created on first use. It sits on the same filesystem as
+MEDIA_ROOT so FileSystemStorage saves them with a rename instead of a copy,
+but outside it so partial files are never publicly served.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+from infrastructure.media_pipeline import HEADER_BYTES
+
+
+class HashingUploadMixin:
+    def new_file(self, *args, **kwargs):
+        # Reset first: MemoryFileUploadHandler.new_file raises StopFutureHandlers
+        self._sha256 = hashlib.sha256()
+        self._header = bytearray()
+        super().new_file(*args, **kwargs)
+
+    def _owns_file(self):
+        return True
+
+    def receive_data_chunk(self, raw_data, start):
+        if self._owns_file():
+            self._sha256.update(raw_data)
+            if len(self._header) < HEADER_BYTES:
+                self._header += raw_data[:HEADER_BYTES - len(self._header)]
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self._sha256.hexdigest()
+            uploaded.header = bytes(self._header)
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    """Small uploads, kept in memory."""
+
+    def _owns_file(self):
+        # Not activated for uploads above FILE_UPLOAD_MAX_MEMORY_SIZE
+        return self.activated
+
+
+class SpooledUploadedFile(TemporaryUploadedFile):
+    """A TemporaryUploadedFile created in UPLOAD_TEMP_DIR."""
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(
+            suffix='.upload' + os.path.splitext(name)[1], dir=settings.UPLOAD_TEMP_DIR,
+        )
+        UploadedFile.__init__(self, file, name, content_type, size, charset, content_type_extra)
+
+
+class SpoolingFileUploadHandler(TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler writing to UPLOAD_TEMP_DIR."""
+
+    def new_file(self, *args, **kwargs):
+        super(TemporaryFileUploadHandler, self).new_file(*args, **kwargs)
+        self.file = SpooledUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra,
+        )
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, SpoolingFileUploadHandler):
+    """Large uploads, streamed to a temporary file in UPLOAD_TEMP_DIR."""
@@ -0,0 +1,411 @@
+"""
+Buffered, batched WebSocket broadcasts.
+
+Event saves only record which event changed, once the transaction commits,
+so rolled-back writes are never announced and the request thread does no
+serialization or channel-layer I/O. A background flusher drains the buffer
+REALTIME_BATCH_INTERVAL_MS after the first change, or as soon as
+REALTIME_BATCH_SIZE changes are waiting. A flush:
+
+- coalesces repeated changes to the same event or media file,
+- loads and serializes all new events with one query (plus one media
+  prefetch),
+- sends each subscription group a single `events_batch` frame carrying the
+  messages routed to it (see interfaces.subscriptions).
+
+With REALTIME_BATCH_INTERVAL_MS = 0 the buffer flushes inline on commit.
+Otherwise the background flusher sends its frames from the server's event
+loop, which consumers register on connect: sending from a loop of its own
+would leave consumers of the in-memory channel layer asleep until something
+else woke them. The flusher is a daemon thread, so whatever is still queued
+when the process exits (management commands, media workers) is flushed by
+an atexit hook instead of being dropped.
+
+Updates that leave an event's routing attributes alone are sent as an
+`event_patch` with only the changed fields, taken from the instance at save
+time, so a status transition needs no event query or serializer pass. A
+patch moves the event from `base_version` to `version`; a client holding any
+other version has missed something and should reload the event. Saves that
+change none of these fields keep the version (EventModel.save) and send
+nothing, so clients never see a version they have no message for.
+
+Every announced event and hazard report change is also appended to the
+ChangeLogEntry table once its transaction has committed, so sequence
+numbers follow commit order (see ChangeLogEntry.record_many). Each process
+sends the entries it logged from its own buffer, so a frame may go out
+before one holding a lower seq from another process. Frames therefore carry
+the watermark as `seq`: every change up to it has been sent, by this frame
+or an earlier one (see ChangeLogEntry.watermark). A frame's own changes may
+lie above it, and a client resuming from it gets them again, as current
+state. A reconnecting client resumes from the last seq it saw: `replay` coalesces the gap into the
+current state of each changed object. A gap older than the bounded log, or
+larger than REALTIME_REPLAY_LIMIT, needs a full reload instead.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from infrastructure.models import ChangeLogEntry, EventModel
+from inehss.models import HazardReport
+from .serializers import EventReportSerializer
+from .subscriptions import event_route, publish_batch
+
+logger = logging.getLogger(__name__)
+
+# Plain EventModel columns of the broadcast payload; these can travel as patches
+DELTA_FIELDS = EventModel.VERSIONED_FIELDS
+# Changing these moves the event between subscriptions, so a full message is sent
+ROUTED_FIELDS = {'latitude', 'longitude', 'category', 'severity'}
+
+
+def remember_state(instance):
+    """Snapshot the broadcast fields as loaded, so a save can be diffed."""
+    if instance.get_deferred_fields() & set(DELTA_FIELDS + ('version',)):
+        instance._broadcast_state = None
+        return
+    instance._broadcast_state = {name: getattr(instance, name) for name in DELTA_FIELDS}
+    instance._broadcast_version = instance.version
+
+
+def report_route(report):
+    """Hazard reports route like events, with their priority as severity."""
+    return {
+        'latitude': report.latitude,
+        'longitude': report.longitude,
+        'region_code': report.region_code,
+        'severity': report.priority,
+        'category': 'hazard_report',
+    }
+
+
+def report_message(report, action):
+    """A compact `hazard_report_changed` message built without queries."""
+    return {
+        'type': 'hazard_report_changed',
+        'action': action,
+        'report': {
+            'id': str(report.id),
+            'tracking_id': report.tracking_id,
+            'status': report.status,
+            'priority': report.priority,
+            'latitude': report.latitude,
+            'longitude': report.longitude,
+            'address': report.address,
+            'created_at': report.created_at.isoformat() if report.created_at else None,
+        },
+    }
+
+
+class BroadcastBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._seqs = []
+        self._has_items = threading.Event()
+        self._full = threading.Event()
+        self._flusher = None
+        self._loop = None
+
+    def bind_loop(self, loop):
+        """Send background flushes from `loop`, the loop serving WebSockets."""
+        self._loop = loop
+
+    def _track(self, seq):
+        if seq is not None:
+            self._seqs.append(seq)
+
+    def add_event(self, event_id, created, seq=None):
+        """Queue a full event_created / event_updated; created wins when both happen."""
+        key = ('event', event_id)
+        with self._lock:
+            current = self._pending.get(key)
+            created = created or (current is not None and current[0] == 'full' and current[1])
+            self._pending[key] = ('full', created)
+            self._track(seq)
+            size = len(self._pending)
+        self._schedule(size)
+
+    def add_events(self, event_ids, seqs):
+        """Queue event_created messages for a bulk insert with a single wakeup."""
+        with self._lock:
+            for event_id in event_ids:
+                self._pending[('event', event_id)] = ('full', True)
+            self._seqs.extend(seqs)
+            size = len(self._pending)
+        self._schedule(size)
+
+    def add_patch(self, event_id, base_version, version, changes, route, seq=None):
+        """Queue an event_patch, merged into a pending patch for the same event."""
+        key = ('event', event_id)
+        with self._lock:
+            current = self._pending.get(key)
+            if current is None:
+                message = {
+                    'type': 'event_patch', 'id': str(event_id),
+                    'base_version': base_version, 'version': version, 'changes': dict(changes),
+                }
+                self._pending[key] = ('message', message, route)
+            elif current[0] == 'message' and current[1]['type'] == 'event_patch':
+                current[1]['changes'].update(changes)
+                current[1]['version'] = version
+            # else: the pending full message is loaded at flush time and already current
+            self._track(seq)
+            size = len(self._pending)
+        self._schedule(size)
+
+    def add_message(self, key, message, route, seq=None):
+        """Queue a ready-made message; a later one with the same key replaces it."""
+        with self._lock:
+            self._pending[key] = ('message', message, route)
+            self._track(seq)
+            size = len(self._pending)
+        self._schedule(size)
+
+    def _schedule(self, size):
+        if settings.REALTIME_BATCH_INTERVAL_MS <= 0:
+            self.flush()
+            return
+        self._start_flusher()
+        self._has_items.set()
+        if size >= settings.REALTIME_BATCH_SIZE:
+            self._full.set()
+
+    def _start_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run, name='broadcast-flusher', daemon=True)
+                    self._flusher.start()
+
+    def _run(self):
+        while True:
+            # Idle until something is queued, then gather for one interval
+            self._has_items.wait()
+            self._full.wait(settings.REALTIME_BATCH_INTERVAL_MS / 1000)
+            self._has_items.clear()
+            self._full.clear()
+            close_old_connections()
+            try:
+                self.flush(self._loop)
+            except Exception:
+                logger.exception("Real-time broadcast flush failed")
+            finally:
+                close_old_connections()
+
+    def flush(self, loop=None):
+        """Send everything queued so far, from `loop` if given (see publish_batch)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            seqs, self._seqs = self._seqs, []
+        if not pending:
+            return
+
+        serialized = _serialize_events({key[1]: value[1] for key, value in pending.items() if value[0] == 'full'})
+        messages = []
+        routes = []
+        for key, value in pending.items():
+            if value[0] == 'full':
+                if key[1] not in serialized:
+                    # Deleted before the flush
+                    continue
+                message, route = serialized[key[1]]
+            else:
+                _, message, route = value
+            messages.append(message)
+            routes.append(route)
+        seq = ChangeLogEntry.watermark(seqs) if seqs else None
+        publish_batch(messages, routes, settings.REALTIME_BATCH_SIZE, seq, loop)
+        # Only now may other processes' frames count these changes as sent
+        ChangeLogEntry.mark_flushed(seqs)
+
+
+def _serialize_events(created_by_id):
+    """Full messages for {event_id: created} with one query, as {event_id: (message, route)}."""
+    if not created_by_id:
+        return {}
+    events = list(EventModel.objects.filter(pk__in=list(created_by_id)).prefetch_related('media_attachments'))
+    return {
+        event.id: (
+            {'type': 'event_created' if created_by_id[event.id] else 'event_updated', 'event': data},
+            event_route(event),
+        )
+        for event, data in zip(events, EventReportSerializer(events, many=True).data)
+    }
+
+
+buffer = BroadcastBuffer()
+
+
+def bind_server_loop():
+    """Called by consumers on connect, from the loop serving them."""
+    buffer.bind_loop(asyncio.get_running_loop())
+
+
+def _flush_at_exit():
+    try:
+        buffer.flush()
+    except Exception:
+        logger.exception("Real-time broadcast flush at exit failed")
+
+
+atexit.register(_flush_at_exit)
+
+
+def _log_on_commit(kind, object_id, action, announce):
+    """
+    Once the transaction commits, append the change to the log and pass its
+    sequence number to `announce`, which queues the broadcast.
+    """
+    transaction.on_commit(lambda: announce(ChangeLogEntry.record(kind, object_id, action)))
+
+
+def queue_event(event_id, created, action):
+    """Announce an event write to subscribed clients after the transaction commits."""
+    _log_on_commit(ChangeLogEntry.KIND_EVENT, event_id, action, lambda seq: buffer.add_event(event_id, created, seq))
+
+
+def queue_events_created(event_ids):
+    """Announce bulk-inserted events after commit, logged with one write."""
+    def announce():
+        seqs = ChangeLogEntry.record_many(ChangeLogEntry.KIND_EVENT, event_ids, ChangeLogEntry.ACTION_CREATED)
+        buffer.add_events(event_ids, seqs)
+
+    transaction.on_commit(announce)
+
+
+def queue_event_save(instance, created):
+    """
+    Announce a saved event: a patch when only unrouted fields changed, a full
+    message otherwise, nothing when the save changed no broadcast field.
+    """
+    previous = getattr(instance, '_broadcast_state', None)
+    base_version = getattr(instance, '_broadcast_version', None)
+    remember_state(instance)
+    if created or previous is None:
+        action = ChangeLogEntry.ACTION_CREATED if created else ChangeLogEntry.ACTION_UPDATED
+        queue_event(instance.pk, created, action)
+        return
+
+    changed = [name for name in DELTA_FIELDS if getattr(instance, name) != previous[name]]
+    if not changed:
+        return
+    if ROUTED_FIELDS.intersection(changed):
+        queue_event(instance.pk, False, ChangeLogEntry.ACTION_UPDATED)
+        return
+
+    fields = _serializer_fields()
+    changes = {}
+    for name in changed:
+        value = getattr(instance, name)
+        changes[name] = None if value is None else fields[name].to_representation(value)
+    event_id, version, route = instance.pk, instance.version, event_route(instance)
+    _log_on_commit(
+        ChangeLogEntry.KIND_EVENT, event_id, ChangeLogEntry.ACTION_UPDATED,
+        lambda seq: buffer.add_patch(event_id, base_version, version, changes, route, seq),
+    )
+
+
+def queue_event_deleted(instance):
+    message = {'type': 'event_deleted', 'id': str(instance.pk)}
+    key, route = ('event', instance.pk), event_route(instance)
+    _log_on_commit(
+        ChangeLogEntry.KIND_EVENT, instance.pk, ChangeLogEntry.ACTION_DELETED,
+        lambda seq: buffer.add_message(key, message, route, seq),
+    )
+
+
+def queue_report(instance, action):
+    """Announce a hazard report change (created / updated / deleted) after commit."""
+    message = report_message(instance, action)
+    key, route = ('report', instance.pk), report_route(instance)
+    _log_on_commit(
+        ChangeLogEntry.KIND_HAZARD_REPORT, instance.pk, action,
+        lambda seq: buffer.add_message(key, message, route, seq),
+    )
+
+
+def queue_message(key, message, route):
+    """Announce a prebuilt message, e.g. `media_processed`, after commit."""
+    transaction.on_commit(lambda: buffer.add_message(key, message, route))
+
+
+_fields = None
+
+
+def _serializer_fields():
+    global _fields
+    if _fields is None:
+        _fields = EventReportSerializer().fields
+    return _fields
+
+
+def replay(since, limit):
+    """
+    (messages, routes, seq) bringing a client at sequence `since` up to date,
+    one message per changed object with its current state. messages is None
+    when the gap can no longer be replayed.
+
+    Every entry up to the latest visible seq has committed, because entries
+    are written after their change commits, one writer at a time (see
+    ChangeLogEntry). Replay reads the current state of each object from the
+    database, not from any buffer, so it covers entries whose live frame
+    has not gone out yet and may return the latest seq rather than the
+    watermark; the live frame arriving later only repeats that state.
+    """
+    latest = ChangeLogEntry.latest_seq()
+    if since > latest:
+        return None, [], latest
+    if since == latest:
+        return [], [], latest
+    oldest = ChangeLogEntry.objects.order_by('seq').values_list('seq', flat=True).first()
+    if oldest is None or oldest > since + 1:
+        # Trimmed, or a sequence number lost to a rollback right at the start
+        return None, [], latest
+    entries = list(
+        ChangeLogEntry.objects.filter(seq__gt=since).order_by('seq')
+        .values_list('seq', 'kind', 'object_id', 'action')[:limit + 1]
+    )
+    if len(entries) > limit:
+        return None, [], latest
+
+    # Last action per object, ordered by its latest change
+    changes = {}
+    for _, kind, object_id, action in entries:
+        key = (kind, object_id)
+        created = action == ChangeLogEntry.ACTION_CREATED or changes.pop(key, (None, False))[1]
+        changes[key] = (action, created)
+
+    to_event_id = EventModel._meta.pk.to_python
+    events = _serialize_events({
+        to_event_id(object_id): created
+        for (kind, object_id), (action, created) in changes.items()
+        if kind == ChangeLogEntry.KIND_EVENT and action != ChangeLogEntry.ACTION_DELETED
+    })
+    reports = {
+        str(report.pk): report
+        for report in HazardReport.objects.filter(pk__in=[
+            object_id for (kind, object_id), (action, _) in changes.items()
+            if kind == ChangeLogEntry.KIND_HAZARD_REPORT and action != ChangeLogEntry.ACTION_DELETED
+        ])
+    }
+
+    messages = []
+    routes = []
+    for (kind, object_id), (action, created) in changes.items():
+        if kind == ChangeLogEntry.KIND_EVENT:
+            message, route = events.get(to_event_id(object_id), ({'type': 'event_deleted', 'id': object_id}, None))
+        elif object_id in reports:
+            report = reports[object_id]
+            action = ChangeLogEntry.ACTION_CREATED if created else ChangeLogEntry.ACTION_UPDATED
+            message, route = report_message(report, action), report_route(report)
+        else:
+            message = {'type': 'hazard_report_changed', 'action': ChangeLogEntry.ACTION_DELETED, 'report': {'id': object_id}}
+            route = None
+        messages.append(message)
+        routes.append(route)
+    return messages, routes, entries[-1][0]
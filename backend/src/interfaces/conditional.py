@@ -0,0 +1,54 @@
+"""
+Conditional GET for polled list endpoints.
+
+Validators come from a single Max(updated_at) / Count aggregate per
+queryset, so an unchanged page is answered with 304 Not Modified before any
+row is fetched or serialized. Related rows rendered inside a list (event
+media, report attachments) touch their parent's updated_at through signals,
+which keeps the aggregate honest for nested data.
+
+The ETag also covers the full path and the negotiated media type, so pages,
+filters and formats never share a validator. Deletions change the count,
+which only the ETag sees; Last-Modified is a best effort for clients that
+ignore ETags.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def list_validators(request, *querysets):
+    """(etag, last_modified) for a list built from the given querysets."""
+    parts = [request.get_full_path(), getattr(request, 'accepted_media_type', '') or '']
+    last_modified = None
+    for queryset in querysets:
+        latest = queryset.order_by().aggregate(updated=Max('updated_at'), count=Count('pk'))
+        parts.append(f"{latest['updated'].isoformat() if latest['updated'] else ''}/{latest['count']}")
+        if latest['updated'] and (last_modified is None or latest['updated'] > last_modified):
+            last_modified = latest['updated']
+    etag = '"%s"' % hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return etag, last_modified
+
+
+def conditional_response(request, querysets, respond):
+    """
+    Return 304 when the client's If-None-Match / If-Modified-Since still
+    match, otherwise the response built by `respond()`; both carry the
+    validators. Clients must revalidate before reusing a cached copy.
+    """
+    etag, last_modified = list_validators(request, *querysets)
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = respond()
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    # Responses that must not be stored at all (NDJSON exports) keep no-store
+    response.setdefault('Cache-Control', 'private, no-cache')
+    return response
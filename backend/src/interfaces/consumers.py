@@ -1,12 +1,29 @@
 """
 WebSocket consumer for real-time event updates.
 Clients connect to /ws/events/ to receive live event notifications.
+
+By default a connection receives every event. A `subscribe` message narrows
+the feed to a bbox, region codes, a minimum severity and/or categories (see
+interfaces.subscriptions); `unsubscribe` restores the full feed.
+
+Broadcast frames carry the change sequence number `seq`. A reconnecting
+client sends `resume` with the last one it saw (or passes ?resume_from= when
+connecting) and receives only what changed since, filtered by its current
+subscription, or `resync_required` when it has to reload instead (see
+interfaces.broadcast).
 """
 
 import json
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from infrastructure.models import ChangeLogEntry
+from .broadcast import bind_server_loop, replay
+from .subscriptions import ALL_GROUP, Subscription
 
 
 class EventConsumer(AsyncWebsocketConsumer):
@@ -16,28 +33,78 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def connect(self):
         """Called when a WebSocket connection is opened."""
-        self.room_group_name = 'events_live'
+        self.subscription = Subscription()
+        self.groups_joined = set()
+        bind_server_loop()
         
         # Join the events broadcast group
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name
-        )
+        await self._join([ALL_GROUP])
         
         await self.accept()
         
         # Send welcome message
         await self.send(text_data=json.dumps({
             'type': 'connection_established',
-            'message': 'Connected to Sentinel Core real-time feed'
+            'message': 'Connected to Sentinel Core real-time feed',
+            'seq': await database_sync_to_async(ChangeLogEntry.latest_seq)()
         }))
+        
+        resume_from = parse_qs(self.scope.get('query_string', b'').decode()).get('resume_from')
+        if resume_from:
+            await self._resume(resume_from[0])
     
     async def disconnect(self, close_code):
         """Called when the WebSocket closes."""
-        await self.channel_layer.group_discard(
-            self.room_group_name,
-            self.channel_name
-        )
+        await self._join([])
+    
+    async def _join(self, groups):
+        """Move the connection to exactly these groups."""
+        groups = set(groups)
+        for group in self.groups_joined - groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        for group in groups - self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        self.groups_joined = groups
+    
+    async def _subscribe(self, subscription):
+        self.subscription = subscription
+        await self._join(subscription.groups())
+    
+    async def _resume(self, since):
+        """Replay the changes after sequence number `since`."""
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'message': 'resume_from must be a sequence number'
+            }))
+            return
+        messages, routes, seq = await database_sync_to_async(replay)(since, settings.REALTIME_REPLAY_LIMIT)
+        if messages is None:
+            await self.send(text_data=json.dumps({
+                'type': 'resync_required',
+                'seq': seq
+            }))
+            return
+        messages = [
+            message for message, route in zip(messages, routes)
+            if route is None or self.subscription.matches(route)
+        ]
+        # At least one frame, so the client learns the replay is complete
+        size = settings.REALTIME_BATCH_SIZE
+        for start in range(0, max(len(messages), 1), size):
+            await self.send(text_data=json.dumps({
+                'type': 'events_batch',
+                'seq': seq,
+                'replay': True,
+                'messages': messages[start:start + size]
+            }))
+    
+    def _wants(self, event):
+        """Exact filter on top of the group routing."""
+        route = event.get('route')
+        return route is None or self.subscription.matches(route)
     
     async def receive(self, text_data):
         """Handle incoming messages from WebSocket."""
@@ -50,14 +117,40 @@ class EventConsumer(AsyncWebsocketConsumer):
                     'type': 'pong',
                     'timestamp': data.get('timestamp')
                 }))
+            elif message_type == 'subscribe':
+                try:
+                    subscription = Subscription.from_message(data)
+                except ValueError as e:
+                    await self.send(text_data=json.dumps({
+                        'type': 'error',
+                        'message': str(e)
+                    }))
+                    return
+                await self._subscribe(subscription)
+                await self.send(text_data=json.dumps({
+                    'type': 'subscribed',
+                    'subscription': subscription.describe()
+                }))
+            elif message_type == 'resume':
+                await self._resume(data.get('resume_from'))
+            elif message_type == 'unsubscribe':
+                await self._subscribe(Subscription())
+                await self.send(text_data=json.dumps({
+                    'type': 'unsubscribed'
+                }))
             elif message_type == 'subscribe_region':
                 # Subscribe to a specific region
                 region = data.get('region')
                 if region:
-                    await self.channel_layer.group_add(
-                        f'region_{region}',
-                        self.channel_name
-                    )
+                    try:
+                        subscription = Subscription(regions=[region])
+                    except ValueError as e:
+                        await self.send(text_data=json.dumps({
+                            'type': 'error',
+                            'message': str(e)
+                        }))
+                        return
+                    await self._subscribe(subscription)
                     await self.send(text_data=json.dumps({
                         'type': 'subscribed',
                         'region': region
@@ -70,6 +163,8 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def event_created(self, event):
         """Handle new event broadcast."""
+        if not self._wants(event):
+            return
         await self.send(text_data=json.dumps({
             'type': 'event_created',
             'event': event['data']
@@ -77,11 +172,27 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def event_updated(self, event):
         """Handle event update broadcast."""
+        if not self._wants(event):
+            return
         await self.send(text_data=json.dumps({
             'type': 'event_updated',
             'event': event['data']
         }))
     
+    async def events_batch(self, event):
+        """Handle a batch of buffered broadcasts (see interfaces.broadcast)."""
+        messages = [
+            message for message, route in zip(event['messages'], event['routes'])
+            if route is None or self.subscription.matches(route)
+        ]
+        if not messages:
+            return
+        await self.send(text_data=json.dumps({
+            'type': 'events_batch',
+            'seq': event.get('seq'),
+            'messages': messages
+        }))
+    
     async def event_verified(self, event):
         """Handle event verification broadcast."""
         await self.send(text_data=json.dumps({
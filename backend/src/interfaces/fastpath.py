@@ -0,0 +1,189 @@
+"""
+Fast read path for hot list endpoints.
+
+ValuesSerializer compiles an existing ModelSerializer (already trimmed by
+?fields=) into a flat list of (output key, values() key, converter) and
+builds response dicts straight from `.values()` rows. No model instances are
+created and DRF field introspection runs once per request instead of once
+per row. Reverse relations serialized with many=True are fetched with one
+extra `.values()` query each.
+
+Types that `.values()` already returns in their JSON form (strings, numbers,
+booleans, JSON) are copied as-is; everything else goes through the DRF
+field's own to_representation, so the output matches the ModelSerializer.
+Serializers this cannot reproduce exactly (custom to_representation, method
+fields without a `values_<name>` counterpart, unknown field types) compile
+to None and the caller falls back to the regular serializer.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+# Field types whose to_representation is a no-op on values() output
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+CONVERTED_FIELDS = (
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.UUIDField,
+)
+
+
+class Unsupported(Exception):
+    pass
+
+
+def _file_converter(field, storage):
+    request = field.context.get('request')
+    use_url = getattr(field, 'use_url', True)
+
+    def convert(name):
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+class ValuesSerializer:
+    """Row -> dict serializer compiled from a bound ModelSerializer."""
+
+    # Entry kinds, kept in the serializer's field order
+    FIELD, METHOD, FORWARD, REVERSE = range(4)
+
+    def __init__(self, serializer, prefix=''):
+        if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+            raise Unsupported(f'{type(serializer).__name__} overrides to_representation')
+
+        self.model = serializer.Meta.model
+        self.prefix = prefix
+        self.columns = {prefix + self.model._meta.pk.attname}
+        # (kind, output key, detail): values key + converter, bound values_<name>,
+        # fk values key + ValuesSerializer, or ValuesSerializer + child fk attname
+        self.entries = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                self._compile_method(serializer, name)
+            elif isinstance(field, serializers.ListSerializer):
+                self._compile_reverse(name, field)
+            elif isinstance(field, serializers.BaseSerializer):
+                self._compile_forward(name, field)
+            else:
+                self._compile_field(name, field)
+
+    def _compile_method(self, serializer, name):
+        method = getattr(serializer, f'values_{name}', None)
+        if method is None:
+            raise Unsupported(f'no values_{name}() for method field {name}')
+        for column in getattr(serializer, 'values_sources', {}).get(name, []):
+            self.columns.add(self.prefix + column)
+        self.entries.append((self.METHOD, name, method))
+
+    def _compile_reverse(self, name, field):
+        if self.prefix:
+            raise Unsupported(f'{name} is nested inside a related object')
+        try:
+            relation = self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise Unsupported(f'{field.source} is not a relation')
+        if not relation.one_to_many:
+            raise Unsupported(f'{field.source} is not a reverse foreign key')
+        self.entries.append((self.REVERSE, name, (ValuesSerializer(field.child), relation.field.attname)))
+
+    def _compile_forward(self, name, field):
+        try:
+            relation = self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise Unsupported(f'{field.source} is not a relation')
+        if not (relation.many_to_one or relation.one_to_one) or relation.auto_created:
+            raise Unsupported(f'{field.source} is not a forward foreign key')
+        fk_key = self.prefix + relation.attname
+        self.columns.add(fk_key)
+        child = ValuesSerializer(field, prefix=f'{self.prefix}{relation.name}__')
+        self.entries.append((self.FORWARD, name, (fk_key, child)))
+
+    def _compile_field(self, name, field):
+        if field.source == '*':
+            raise Unsupported(f'{name} reads the whole object')
+        key = self.prefix + '__'.join(field.source.split('.'))
+        if isinstance(field, serializers.FileField):
+            storage = self.model._meta.get_field(field.source).storage
+            converter = _file_converter(field, storage)
+        elif isinstance(field, CONVERTED_FIELDS):
+            converter = field.to_representation
+        elif isinstance(field, PASSTHROUGH_FIELDS):
+            converter = None
+        else:
+            raise Unsupported(f'{type(field).__name__} {name}')
+        self.columns.add(key)
+        self.entries.append((self.FIELD, name, (key, converter)))
+
+    @classmethod
+    def compile(cls, serializer):
+        """ValuesSerializer for a bound ModelSerializer, or None if unsupported."""
+        try:
+            return cls(serializer)
+        except Unsupported:
+            return None
+
+    def value_columns(self):
+        columns = set(self.columns)
+        for kind, _, detail in self.entries:
+            if kind == self.FORWARD:
+                columns |= detail[1].value_columns()
+        return columns
+
+    def values(self, queryset, *extra):
+        """The queryset as dict rows carrying every column this serializer reads."""
+        return queryset.prefetch_related(None).values(*sorted(self.value_columns() | set(extra)))
+
+    def to_representation(self, row):
+        ret = {}
+        for kind, name, detail in self.entries:
+            if kind == self.FIELD:
+                key, converter = detail
+                value = row[key]
+                ret[name] = value if value is None or converter is None else converter(value)
+            elif kind == self.METHOD:
+                ret[name] = detail(self._unprefixed(row))
+            elif kind == self.FORWARD:
+                fk_key, child = detail
+                ret[name] = None if row[fk_key] is None else child.to_representation(row)
+            else:
+                ret[name] = []  # filled in by serialize()
+        return ret
+
+    def _unprefixed(self, row):
+        if not self.prefix:
+            return row
+        size = len(self.prefix)
+        return {key[size:]: value for key, value in row.items() if key.startswith(self.prefix)}
+
+    def serialize(self, rows):
+        """Serialize a page of rows (from values()), with their reverse relations."""
+        rows = list(rows)
+        data = [self.to_representation(row) for row in rows]
+        reverse = [(name, detail) for kind, name, detail in self.entries if kind == self.REVERSE]
+        if not reverse or not rows:
+            return data
+
+        pk = self.model._meta.pk.attname
+        positions = {row[pk]: index for index, row in enumerate(rows)}
+        for name, (child, fk) in reverse:
+            child_rows = list(child.values(child.model.objects.filter(**{f'{fk}__in': list(positions)}), fk))
+            for child_row, child_data in zip(child_rows, child.serialize(child_rows)):
+                data[positions[child_row[fk]]][name].append(child_data)
+        return data
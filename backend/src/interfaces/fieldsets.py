@@ -0,0 +1,115 @@
+"""
+Sparse fieldsets for read endpoints.
+
+`?fields=id,status` limits a response to the listed top-level fields, and
+`?expand=media_attachments` adds a nested relation on top of them (or, for
+serializers that only summarise a relation by default, returns it in full).
+Both are comma separated and only apply to GET/HEAD requests, so they can
+never drop input fields on writes.
+
+The same parameters drive the queryset: `optimize_queryset` selects and
+prefetches only the relations that will be serialized and, when `fields`
+is given, loads only the columns behind them.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_list(value):
+    """'a, b,,c' -> {'a', 'b', 'c'}"""
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def _query_param(request, name):
+    # Accept plain Django requests as well as DRF ones
+    return getattr(request, 'query_params', request.GET).get(name)
+
+
+def requested_fields(request):
+    """Field names from ?fields= (plus ?expand=), or None when the client wants everything."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = parse_field_list(_query_param(request, 'fields'))
+    if not fields:
+        return None
+    return fields | requested_expansions(request)
+
+
+def requested_expansions(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    return parse_field_list(_query_param(request, 'expand'))
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring ?fields= and ?expand= from the request in its
+    context. Only the top-level serializer is trimmed: serializers nested as
+    fields are bound without a request when they are constructed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    def is_expanded(self, name):
+        return name in requested_expansions(self.context.get('request'))
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request, extra_columns=()):
+        """
+        select_related/prefetch_related the relations the requested fields
+        read, and restrict the columns with only() when ?fields= is given.
+        Fields whose source cannot be traced to a model field (method fields,
+        properties) keep every column loaded.
+        """
+        serializer = cls(context={'request': request})
+        opts = queryset.model._meta
+        columns = {opts.pk.name, *extra_columns}
+        select_related = set()
+        prefetch_related = set()
+        restrict = requested_fields(request) is not None
+
+        for field in serializer.fields.values():
+            if field.source == '*':
+                restrict = False
+                continue
+            path = field.source.split('.')
+            try:
+                model_field = opts.get_field(path[0])
+            except FieldDoesNotExist:
+                restrict = False
+                continue
+
+            if model_field.one_to_many or model_field.many_to_many:
+                prefetch_related.add(model_field.name)
+            elif model_field.is_relation and (len(path) > 1 or isinstance(field, serializers.BaseSerializer)):
+                select_related.add(model_field.name)
+            columns.add(model_field.name)
+
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
+        if restrict:
+            queryset = queryset.only(*sorted(columns - prefetch_related))
+        return queryset
+
+
+class SparseFieldsetViewMixin:
+    """
+    Generic view mixin applying the serializer's optimize_queryset to reads,
+    for both list and detail (get_object) queries.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if self.request.method in SAFE_METHODS and issubclass(serializer_class, SparseFieldsetMixin):
+            queryset = serializer_class.optimize_queryset(queryset, self.request)
+        return queryset
@@ -0,0 +1,78 @@
+"""
+Shared query-parameter filters for event list endpoints.
+"""
+
+import math
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from infrastructure import geohash
+
+
+def parse_bbox(bbox_param):
+    """
+    Parse a 'minLon,minLat,maxLon,maxLat' string.
+    Returns a (min_lon, min_lat, max_lon, max_lat) tuple or None if malformed.
+    A reversed box (e.g. one crossing the antimeridian) or one with a
+    non-finite coordinate (nan, inf) is rejected with a 400.
+    """
+    if not bbox_param:
+        return None
+    try:
+        coords = [float(c) for c in bbox_param.split(',')]
+    except (ValueError, TypeError):
+        return None
+    if len(coords) != 4:
+        return None
+    if not all(math.isfinite(c) for c in coords):
+        raise ValidationError({'bbox': 'bbox coordinates must be finite numbers'})
+    if coords[0] > coords[2] or coords[1] > coords[3]:
+        raise ValidationError({'bbox': 'bbox minimum must not exceed its maximum; split boxes crossing the antimeridian'})
+    return tuple(coords)
+
+
+def geohash_bbox_q(bbox, max_cells=32):
+    """
+    Q object selecting rows whose geohash falls in one of the prefix ranges
+    covering the bbox. Rows that have not been backfilled yet (empty geohash)
+    are kept so the exact coordinate filter can still decide.
+    """
+    condition = Q(geohash='')
+    for low, high in geohash.bbox_ranges(bbox, max_cells):
+        if high is None:
+            condition |= Q(geohash__gte=low)
+        else:
+            condition |= Q(geohash__gte=low, geohash__lt=high)
+    return condition
+
+
+def filter_bbox(queryset, bbox):
+    """Restrict an EventModel queryset to a (min_lon, min_lat, max_lon, max_lat) box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    # Geohash ranges narrow the index scan; the coordinate filter trims cell edges
+    return queryset.filter(geohash_bbox_q(bbox)).filter(
+        latitude__gte=min_lat,
+        latitude__lte=max_lat,
+        longitude__gte=min_lon,
+        longitude__lte=max_lon
+    )
+
+
+def filter_events(queryset, query_params):
+    """
+    Apply the bbox, severity and status filters used by the admin event lists.
+    """
+    bbox = parse_bbox(query_params.get('bbox'))
+    if bbox:
+        queryset = filter_bbox(queryset, bbox)
+
+    severity = query_params.get('severity')
+    if severity:
+        queryset = queryset.filter(severity=severity.lower())
+
+    status_filter = query_params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter.lower())
+
+    return queryset
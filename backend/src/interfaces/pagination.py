@@ -0,0 +1,164 @@
+"""
+Pagination classes for high-volume event lists.
+
+EventKeysetPagination seeks on the (created_at, id) composite index instead of
+using OFFSET, so every page costs the same regardless of how deep the client
+has scrolled. Both classes honour `count=false` to skip the COUNT(*) query.
+"""
+
+import base64
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+def include_count(request):
+    """Total counts are returned unless the client passes count=false."""
+    return request.query_params.get('count', 'true').lower() not in ('false', '0', 'no')
+
+
+def use_keyset(request):
+    """Keyset mode is selected with mode=cursor."""
+    return request.query_params.get('mode') == 'cursor'
+
+
+class EventPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination that honours `limit` and can skip the total count.
+    """
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.include_count = include_count(request)
+        if self.include_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        # Without a count we fetch one extra row to know whether a next page exists
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = max(int(request.query_params.get(self.page_query_param, 1)), 1)
+        except (TypeError, ValueError):
+            self.page_number = 1
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.include_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self._uncounted_link(self.page_number + 1) if self.has_next else None),
+            ('previous', self._uncounted_link(self.page_number - 1) if self.page_number > 1 else None),
+            ('results', data),
+        ]))
+
+    def _uncounted_link(self, page_number):
+        url = self.request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
+
+
+class EventKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination ordered by (-created_at, -id).
+
+    The cursor is an opaque base64 token holding the (created_at, id) of the
+    last row on the previous page.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.include_count = include_count(request)
+        self.count = queryset.count() if self.include_count else None
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        page = rows[:self.page_size]
+        self.next_position = None
+        if len(rows) > self.page_size:
+            last = page[-1]
+            # Pages of .values() rows come from the fast list path (interfaces.fastpath)
+            if isinstance(last, dict):
+                self.next_position = (last['created_at'], last['id'])
+            else:
+                self.next_position = (last.created_at, last.pk)
+        return page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.include_count:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = None
+        payload['results'] = data
+        return Response(payload)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(*self.next_position))
+
+    def encode_cursor(self, created_at, pk):
+        raw = f'{created_at.isoformat()}|{pk}'.encode('ascii')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            created_at, pk = raw.split('|', 1)
+            return datetime.fromisoformat(created_at), uuid.UUID(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor returned in the `next` link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results per page (max 100)',
+                'schema': {'type': 'integer'},
+            },
+        ]
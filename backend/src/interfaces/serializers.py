@@ -1,16 +1,33 @@
+import math
 
 from rest_framework import serializers
+from domain.entities import EventSeverity
 from infrastructure.models import EventModel, MediaModel, AuditLog, AIInteractionLog
+from infrastructure.renditions import rendition_urls
+from .fieldsets import SparseFieldsetMixin
 
 class MediaSerializer(serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = MediaModel
-        fields = ['id', 'file', 'file_type', 'file_hash', 'metadata', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'file', 'file_type', 'file_hash', 'metadata', 'renditions', 'processing_status', 'created_at']
+        read_only_fields = ['id', 'processing_status', 'created_at']
+
+    def get_renditions(self, obj):
+        return rendition_urls(obj.file.storage, obj.renditions, self.context.get('request'))
+
+    # Row-based get_renditions for interfaces.fastpath
+    values_sources = {'renditions': ['renditions']}
+
+    def values_renditions(self, row):
+        storage = MediaModel._meta.get_field('file').storage
+        return rendition_urls(storage, row['renditions'], self.context.get('request'))
 
-class EventReportSerializer(serializers.ModelSerializer):
+class EventReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Event Reports with location support.
+    Honours ?fields= / ?expand= when a request is in the context.
     """
     media_attachments = MediaSerializer(many=True, read_only=True)
     
@@ -19,9 +36,83 @@ class EventReportSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'category', 'severity', 
             'status', 'latitude', 'longitude', 'accuracy', 'altitude',
-            'media_attachments', 'trust_score', 'created_at'
+            'media_attachments', 'trust_score', 'version', 'created_at'
         ]
-        read_only_fields = ['id', 'status', 'trust_score', 'created_at']
+        read_only_fields = ['id', 'status', 'trust_score', 'version', 'created_at']
+
+def validate_event_batch(rows):
+    """
+    Validate a batch of event dicts for bulk ingestion.
+
+    Checks the same fields as EventReportSerializer column by column with
+    plain Python instead of instantiating a serializer per row, which is
+    what makes ingesting thousands of feed events per request cheap.
+    Returns (valid, errors): cleaned dicts, and [{'index', 'errors'}] for
+    rejected rows.
+    """
+    severities = {tag.value for tag in EventSeverity}
+    title_max = EventModel._meta.get_field('title').max_length
+    category_max = EventModel._meta.get_field('category').max_length
+    bounds = {'latitude': (-90.0, 90.0), 'longitude': (-180.0, 180.0)}
+
+    valid = []
+    errors = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({'index': index, 'errors': {'non_field_errors': ['Expected an object.']}})
+            continue
+
+        row_errors = {}
+        cleaned = {}
+
+        description = row.get('description')
+        if not isinstance(description, str) or not description.strip():
+            row_errors['description'] = ['This field is required.']
+        else:
+            cleaned['description'] = description
+
+        title = row.get('title') or ''
+        if not isinstance(title, str) or len(title) > title_max:
+            row_errors['title'] = [f'Must be a string of at most {title_max} characters.']
+        else:
+            cleaned['title'] = title
+
+        category = row.get('category') or 'general'
+        if not isinstance(category, str) or len(category) > category_max:
+            row_errors['category'] = [f'Must be a string of at most {category_max} characters.']
+        else:
+            cleaned['category'] = category.lower()
+
+        severity = row.get('severity') or EventSeverity.LOW.value
+        if not isinstance(severity, str) or severity.lower() not in severities:
+            row_errors['severity'] = [f'"{severity}" is not a valid choice.']
+        else:
+            cleaned['severity'] = severity.lower()
+
+        for field in ('latitude', 'longitude', 'accuracy', 'altitude'):
+            value = row.get(field)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                row_errors[field] = ['A valid number is required.']
+                continue
+            try:
+                value = float(value)
+            except ValueError:
+                value = None
+            if value is None or not math.isfinite(value):
+                row_errors[field] = ['A valid number is required.']
+                continue
+            if field in bounds and not bounds[field][0] <= value <= bounds[field][1]:
+                row_errors[field] = [f'Must be between {bounds[field][0]} and {bounds[field][1]}.']
+                continue
+            cleaned[field] = value
+
+        if row_errors:
+            errors.append({'index': index, 'errors': row_errors})
+        else:
+            valid.append(cleaned)
+    return valid, errors
 
 class AuditLogSerializer(serializers.ModelSerializer):
     class Meta:
@@ -31,7 +122,7 @@ class AuditLogSerializer(serializers.ModelSerializer):
 
 
 
-class AIInteractionLogSerializer(serializers.ModelSerializer):
+class AIInteractionLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
 
     class Meta:
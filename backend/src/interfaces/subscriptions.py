@@ -0,0 +1,236 @@
+"""
+Filtered WebSocket subscriptions.
+
+A connection may narrow its feed to a bounding box, region codes, a minimum
+severity and/or categories. Routing happens through channel-layer groups, so
+it works with any channel layer and across worker processes:
+
+- the subscriber joins the groups of one routing dimension, the most
+  selective it asked for: the 1-degree grid cells its bbox covers, its
+  region codes, its categories or its severity threshold;
+- the publisher derives the few groups an event belongs to (its cell, the
+  region code at each level, its category, every threshold at or below its
+  severity) and sends only there.
+
+The grid cells act as a spatial index: a publish costs a handful of group
+sends however many dashboards are connected, and the groups within one
+dimension never overlap, so a connection gets each event once. The consumer
+applies the exact filter (bbox edges, the other dimensions) before anything
+goes over the socket. Unfiltered connections stay in `events_live`.
+"""
+
+import asyncio
+import math
+import re
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from domain.entities import EventSeverity
+from infrastructure import regions
+
+ALL_GROUP = 'events_live'
+CELL_SIZE = 1.0
+# Larger boxes route by their other filters, or through the unfiltered group
+MAX_CELLS = 64
+MAX_REGIONS = 50
+MAX_CATEGORIES = 20
+
+SEVERITY_LEVELS = [tag.value for tag in EventSeverity]
+
+
+def _cell(lon, lat):
+    return math.floor(lon / CELL_SIZE), math.floor(lat / CELL_SIZE)
+
+
+def cell_group(x, y):
+    return f'events_cell_{x}_{y}'
+
+
+def region_group(code):
+    return f'events_region_{code}'
+
+
+def category_group(category):
+    # Group names only allow [a-zA-Z0-9._-]; collisions are resolved by the exact filter
+    return 'events_category_' + re.sub(r'[^a-z0-9._-]', '_', category.lower())[:60]
+
+
+def severity_group(level):
+    return f'events_severity_{level}'
+
+
+def event_route(event):
+    """The attributes subscriptions filter on, taken from an EventModel."""
+    return {
+        'latitude': event.latitude,
+        'longitude': event.longitude,
+        'region_code': event.region_code,
+        'severity': event.severity,
+        'category': event.category,
+    }
+
+
+def route_groups(route):
+    """Every group an event with this route is published to."""
+    groups = [ALL_GROUP]
+    if route['latitude'] is not None and route['longitude'] is not None:
+        groups.append(cell_group(*_cell(route['longitude'], route['latitude'])))
+    for level in regions.LEVELS:
+        code = regions.region_ancestor(route['region_code'], level)
+        if code:
+            groups.append(region_group(code))
+    if route['category']:
+        groups.append(category_group(route['category']))
+    if route['severity'] in SEVERITY_LEVELS:
+        rank = SEVERITY_LEVELS.index(route['severity'])
+        groups.extend(severity_group(level) for level in SEVERITY_LEVELS[1:rank + 1])
+    return groups
+
+
+class Subscription:
+    """A parsed `subscribe` request; raises ValueError for invalid filters."""
+
+    def __init__(self, bbox=None, regions=None, min_severity=None, categories=None):
+        self.bbox = self._parse_bbox(bbox) if bbox else None
+        self.regions = self._normalize_regions(regions or [])
+        self.categories = sorted({str(c).lower() for c in categories or [] if c})
+        if len(self.categories) > MAX_CATEGORIES:
+            raise ValueError(f'At most {MAX_CATEGORIES} categories')
+        if min_severity and min_severity not in SEVERITY_LEVELS:
+            raise ValueError(f"min_severity must be one of {', '.join(SEVERITY_LEVELS)}")
+        self.min_severity = min_severity or None
+
+    @classmethod
+    def from_message(cls, data):
+        regions = data.get('regions') or ([data['region']] if data.get('region') else [])
+        categories = data.get('categories') or ([data['category']] if data.get('category') else [])
+        return cls(
+            bbox=data.get('bbox'), regions=regions,
+            min_severity=data.get('min_severity'), categories=categories,
+        )
+
+    @staticmethod
+    def _parse_bbox(bbox):
+        if isinstance(bbox, str):
+            bbox = bbox.split(',')
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox)
+        except (TypeError, ValueError):
+            raise ValueError('bbox must be minLon,minLat,maxLon,maxLat')
+        if not all(math.isfinite(v) for v in (min_lon, min_lat, max_lon, max_lat)):
+            raise ValueError('bbox coordinates must be finite numbers')
+        if min_lon > max_lon or min_lat > max_lat:
+            raise ValueError('bbox minimum must not exceed its maximum')
+        return min_lon, min_lat, max_lon, max_lat
+
+    @staticmethod
+    def _normalize_regions(codes):
+        codes = {str(code) for code in codes if code}
+        if len(codes) > MAX_REGIONS:
+            raise ValueError(f'At most {MAX_REGIONS} regions')
+        if any(not re.fullmatch(r'[A-Za-z0-9._-]{1,32}', code) for code in codes):
+            raise ValueError('Invalid region code')
+        # A code already covered by one of its ancestors would deliver twice
+        return sorted(
+            code for code in codes
+            if not any(code.startswith(other + '.') for other in codes)
+        )
+
+    @property
+    def is_filtered(self):
+        return bool(self.bbox or self.regions or self.min_severity or self.categories)
+
+    def _cells(self):
+        min_x, min_y = _cell(self.bbox[0], self.bbox[1])
+        max_x, max_y = _cell(self.bbox[2], self.bbox[3])
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_CELLS:
+            return None
+        return [cell_group(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+    def groups(self):
+        """The groups to join: one routing dimension, most selective first."""
+        if self.bbox:
+            cells = self._cells()
+            if cells is not None:
+                return cells
+        if self.regions:
+            return [region_group(code) for code in self.regions]
+        if self.categories:
+            return sorted({category_group(c) for c in self.categories})
+        if self.min_severity and self.min_severity != SEVERITY_LEVELS[0]:
+            return [severity_group(self.min_severity)]
+        return [ALL_GROUP]
+
+    def matches(self, route):
+        if self.bbox:
+            if route['latitude'] is None or route['longitude'] is None:
+                return False
+            min_lon, min_lat, max_lon, max_lat = self.bbox
+            if not (min_lon <= route['longitude'] <= max_lon and min_lat <= route['latitude'] <= max_lat):
+                return False
+        if self.regions:
+            code = route['region_code'] or ''
+            if not any(code == r or code.startswith(r + '.') for r in self.regions):
+                return False
+        if self.min_severity:
+            if route['severity'] not in SEVERITY_LEVELS:
+                return False
+            if SEVERITY_LEVELS.index(route['severity']) < SEVERITY_LEVELS.index(self.min_severity):
+                return False
+        if self.categories and (route['category'] or '').lower() not in self.categories:
+            return False
+        return True
+
+    def describe(self):
+        return {
+            'bbox': list(self.bbox) if self.bbox else None,
+            'regions': self.regions,
+            'min_severity': self.min_severity,
+            'categories': self.categories,
+        }
+
+
+def publish_batch(messages, routes, size, seq=None, loop=None):
+    """
+    Send each group one `events_batch` frame (per `size` messages) holding
+    the messages routed to it, in order. `seq` is the change sequence
+    number the batch brings clients up to. Given the server's event `loop`,
+    the frames are sent from it (see _send_frames).
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer or not messages:
+        return
+    by_group = {}
+    for message, route in zip(messages, routes):
+        for group in route_groups(route):
+            by_group.setdefault(group, []).append((message, route))
+    frames = []
+    for group, pairs in by_group.items():
+        for start in range(0, len(pairs), size):
+            chunk = pairs[start:start + size]
+            frames.append((group, {
+                'type': 'events_batch',
+                'seq': seq,
+                'messages': [message for message, _ in chunk],
+                'routes': [route for _, route in chunk],
+            }))
+    _send_frames(channel_layer, frames, loop)
+
+
+def _send_frames(channel_layer, frames, loop=None):
+    """
+    group_send every (group, frame). From a thread of its own, sends must be
+    handed to the loop the consumers run on: the in-memory layer only wakes
+    receivers waiting on the loop the message was sent from.
+    """
+    async def send():
+        for group, frame in frames:
+            await channel_layer.group_send(group, frame)
+
+    if loop is not None and loop.is_running():
+        # Bounded, so a loop that stops mid-send cannot hang the caller
+        asyncio.run_coroutine_threadsafe(send(), loop).result(timeout=30)
+    else:
+        async_to_sync(send)()
+
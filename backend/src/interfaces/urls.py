@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EventReportCreateView, EventListAdminView, StatsSummaryView, AuditLogViewSet, AIInteractionLogViewSet, CustomAuthToken, EventActionView, HealthCheckView
+from .views import EventReportCreateView, EventBulkCreateView, EventListAdminView, EventClusterView, VectorTileView, StatsSummaryView, StatsTimeseriesView, StatsRegionsView, AuditLogViewSet, AIInteractionLogViewSet, CustomAuthToken, EventActionView, HealthCheckView
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
 router = DefaultRouter()
@@ -11,9 +11,14 @@ urlpatterns = [
     path('', include(router.urls)),
 
     path('reports/', EventReportCreateView.as_view(), name='event-report-create'),
+    path('reports/bulk/', EventBulkCreateView.as_view(), name='event-bulk-create'),
     path('admin/events/', EventListAdminView.as_view(), name='event-list-admin'),
+    path('events/clusters/', EventClusterView.as_view(), name='event-clusters'),
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', VectorTileView.as_view(), name='vector-tile'),
     path('admin/events/<uuid:pk>/<str:action>/', EventActionView.as_view(), name='event-action'),
     path('stats/summary/', StatsSummaryView.as_view(), name='stats-summary'),
+    path('stats/timeseries/', StatsTimeseriesView.as_view(), name='stats-timeseries'),
+    path('stats/regions/', StatsRegionsView.as_view(), name='stats-regions'),
     path('health/', HealthCheckView.as_view(), name='health-check'),
     # API Schema views
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
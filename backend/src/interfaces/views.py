@@ -1,13 +1,21 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.parsers import MultiPartParser, FormParser
-from application.services import EventReportingService
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from application.services import EventReportingService, EventStatsService
 from infrastructure.models import EventModel
-from .serializers import EventReportSerializer
-from django.db.models import Count, Q
+from .serializers import EventReportSerializer, validate_event_batch
+from django.db.models import Avg, Case, Count, IntegerField, Q, Value, When
+from django.http import HttpResponse
+from django.db.models.functions import Substr
+from infrastructure import geohash, mvt, regions
+from inehss.models import HazardReport
 from domain.entities import EventSeverity, EventStatus
 import json
+from datetime import datetime, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from rest_framework import viewsets, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -18,7 +26,13 @@ from .serializers import (
     AIInteractionLogSerializer,
     AIInteractionLogCreateSerializer,
 )
-from rest_framework.pagination import PageNumberPagination
+from .filters import filter_bbox, filter_events, parse_bbox
+from .conditional import conditional_response
+from .fastpath import ValuesSerializer
+from .fieldsets import SparseFieldsetViewMixin
+from .pagination import EventPageNumberPagination, EventKeysetPagination, use_keyset
+from .renderers import FastJSONRenderer
+from .streaming import NDJSONParser
 from rest_framework.throttling import ScopedRateThrottle
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
@@ -84,6 +98,59 @@ class EventReportCreateView(APIView):
             logger.warning(f"Validation failed for report: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class CanBulkIngestEvents(permissions.BasePermission):
+    """Allow bulk ingestion for staff and feed accounts (infrastructure.bulk_ingest_events)."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        return user.is_staff or user.has_perm('infrastructure.bulk_ingest_events')
+
+
+class EventBulkCreateView(APIView):
+    """
+    Bulk event ingestion for sensor and API feeds.
+
+    Accepts a JSON array or an NDJSON body (one event object per line).
+    Valid rows are inserted in chunks in a single transaction; invalid rows
+    are reported by index and skipped. Restricted to staff and feed
+    accounts, with its own `bulk_ingest` throttle.
+    """
+    permission_classes = [CanBulkIngestEvents]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'bulk_ingest'
+    parser_classes = (JSONParser, NDJSONParser)
+    max_events = 10000
+    batch_size = 1000
+
+    @extend_schema(
+        request={
+            'application/json': {'type': 'array', 'items': {'type': 'object'}},
+            'application/x-ndjson': {'type': 'string'},
+        },
+        responses={201: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'error': 'Expected a JSON array or NDJSON body'}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({'error': 'No events supplied'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_events:
+            return Response({'error': f'Too many events (max {self.max_events} per request)'}, status=status.HTTP_400_BAD_REQUEST)
+
+        valid, errors = validate_event_batch(rows)
+        if not valid:
+            return Response({'created': 0, 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        events = EventReportingService.bulk_create_events(valid, batch_size=self.batch_size)
+        return Response({
+            'created': len(events),
+            'ids': [event.id for event in events],
+            'errors': errors,
+        }, status=status.HTTP_201_CREATED)
+
 class EventListAdminView(APIView):
     """
     List events with optional geospatial filtering.
@@ -92,9 +159,17 @@ class EventListAdminView(APIView):
         - bbox: Bounding box filter (minLon,minLat,maxLon,maxLat)
         - severity: Filter by severity level
         - status: Filter by event status
-        - limit: Maximum number of results (default 100)
+        - limit: Maximum number of results (default 20, max 100)
+        - mode: 'cursor' for keyset pagination on (created_at, id)
+        - cursor: Opaque cursor from a previous `next` link (cursor mode)
+        - count: 'false' to skip the total count query
+        - fields / expand: sparse fieldsets (see interfaces.fieldsets)
+
+    Supports conditional GET (ETag / Last-Modified, see interfaces.conditional).
     """
-    pagination_class = PageNumberPagination
+    pagination_class = EventPageNumberPagination
+    keyset_pagination_class = EventKeysetPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     @extend_schema(
         parameters=[
@@ -103,49 +178,204 @@ class EventListAdminView(APIView):
             OpenApiParameter("status", OpenApiTypes.STR),
             OpenApiParameter("limit", OpenApiTypes.INT, description="Number of results per page (max 100)"),
             OpenApiParameter("page", OpenApiTypes.INT, description="Page number"),
+            OpenApiParameter("mode", OpenApiTypes.STR, enum=['page', 'cursor'], description="Pagination mode"),
+            OpenApiParameter("cursor", OpenApiTypes.STR, description="Cursor token (cursor mode only)"),
+            OpenApiParameter("count", OpenApiTypes.BOOL, description="Set to false to skip the total count"),
+            OpenApiParameter("fields", OpenApiTypes.STR, description="Comma-separated fields to return, e.g. id,latitude,longitude,severity"),
+            OpenApiParameter("expand", OpenApiTypes.STR, description="Relations to add to `fields`, e.g. media_attachments"),
         ],
         responses={200: EventReportSerializer(many=True)}
     )
     def get(self, request, *args, **kwargs):
-        queryset = EventModel.objects.all()
-        
-        # Geospatial: Bounding Box Filter
-        bbox_param = request.query_params.get('bbox')
-        if bbox_param:
-            try:
-                coords = [float(c) for c in bbox_param.split(',')]
-                if len(coords) == 4:
-                    min_lon, min_lat, max_lon, max_lat = coords
-                    queryset = queryset.filter(
-                        latitude__gte=min_lat,
-                        latitude__lte=max_lat,
-                        longitude__gte=min_lon,
-                        longitude__lte=max_lon
-                    )
-            except (ValueError, TypeError):
-                pass
-        
-        # Severity Filter
-        severity = request.query_params.get('severity')
-        if severity:
-            queryset = queryset.filter(severity=severity.lower())
-        
-        # Status Filter
-        status_filter = request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter.lower())
-        
-        queryset = queryset.order_by('-created_at')
+        queryset = filter_events(EventModel.objects.all(), request.query_params)
+        # 304 for polling clients when nothing in the filtered set changed
+        return conditional_response(request, [queryset], lambda: self._page(request, queryset))
+
+    def _page(self, request, queryset):
+        if use_keyset(request):
+            paginator = self.keyset_pagination_class()
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+            paginator = self.pagination_class()
+
+        context = {'request': request}
+        # Build rows straight from .values() unless the serializer needs instances
+        fast = ValuesSerializer.compile(EventReportSerializer(context=context))
+        if fast is not None:
+            queryset = fast.values(queryset, 'created_at')
+        else:
+            # created_at is read by the keyset paginator even when not requested
+            queryset = EventReportSerializer.optimize_queryset(queryset, request, extra_columns=['created_at'])
 
-        # Use Pagination
-        paginator = self.pagination_class()
         page = paginator.paginate_queryset(queryset, request, view=self)
-        if page is not None:
-            serializer = EventReportSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        
-        serializer = EventReportSerializer(queryset, many=True)
-        return Response(serializer.data)
+        if fast is not None:
+            return paginator.get_paginated_response(fast.serialize(page))
+        serializer = EventReportSerializer(page, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
+
+class EventClusterView(APIView):
+    """
+    Server-side map clustering.
+
+    Groups events by geohash cell for the requested zoom level and returns one
+    aggregate per cell: count, centroid, max severity and per-severity counts.
+
+    Query Parameters:
+        - bbox: Viewport (minLon,minLat,maxLon,maxLat)
+        - zoom: Web-map zoom level (0-22, default 3)
+        - severity, status: Same filters as the event list
+    """
+    max_clusters = 2000
+    severity_order = [tag.value for tag in EventSeverity]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("bbox", OpenApiTypes.STR, description="minLon,minLat,maxLon,maxLat"),
+            OpenApiParameter("zoom", OpenApiTypes.INT, description="Map zoom level (0-22)"),
+            OpenApiParameter("severity", OpenApiTypes.STR),
+            OpenApiParameter("status", OpenApiTypes.STR),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    def get(self, request, *args, **kwargs):
+        try:
+            zoom = int(request.query_params.get('zoom', 3))
+        except (TypeError, ValueError):
+            return Response({'error': 'zoom must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= zoom <= 22:
+            return Response({'error': 'zoom must be between 0 and 22'}, status=status.HTTP_400_BAD_REQUEST)
+
+        precision = geohash.precision_for_zoom(zoom)
+        severity_counts = {
+            level: Count('id', filter=Q(severity=level)) for level in self.severity_order
+        }
+        rows = (
+            filter_events(EventModel.objects.all(), request.query_params)
+            .exclude(geohash='')
+            .annotate(cell=Substr('geohash', 1, precision))
+            .values('cell')
+            .annotate(
+                count=Count('id'),
+                centroid_lat=Avg('latitude'),
+                centroid_lon=Avg('longitude'),
+                **severity_counts
+            )
+            .order_by('-count')[:self.max_clusters]
+        )
+
+        clusters = []
+        for row in rows:
+            breakdown = {level: row[level] for level in self.severity_order}
+            max_severity = next(
+                (level for level in reversed(self.severity_order) if breakdown[level]), None
+            )
+            clusters.append({
+                'cell': row['cell'],
+                'count': row['count'],
+                'latitude': row['centroid_lat'],
+                'longitude': row['centroid_lon'],
+                'max_severity': max_severity,
+                'severity_counts': breakdown,
+                'bbox': geohash.decode_bbox(row['cell']),
+            })
+
+        return Response({
+            'zoom': zoom,
+            'precision': precision,
+            'clusters': clusters,
+        })
+
+def _rank_case(field, levels):
+    """Annotate expression ranking rows by a severity-like field (higher is more severe)."""
+    return Case(
+        *[When(**{field: level}, then=Value(rank)) for rank, level in enumerate(levels)],
+        default=Value(-1),
+        output_field=IntegerField(),
+    )
+
+
+class VectorTileView(APIView):
+    """
+    Mapbox Vector Tiles (MVT) for events and hazard reports.
+
+    Serves /tiles/{z}/{x}/{y}.mvt with two point layers, `events` and
+    `hazard_reports`. Features are thinned per tile: rows are taken in
+    severity/priority order and at most one feature is kept per pixel cell,
+    up to `max_features_per_layer`. Responses carry the conditional-GET
+    validators of the rows in the tile (see interfaces.conditional), so a
+    revalidation is answered with 304 without building the tile.
+
+    Query Parameters:
+        - severity, status: Same event filters as the event list
+    """
+    content_type = 'application/vnd.mapbox-vector-tile'
+    cache_control = 'private, max-age=60'
+    max_features_per_layer = 2000
+    max_rows_scanned = 20000
+    buffer_fraction = 64 / mvt.DEFAULT_EXTENT
+    pixel_grid = 16
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("z", OpenApiTypes.INT, location=OpenApiParameter.PATH),
+            OpenApiParameter("x", OpenApiTypes.INT, location=OpenApiParameter.PATH),
+            OpenApiParameter("y", OpenApiTypes.INT, location=OpenApiParameter.PATH),
+            OpenApiParameter("severity", OpenApiTypes.STR),
+            OpenApiParameter("status", OpenApiTypes.STR),
+        ],
+        responses={(200, 'application/vnd.mapbox-vector-tile'): OpenApiTypes.BINARY, 304: None}
+    )
+    def get(self, request, z, x, y, *args, **kwargs):
+        if not 0 <= z <= 22 or not 0 <= x < (1 << z) or not 0 <= y < (1 << z):
+            return Response({'error': 'Invalid tile coordinates'}, status=status.HTTP_400_BAD_REQUEST)
+
+        min_lon, min_lat, max_lon, max_lat = mvt.tile_bounds(z, x, y)
+        pad_lon = (max_lon - min_lon) * self.buffer_fraction
+        pad_lat = (max_lat - min_lat) * self.buffer_fraction
+        bbox = (min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat)
+
+        events = filter_bbox(filter_events(EventModel.objects.all(), request.query_params), bbox)
+        reports = HazardReport.objects.filter(
+            latitude__gte=bbox[1], latitude__lte=bbox[3],
+            longitude__gte=bbox[0], longitude__lte=bbox[2],
+        )
+
+        def respond():
+            event_rows = (
+                events.annotate(rank=_rank_case('severity', [tag.value for tag in EventSeverity]))
+                .order_by('-rank', '-created_at')
+                .values('id', 'title', 'category', 'severity', 'status', 'latitude', 'longitude')
+            )
+            report_rows = (
+                reports.annotate(rank=_rank_case('priority', [level for level, _ in HazardReport.PRIORITY_CHOICES]))
+                .order_by('-rank', '-created_at')
+                .values('id', 'tracking_id', 'priority', 'status', 'latitude', 'longitude')
+            )
+            content = mvt.encode_tile([
+                self._build_layer('events', event_rows, z, x, y),
+                self._build_layer('hazard_reports', report_rows, z, x, y),
+            ])
+            return HttpResponse(content, content_type=self.content_type)
+
+        # An unchanged tile is answered from the validators, before any row is encoded
+        response = conditional_response(request, [events, reports], respond)
+        response['Cache-Control'] = self.cache_control
+        return response
+
+    def _build_layer(self, name, rows, z, x, y):
+        layer = mvt.PointLayer(name)
+        occupied = set()
+        for row in rows[:self.max_rows_scanned]:
+            tile_x, tile_y = mvt.project(row.pop('latitude'), row.pop('longitude'), z, x, y)
+            cell = (tile_x // self.pixel_grid, tile_y // self.pixel_grid)
+            if cell in occupied:
+                continue
+            occupied.add(cell)
+            row['id'] = str(row['id'])
+            layer.add_point(tile_x, tile_y, row)
+            if len(layer) >= self.max_features_per_layer:
+                break
+        return layer
 
 class StatsSummaryView(APIView):
     @extend_schema(
@@ -156,12 +386,13 @@ class StatsSummaryView(APIView):
     )
     def get(self, request, *args, **kwargs):
         try:
-            total_events = EventModel.objects.count()
-            critical_events = EventModel.objects.filter(severity=EventSeverity.CRITICAL.value).count()
-            high_events = EventModel.objects.filter(severity=EventSeverity.HIGH.value).count()
+            summary = EventStatsService.get_summary()
+            total_events = summary['total']
+            critical_events = summary['critical']
+            high_events = summary['high']
             
             # Calculate sensor integrity (mock logic based on recent verified events)
-            verified_count = EventModel.objects.filter(status='VERIFIED').count()
+            verified_count = summary['verified']
             integrity = (verified_count / total_events * 100) if total_events > 0 else 100
             
             # Calculate heat index (mock logic - e.g., density of high severity events)
@@ -180,6 +411,109 @@ class StatsSummaryView(APIView):
                 f.write(traceback.format_exc())
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class StatsTimeseriesView(APIView):
+    """
+    Time-bucketed event histogram.
+
+    Query Parameters:
+        - bucket: 'hour' or 'day' (default 'day')
+        - from / to: ISO date or datetime (default: last 30 days, or last 48 hours for hourly buckets)
+        - category: Filter by event category
+        - bbox: minLon,minLat,maxLon,maxLat
+    """
+    max_buckets = 1000
+    default_window = {'hour': timedelta(hours=48), 'day': timedelta(days=30)}
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("bucket", OpenApiTypes.STR, enum=['hour', 'day']),
+            OpenApiParameter("from", OpenApiTypes.DATETIME),
+            OpenApiParameter("to", OpenApiTypes.DATETIME),
+            OpenApiParameter("category", OpenApiTypes.STR),
+            OpenApiParameter("bbox", OpenApiTypes.STR, description="minLon,minLat,maxLon,maxLat"),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    def get(self, request, *args, **kwargs):
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in EventStatsService.TIMESERIES_BUCKETS:
+            return Response({'error': "bucket must be 'hour' or 'day'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            end = self._parse_time(request.query_params.get('to')) or timezone.now()
+            start = self._parse_time(request.query_params.get('from')) or end - self.default_window[bucket]
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({'error': "'from' must be before 'to'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        step = EventStatsService.TIMESERIES_BUCKETS[bucket][1]
+        if (end - start) / step > self.max_buckets:
+            return Response({'error': f'Range too large (max {self.max_buckets} buckets)'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = None
+        bbox = parse_bbox(request.query_params.get('bbox'))
+        if bbox:
+            queryset = filter_bbox(EventModel.objects.all(), bbox)
+
+        series = EventStatsService.timeseries(
+            bucket, start, end,
+            category=request.query_params.get('category'),
+            queryset=queryset,
+        )
+        return Response({
+            'bucket': bucket,
+            'from': start,
+            'to': end,
+            'series': series,
+        })
+
+    @staticmethod
+    def _parse_time(value):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(f'Invalid date: {value}')
+            parsed = datetime.combine(day, datetime.min.time())
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+class StatsRegionsView(APIView):
+    """
+    Event and hazard report counts per administrative region.
+
+    Query Parameters:
+        - level: 'country', 'state' or 'lga' (default 'country')
+        - parent: Only regions under this code (e.g. NGA or NGA.25)
+        - category: Filter events by category
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("level", OpenApiTypes.STR, enum=list(regions.LEVELS)),
+            OpenApiParameter("parent", OpenApiTypes.STR),
+            OpenApiParameter("category", OpenApiTypes.STR),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT}
+    )
+    def get(self, request, *args, **kwargs):
+        level = request.query_params.get('level', 'country')
+        if level not in regions.LEVELS:
+            return Response({'error': f"level must be one of {', '.join(regions.LEVELS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'level': level,
+            'regions': EventStatsService.region_counts(
+                level,
+                parent=request.query_params.get('parent') or None,
+                category=request.query_params.get('category'),
+            ),
+        })
+
 class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only API endpoint for governance audit logs.
@@ -205,7 +539,7 @@ class CanViewAIInteractionLogs(permissions.BasePermission):
         return role in {'admin', 'supervisor', 'analyst'}
 
 
-class AIInteractionLogViewSet(viewsets.ModelViewSet):
+class AIInteractionLogViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """AI interaction audit endpoint.
 
     - POST: authenticated clients can submit interaction logs (prompt is redacted server-side).
@@ -294,7 +628,8 @@ class EventActionView(APIView):
             else:
                 return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
             
-            event.save()
+            # Only the status changed: broadcast as a patch, skip the region lookup
+            event.save(update_fields=['status', 'updated_at'])
             
             # Audit the action
             AuditLog.objects.create(
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(settings, tmp_path_factory):
+    # A fresh file cache per test, never the one the dev server uses
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path_factory.mktemp('cache')),
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Uploads land in a per-test directory and media jobs run inline
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_PIPELINE_WORKERS = 0
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def upload_temp_dir(settings, tmp_path_factory):
+    # Spooled and partial uploads stay outside MEDIA_ROOT, as in production
+    path = tmp_path_factory.mktemp('uploads') / 'tmp'
+    settings.UPLOAD_TEMP_DIR = str(path)
+    settings.RESUMABLE_UPLOAD_DIR = str(path / 'resumable')
+    return path
+
+
+@pytest.fixture(autouse=True)
+def broadcast_buffer():
+    # Changes a test left queued must not reach the next test's frames
+    from interfaces import broadcast
+    yield broadcast.buffer
+    with broadcast.buffer._lock:
+        broadcast.buffer._pending = {}
+        broadcast.buffer._seqs = []
@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from inehss.models import FormSubmission, FormTemplate, HazardReport, MediaAttachment, OfficerAssignment
+
+
+@pytest.mark.django_db
+class TestAssignmentListQueries:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='pass1234', is_staff=True)
+        self.officer = User.objects.create_user(username='officer', password='pass1234')
+        self.client.force_authenticate(user=self.admin)
+
+        self.public_form = FormTemplate.objects.create(name='Public', form_type='public')
+        self.officer_form = FormTemplate.objects.create(name='Inspection', form_type='officer')
+
+    def _create_assignments(self, count):
+        for i in range(count):
+            report = HazardReport.objects.create(form_template=self.public_form, data={'summary': f'Report {i}'})
+            MediaAttachment.objects.create(
+                report=report, file=ContentFile(f'photo {i}'.encode(), name='photo.jpg'),
+                file_type='image', original_filename='photo.jpg',
+            )
+            assignment = OfficerAssignment.objects.create(
+                report=report, officer=self.officer, inspection_form=self.officer_form,
+            )
+            for is_draft in (False, False, True):
+                submission = FormSubmission.objects.create(
+                    assignment=assignment, submitted_by=self.officer, is_draft=is_draft,
+                )
+                MediaAttachment.objects.create(
+                    submission=submission, file=ContentFile(b'evidence', name='evidence.jpg'),
+                    file_type='image', original_filename='evidence.jpg',
+                )
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/inehss/assignments/')
+        assert response.status_code == 200
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self._create_assignments(2)
+        small, _ = self._list_query_count()
+
+        self._create_assignments(10)
+        large, response = self._list_query_count()
+
+        assert len(response.data['results']) == 12
+        assert large == small
+        assert large <= 5
+
+    def test_list_matches_unoptimized_output(self):
+        self._create_assignments(1)
+        assignment = OfficerAssignment.objects.get()
+        latest = assignment.submissions.order_by('-submitted_at').first()
+
+        response = self.client.get(
+            '/api/v1/inehss/assignments/', {'expand': 'report,inspection_form,latest_draft,latest_submission'}
+        )
+
+        row = response.data['results'][0]
+        assert row['submission_count'] == 2
+        assert row['latest_submission']['id'] == str(latest.id)
+        assert row['latest_draft']['id'] == str(latest.id)
+        assert len(row['latest_submission']['attachments']) == 1
+        assert row['report']['form_template']['name'] == 'Public'
+        assert len(row['report']['attachments']) == 1
+        assert row['inspection_form']['name'] == 'Inspection'
+        assert row['officer_username'] == 'officer'
+
+    def test_list_is_compact_by_default(self):
+        self._create_assignments(1)
+
+        response = self.client.get('/api/v1/inehss/assignments/')
+
+        row = response.data['results'][0]
+        assert row['report']['form_template']['name'] == 'Public'
+        assert 'data' not in row['report']
+        assert 'attachments' not in row['report']
+        assert 'schema' not in row['inspection_form']
+        assert set(row['latest_submission']) == {'id', 'is_draft', 'submitted_at'}
+        assert row['submission_count'] == 2
+
+    def test_detail_keeps_nested_data(self):
+        self._create_assignments(1)
+        assignment = OfficerAssignment.objects.get()
+
+        response = self.client.get(f'/api/v1/inehss/assignments/{assignment.id}/')
+
+        assert response.data['report']['data'] == {'summary': 'Report 0'}
+        assert len(response.data['report']['attachments']) == 1
+        assert 'schema' in response.data['inspection_form']
+        assert 'data' in response.data['latest_submission']
+
+    def test_fields_param_limits_top_level_fields(self):
+        self._create_assignments(1)
+
+        response = self.client.get('/api/v1/inehss/assignments/', {'fields': 'id,status,report'})
+
+        assert set(response.data['results'][0]) == {'id', 'status', 'report'}
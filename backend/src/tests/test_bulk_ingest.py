@@ -0,0 +1,110 @@
+import json
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import Permission, User
+from rest_framework.test import APIClient
+
+from application.services import EventStatsService
+from infrastructure.models import EventCounter, EventModel
+from interfaces.serializers import EventReportSerializer
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkIngest:
+    @pytest.fixture(autouse=True)
+    def inline_broadcasts(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 0
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='feed', password='pass1234')
+        self.user.user_permissions.add(Permission.objects.get(codename='bulk_ingest_events'))
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/reports/bulk/'
+
+    def _events(self, count):
+        return [
+            {'description': f'reading {i}', 'category': 'API_FEED', 'severity': 'HIGH', 'latitude': 6.52, 'longitude': 3.37}
+            for i in range(count)
+        ]
+
+    def test_json_array(self):
+        with mock.patch('interfaces.broadcast.publish_batch') as publish:
+            response = self.client.post(self.url, self._events(25), format='json')
+
+        assert response.status_code == 201
+        assert response.json()['created'] == 25
+        assert EventModel.objects.count() == 25
+        event = EventModel.objects.first()
+        assert (event.category, event.severity) == ('api_feed', 'high')
+        assert event.geohash and event.region_code.startswith('NGA.25.')
+        assert sum(EventCounter.objects.values_list('count', flat=True)) == 25
+        assert EventStatsService.get_summary()['high'] == 25
+        # Every event goes through the broadcast buffer, in a single flush
+        publish.assert_called_once()
+        messages = publish.call_args[0][0]
+        assert len(messages) == 25
+        assert {message['type'] for message in messages} == {'event_created'}
+
+    def test_broadcast_matches_api_representation(self):
+        with mock.patch('interfaces.broadcast.publish_batch') as publish:
+            self.client.post(self.url, self._events(1), format='json')
+
+        event = EventModel.objects.get()
+        # Same serializer as the REST API: 'Z' timestamps, real media_attachments
+        expected = EventReportSerializer(event).data
+        [message] = publish.call_args[0][0]
+        assert message['event'] == expected
+        assert message['event']['created_at'].endswith('Z')
+
+    def test_ndjson_body(self):
+        body = '\n'.join(json.dumps(row) for row in self._events(3)) + '\n\n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+
+        assert response.status_code == 201
+        assert EventModel.objects.count() == 3
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        rows = self._events(2) + [
+            {'category': 'API_FEED'},
+            {'description': 'x', 'severity': 'apocalyptic'},
+            {'description': 'x', 'latitude': 95},
+            'not an object',
+        ]
+        response = self.client.post(self.url, rows, format='json')
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body['created'] == 2
+        assert [e['index'] for e in body['errors']] == [2, 3, 4, 5]
+        assert 'description' in body['errors'][0]['errors']
+        assert 'latitude' in body['errors'][2]['errors']
+
+    def test_rejects_bad_bodies(self):
+        assert self.client.post(self.url, {'description': 'x'}, format='json').status_code == 400
+        assert self.client.post(self.url, [], format='json').status_code == 400
+        assert self.client.post(self.url, [{'title': 'x'}], format='json').status_code == 400
+        response = self.client.post(self.url, '{"description": "x"}\n{oops', content_type='application/x-ndjson')
+        assert response.status_code == 400
+        assert EventModel.objects.count() == 0
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        assert self.client.post(self.url, self._events(1), format='json').status_code == 401
+
+    def test_requires_feed_permission(self):
+        citizen = User.objects.create_user(username='citizen', password='pass1234')
+        self.client.force_authenticate(user=citizen)
+        assert self.client.post(self.url, self._events(1), format='json').status_code == 403
+
+        staff = User.objects.create_user(username='ops', password='pass1234', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        with mock.patch('interfaces.broadcast.publish_batch'):
+            assert self.client.post(self.url, self._events(1), format='json').status_code == 201
+
+    def test_has_its_own_throttle(self):
+        with mock.patch('rest_framework.throttling.ScopedRateThrottle.THROTTLE_RATES', {'bulk_ingest': '1/hour'}):
+            with mock.patch('interfaces.broadcast.publish_batch'):
+                assert self.client.post(self.url, self._events(1), format='json').status_code == 201
+            assert self.client.post(self.url, self._events(1), format='json').status_code == 429
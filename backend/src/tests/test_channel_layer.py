@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import sqlite3
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.exceptions import ChannelFull
+from channels.testing import WebsocketCommunicator
+
+from infrastructure.channel_layer import SQLiteChannelLayer
+from infrastructure.models import EventModel
+from interfaces.consumers import EventConsumer
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'channels.sqlite3')
+
+
+def receive(layer, channel):
+    return asyncio.wait_for(layer.receive(channel), 2)
+
+
+class TestSQLiteChannelLayer:
+    def test_group_send_reaches_every_process(self, path):
+        # Two layer instances on one file behave like two worker processes
+        async def scenario():
+            first, second = SQLiteChannelLayer(path), SQLiteChannelLayer(path)
+            a, b, c = await first.new_channel(), await first.new_channel(), await second.new_channel()
+            for layer, channel in [(first, a), (first, b), (second, c)]:
+                await layer.group_add('events_live', channel)
+
+            await second.group_send('events_live', {'type': 'events_batch', 'seq': 1})
+
+            for layer, channel in [(first, a), (first, b), (second, c)]:
+                assert await receive(layer, channel) == {'type': 'events_batch', 'seq': 1}
+
+            await first.group_discard('events_live', a)
+            await first.group_send('events_live', {'type': 'events_batch', 'seq': 2})
+            assert (await receive(first, b))['seq'] == 2
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(first.receive(a), 0.2)
+
+        asyncio.run(scenario())
+
+    def test_group_send_writes_one_row_per_process(self, path):
+        async def scenario():
+            first, second = SQLiteChannelLayer(path), SQLiteChannelLayer(path)
+            for _ in range(3):
+                await first.group_add('cells', await first.new_channel())
+            await second.group_add('cells', await second.new_channel())
+
+            await first.group_send('cells', {'type': 'events_batch'})
+
+        asyncio.run(scenario())
+        with sqlite3.connect(path) as connection:
+            assert connection.execute('SELECT COUNT(*) FROM channel_message').fetchone() == (2,)
+
+    def test_plain_channels_are_bounded(self, path):
+        async def scenario():
+            layer = SQLiteChannelLayer(path, capacity=2)
+            await layer.send('media.jobs', {'type': 'job', 'n': 1})
+            await layer.send('media.jobs', {'type': 'job', 'n': 2})
+            with pytest.raises(ChannelFull):
+                await layer.send('media.jobs', {'type': 'job', 'n': 3})
+
+            assert (await receive(SQLiteChannelLayer(path), 'media.jobs'))['n'] == 1
+
+        asyncio.run(scenario())
+
+
+def _send_from_child(path):
+    asyncio.run(SQLiteChannelLayer(path).group_send('events_live', {'type': 'events_batch', 'from': 'child'}))
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_messages_cross_process_boundaries(path):
+    layer = SQLiteChannelLayer(path)
+
+    async def scenario():
+        channel = await layer.new_channel()
+        await layer.group_add('events_live', channel)
+        process = multiprocessing.get_context('fork').Process(target=_send_from_child, args=(path,))
+        process.start()
+        await asyncio.get_running_loop().run_in_executor(None, process.join)
+
+        assert process.exitcode == 0
+        assert await receive(layer, channel) == {'type': 'events_batch', 'from': 'child'}
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumer_receives_broadcasts_through_sqlite_layer(settings, path):
+    settings.REALTIME_BATCH_INTERVAL_MS = 0
+    settings.CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'infrastructure.channel_layer.SQLiteChannelLayer', 'CONFIG': {'path': path}},
+    }
+
+    async def scenario():
+        communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        await database_sync_to_async(EventModel.objects.create)(
+            title='Flood', description='Layer', latitude=6.5, longitude=3.4
+        )
+        frame = await communicator.receive_json_from(timeout=2)
+
+        assert [m['event']['title'] for m in frame['messages']] == ['Flood']
+        await communicator.disconnect()
+
+    async_to_sync(scenario)()
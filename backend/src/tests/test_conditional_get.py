@@ -0,0 +1,100 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from infrastructure.models import EventModel, MediaModel
+from inehss.models import FormTemplate, HazardReport, MediaAttachment
+from interfaces.views import EventListAdminView
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self):
+        self.admin = User.objects.create_user(username='admin', password='pass1234', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.event = EventModel.objects.create(
+            title='Flood', description='Rising water', severity='high', latitude=6.5, longitude=3.3,
+        )
+        EventModel.objects.create(title='Fire', description='Smoke', severity='low', latitude=9.0, longitude=7.4)
+
+    def _poll(self, path, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(path, params, **headers)
+
+    def test_unchanged_events_return_304(self):
+        first = self._poll('/api/v1/admin/events/')
+        second = self._poll('/api/v1/admin/events/', first['ETag'])
+
+        assert first.status_code == 200
+        assert first['Last-Modified']
+        assert second.status_code == 304
+        assert second.content == b''
+        assert second['ETag'] == first['ETag']
+
+    def test_event_update_and_delete_change_etag(self):
+        etag = self._poll('/api/v1/admin/events/')['ETag']
+
+        self.event.status = 'verified'
+        self.event.save()
+        updated = self._poll('/api/v1/admin/events/', etag)
+        assert updated.status_code == 200
+
+        EventModel.objects.filter(title='Fire').delete()
+        deleted = self._poll('/api/v1/admin/events/', updated['ETag'])
+        assert deleted.status_code == 200
+        assert deleted.data['count'] == 1
+
+    def test_media_change_touches_event(self):
+        etag = self._poll('/api/v1/admin/events/')['ETag']
+
+        MediaModel.objects.create(event=self.event, file=ContentFile(b'img', name='a.jpg'))
+
+        assert self._poll('/api/v1/admin/events/', etag).status_code == 200
+
+    def test_unchanged_stream_returns_304(self):
+        first = self._poll('/api/v1/admin/events/', stream='ndjson')
+        assert len(b''.join(first.streaming_content).splitlines()) == 2
+
+        second = self._poll('/api/v1/admin/events/', first['ETag'], stream='ndjson')
+        assert second.status_code == 304
+        assert second['ETag'] != self._poll('/api/v1/admin/events/')['ETag']
+
+    def test_query_string_is_part_of_etag(self):
+        page = self._poll('/api/v1/admin/events/')
+        filtered = self._poll('/api/v1/admin/events/', page['ETag'], severity='high')
+
+        assert filtered.status_code == 200
+        assert filtered['ETag'] != page['ETag']
+
+    def test_event_list_admin_view(self):
+        factory = APIRequestFactory()
+        view = EventListAdminView.as_view()
+
+        request = factory.get('/api/v1/admin/events/')
+        force_authenticate(request, self.admin)
+        first = view(request)
+        request = factory.get('/api/v1/admin/events/', HTTP_IF_NONE_MATCH=first['ETag'])
+        force_authenticate(request, self.admin)
+
+        assert first.status_code == 200
+        assert view(request).status_code == 304
+
+    def test_hazard_reports_and_public_forms(self):
+        form = FormTemplate.objects.create(name='Public', schema=[{'name': 'summary'}], form_type='public')
+        report = HazardReport.objects.create(form_template=form, data={'summary': 'Spill'})
+
+        reports = self._poll('/api/v1/inehss/reports/')
+        forms = self._poll('/api/v1/inehss/forms/public/')
+        assert self._poll('/api/v1/inehss/reports/', reports['ETag']).status_code == 304
+        assert self._poll('/api/v1/inehss/forms/public/', forms['ETag']).status_code == 304
+
+        MediaAttachment.objects.create(
+            report=report, file=ContentFile(b'doc', name='doc.pdf'), file_type='document', original_filename='doc.pdf',
+        )
+        assert self._poll('/api/v1/inehss/reports/', reports['ETag']).status_code == 200
+
+        form.name = 'Public hazard form'
+        form.save()
+        assert self._poll('/api/v1/inehss/forms/public/', forms['ETag']).status_code == 200
@@ -0,0 +1,52 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel
+
+
+@pytest.mark.django_db
+class TestEventClusters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/events/clusters/'
+
+        # Two tight groups: Lagos and Abuja, plus one event in London
+        for i in range(4):
+            EventModel.objects.create(description='Lagos', latitude=6.52 + i * 0.001, longitude=3.37, severity='low')
+        EventModel.objects.create(description='Lagos', latitude=6.521, longitude=3.371, severity='critical')
+        for i in range(3):
+            EventModel.objects.create(description='Abuja', latitude=9.07 + i * 0.001, longitude=7.39, severity='medium')
+        EventModel.objects.create(description='London', latitude=51.5, longitude=-0.12, severity='high')
+
+    def test_clusters_aggregate_per_cell(self):
+        response = self.client.get(self.url, {'zoom': 7, 'bbox': '2.5,4.0,14.5,13.9'})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['precision'] == 4
+        clusters = sorted(data['clusters'], key=lambda c: -c['count'])
+        assert [c['count'] for c in clusters] == [5, 3]
+
+        lagos = clusters[0]
+        assert lagos['max_severity'] == 'critical'
+        assert lagos['severity_counts'] == {'low': 4, 'medium': 0, 'high': 0, 'critical': 1}
+        assert 6.52 <= lagos['latitude'] <= 6.524
+        min_lon, min_lat, max_lon, max_lat = lagos['bbox']
+        assert min_lat <= lagos['latitude'] <= max_lat
+
+    def test_world_zoom_merges_nearby_groups(self):
+        response = self.client.get(self.url, {'zoom': 0})
+
+        clusters = response.json()['clusters']
+        assert sum(c['count'] for c in clusters) == 9
+        assert len(clusters) == 2
+
+    def test_severity_filter_and_invalid_zoom(self):
+        response = self.client.get(self.url, {'zoom': 7, 'severity': 'medium'})
+        assert [c['count'] for c in response.json()['clusters']] == [3]
+
+        assert self.client.get(self.url, {'zoom': 'far'}).status_code == 400
+        assert self.client.get(self.url, {'zoom': 40}).status_code == 400
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Sum
+from rest_framework.test import APIClient
+
+from application.services import EventStatsService
+from infrastructure.models import EventModel, EventCounter
+
+
+def _count(**filters):
+    return EventCounter.objects.filter(**filters).aggregate(total=Sum('count'))['total'] or 0
+
+
+@pytest.mark.django_db
+class TestEventCounters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+
+    def test_insert_update_delete_keep_counters_in_step(self):
+        event = EventModel.objects.create(description='a', severity='high', category='flood')
+        EventModel.objects.create(description='b', severity='high', category='flood')
+        assert _count(severity='high', status='pending', category='flood') == 2
+
+        event.severity = 'critical'
+        event.save()
+        assert _count(severity='high') == 1
+        assert _count(severity='critical') == 1
+
+        event.delete()
+        assert _count(severity='critical') == 0
+        assert _count() == 1
+
+    def test_event_action_moves_status_bucket(self):
+        event = EventModel.objects.create(description='a', severity='low')
+
+        response = self.client.post(f'/api/v1/admin/events/{event.id}/verify/')
+
+        assert response.status_code == 200
+        assert _count(status='pending') == 0
+        assert _count(status='verified') == 1
+
+    def test_rebuild_reconciles_drift(self):
+        EventModel.objects.create(description='a', severity='low')
+        EventModel.objects.bulk_create([EventModel(description='bulk', severity='low') for _ in range(3)])
+        assert _count() == 1
+
+        out = io.StringIO()
+        call_command('rebuild_event_counters', stdout=out)
+
+        assert _count(severity='low') == 4
+        assert '1 had drifted' in out.getvalue()
+
+    def test_stats_summary_reads_counters(self, django_assert_num_queries):
+        EventModel.objects.create(description='a', severity='critical')
+        EventModel.objects.create(description='b', severity='high', status='verified')
+
+        with django_assert_num_queries(1):
+            summary = EventStatsService.compute_summary()
+
+        assert summary == {'total': 2, 'critical': 1, 'high': 1, 'verified': 1}
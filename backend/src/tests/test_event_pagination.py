@@ -0,0 +1,161 @@
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient, AsyncRequestFactory
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from infrastructure.models import EventModel
+from interfaces.streaming import ndjson_response
+from interfaces.views import EventListAdminView
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.factory = APIRequestFactory()
+        self.url = '/api/v1/admin/events/'
+
+        for i in range(7):
+            EventModel.objects.create(
+                title=f'Event {i}',
+                description='Keyset test',
+                severity='high' if i % 2 else 'low',
+                latitude=6.5 + i * 0.01,
+                longitude=3.3,
+            )
+        # Force identical timestamps so the id tie-breaker is exercised
+        EventModel.objects.update(created_at=timezone.now())
+
+    def _list_view(self, url, params=None):
+        request = self.factory.get(url, params)
+        force_authenticate(request, user=self.user)
+        response = EventListAdminView.as_view()(request)
+        response.render()
+        return response
+
+    def _walk(self, params):
+        seen = []
+        response = self._list_view(self.url, params)
+        while True:
+            assert response.status_code == 200
+            data = response.data
+            seen.extend(str(row['id']) for row in data['results'])
+            if not data['next']:
+                return seen, data
+            response = self._list_view(data['next'])
+
+    def test_cursor_mode_visits_every_row_once(self):
+        seen, last_page = self._walk({'mode': 'cursor', 'limit': 3})
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+        assert last_page['count'] == 7
+
+    def test_cursor_mode_applies_filters_and_skips_count(self):
+        seen, last_page = self._walk({'mode': 'cursor', 'limit': 2, 'severity': 'high', 'count': 'false'})
+
+        assert len(seen) == 3
+        assert 'count' not in last_page
+        assert set(EventModel.objects.filter(id__in=seen).values_list('severity', flat=True)) == {'high'}
+
+    def test_invalid_cursor_returns_404(self):
+        response = self._list_view(self.url, {'mode': 'cursor', 'cursor': 'not-a-cursor'})
+        assert response.status_code == 404
+
+    def test_page_mode_without_count(self):
+        response = self._list_view(self.url, {'limit': 5, 'count': 'false'})
+
+        assert response.status_code == 200
+        data = response.data
+        assert 'count' not in data
+        assert len(data['results']) == 5
+        assert data['next'] is not None
+
+    def test_admin_events_viewset_supports_cursor_mode(self):
+        response = self.client.get(self.url, {'mode': 'cursor', 'limit': 4})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data['results']) == 4
+        second = self.client.get(data['next']).json()
+        assert len(second['results']) == 3
+        assert not {r['id'] for r in data['results']} & {r['id'] for r in second['results']}
+
+
+@pytest.mark.django_db
+class TestAdminEventsList:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='admin', password='pass1234', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/admin/events/'
+
+        EventModel.objects.bulk_create([
+            EventModel(title=f'Event {i}', description='Bulk', severity='critical' if i < 5 else 'low')
+            for i in range(25)
+        ])
+
+    def test_default_list_is_bounded(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 25
+        assert len(data['results']) == 20
+        assert data['next'] is not None
+
+    def test_limit_is_capped(self):
+        response = self.client.get(self.url, {'limit': 1000})
+        assert len(response.json()['results']) == 25
+
+    def test_ndjson_stream_returns_every_row(self):
+        response = self.client.get(self.url, {'stream': 'ndjson'})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[0])['description'] == 'Bulk'
+
+    def test_ndjson_stream_is_async_under_asgi(self):
+        client = AsyncClient()
+        client.force_login(self.user)
+        response = async_to_sync(client.get)(self.url, {'stream': 'ndjson'})
+
+        async def read():
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        assert response.is_async
+        assert response['Cache-Control'] == 'no-store'
+        assert len(async_to_sync(read)().splitlines()) == 25
+
+    def test_ndjson_stream_applies_filters(self):
+        response = self.client.get(self.url, {'stream': 'ndjson', 'severity': 'critical'})
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        assert len(rows) == 5
+        assert {row['severity'] for row in rows} == {'critical'}
+
+
+def test_asgi_ndjson_stream_is_consumed_incrementally():
+    pulled = []
+
+    def rows():
+        for n in range(10):
+            pulled.append(n)
+            yield {'n': n}
+
+    response = ndjson_response(AsyncRequestFactory().get('/export/'), rows(), batch_size=3)
+
+    async def first_chunk():
+        async for chunk in response.streaming_content:
+            return chunk
+
+    assert async_to_sync(first_chunk)().splitlines() == [b'{"n":0}', b'{"n":1}', b'{"n":2}']
+    assert pulled == [0, 1, 2]
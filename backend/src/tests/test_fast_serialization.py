@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from infrastructure.auth_views import AdminEventSerializer
+from infrastructure.models import EventModel, MediaModel
+from inehss.models import FormTemplate, HazardReport, MediaAttachment
+from inehss.serializers import HazardReportSerializer, OfficerAssignmentSerializer
+from interfaces import renderers
+from interfaces.fastpath import ValuesSerializer
+from interfaces.renderers import FastJSONRenderer
+from interfaces.serializers import EventReportSerializer
+
+
+def drf_request(params=None):
+    return Request(APIRequestFactory().get('/api/v1/admin/events/', params))
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+    def setup_method(self):
+        for i in range(3):
+            event = EventModel.objects.create(
+                title=f'Event {i}', description='Fast path', severity='high', latitude=6.5, longitude=3.3,
+            )
+            media = MediaModel.objects.create(event=event, file=ContentFile(f'img {i}'.encode(), name='a.jpg'))
+            MediaModel.objects.filter(pk=media.pk).update(renditions={'thumb': 'cas/aa/bb/x.thumb.webp'})
+        EventModel.objects.create(title='No media', description='Fast path', latitude=None, longitude=None)
+
+        form = FormTemplate.objects.create(name='Public', schema=[{'name': 'summary'}])
+        for i in range(2):
+            report = HazardReport.objects.create(form_template=form, data={'summary': f'Report {i}'})
+            MediaAttachment.objects.create(
+                report=report, file=ContentFile(f'doc {i}'.encode(), name='doc.pdf'),
+                file_type='document', original_filename='doc.pdf',
+            )
+
+    def _compare(self, serializer_class, queryset, request):
+        context = {'request': request}
+        expected = serializer_class(queryset, many=True, context=context).data
+        fast = ValuesSerializer.compile(serializer_class(context=context))
+        assert fast is not None
+        return expected, fast.serialize(fast.values(queryset))
+
+    def test_event_output_matches_model_serializer(self):
+        queryset = EventModel.objects.order_by('-created_at', '-id')
+        expected, actual = self._compare(EventReportSerializer, queryset, drf_request())
+
+        assert json.loads(JSONRenderer().render(actual)) == json.loads(JSONRenderer().render(expected))
+        assert [list(row) for row in actual] == [list(row) for row in expected]
+        assert actual[1]['media_attachments'][0]['renditions']['thumb'].startswith('http://testserver/')
+
+    def test_sparse_fields_are_respected(self):
+        request = drf_request({'fields': 'id,severity', 'expand': 'media_attachments'})
+        expected, actual = self._compare(EventReportSerializer, EventModel.objects.order_by('-created_at'), request)
+
+        assert json.loads(JSONRenderer().render(actual)) == json.loads(JSONRenderer().render(expected))
+        assert set(actual[0]) == {'id', 'severity', 'media_attachments'}
+
+    def test_hazard_report_output_matches_model_serializer(self):
+        expected, actual = self._compare(HazardReportSerializer, HazardReport.objects.all(), drf_request())
+
+        assert json.loads(JSONRenderer().render(actual)) == json.loads(JSONRenderer().render(expected))
+        assert actual[0]['form_template']['name'] == 'Public'
+        assert len(actual[0]['attachments']) == 1
+
+    def test_admin_event_output_matches_model_serializer(self):
+        expected, actual = self._compare(AdminEventSerializer, EventModel.objects.all(), drf_request())
+
+        assert json.loads(JSONRenderer().render(actual)) == json.loads(JSONRenderer().render(expected))
+
+    def test_custom_representation_falls_back(self):
+        assert ValuesSerializer.compile(OfficerAssignmentSerializer()) is None
+
+    def test_endpoints_use_fast_path(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', password='pass1234', is_staff=True))
+
+        events = client.get('/api/v1/admin/events/', {'mode': 'cursor', 'limit': 2})
+        reports = client.get('/api/v1/inehss/reports/')
+
+        assert events.status_code == 200
+        assert events.data['next']
+        assert len(reports.data['results']) == 2
+        assert reports.data['results'][0]['attachments'][0]['file'].startswith('http://testserver/')
+
+
+class TestFastJSONRenderer:
+    def test_matches_json_renderer(self):
+        data = {'text': 'Ọ̀ṣun \u2028 line', 'n': [1, 2.5, None, True], 'nested': {'a': 'b'}}
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_falls_back_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'ORJSON_AVAILABLE', False)
+
+        assert FastJSONRenderer().render({1: 'a'}) == JSONRenderer().render({1: 'a'})
+
+    def test_indent_uses_json_renderer(self):
+        data = {'a': [1, 2]}
+        context = {'indent': 2}
+
+        assert FastJSONRenderer().render(data, renderer_context=context) == JSONRenderer().render(data, renderer_context=context)
+
+
+@pytest.mark.django_db
+def test_benchmark_command_runs_and_rolls_back(capsys):
+    call_command('benchmark_serializers', rows=20, repeat=1)
+
+    assert 'rows/s' in capsys.readouterr().out
+    assert not EventModel.objects.exists()
+    assert not HazardReport.objects.exists()
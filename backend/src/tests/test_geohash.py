@@ -0,0 +1,114 @@
+import io
+import random
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from infrastructure import geohash
+from infrastructure.models import EventModel
+from interfaces.filters import filter_events
+
+
+def test_encode_known_values():
+    assert geohash.encode(42.6, -5.6, 5) == 'ezs42'
+    assert geohash.encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+
+def test_decode_bbox_contains_point():
+    min_lon, min_lat, max_lon, max_lat = geohash.decode_bbox('ezs42')
+    assert min_lon <= -5.6 <= max_lon
+    assert min_lat <= 42.6 <= max_lat
+
+
+def test_prefix_ranges_merge_adjacent_cells():
+    assert geohash.prefix_ranges(['s0', 's1', 's2', 's5']) == [('s0', 's3'), ('s5', 's6')]
+    assert geohash.prefix_ranges(['bz', 'c0']) == [('bz', 'c1')]
+    assert geohash.successor('zz') is None
+
+
+def test_bbox_ranges_cover_random_points():
+    rng = random.Random(7)
+    bbox = (2.5, 4.0, 14.5, 13.9)  # Nigeria
+    ranges = geohash.bbox_ranges(bbox)
+    assert len(ranges) <= 32
+
+    for _ in range(500):
+        lat = rng.uniform(bbox[1], bbox[3])
+        lon = rng.uniform(bbox[0], bbox[2])
+        key = geohash.encode(lat, lon)
+        assert any(key >= low and (high is None or key < high) for low, high in ranges)
+
+
+@pytest.mark.django_db
+class TestGeohashBBoxQueries:
+    def setup_method(self):
+        rng = random.Random(11)
+        for i in range(200):
+            EventModel.objects.create(
+                title=f'Event {i}',
+                description='Geohash test',
+                latitude=rng.uniform(-60, 70),
+                longitude=rng.uniform(-180, 180),
+            )
+
+    def test_geohash_filled_on_save(self):
+        event = EventModel.objects.create(description='Lagos', latitude=6.5244, longitude=3.3792)
+        assert event.geohash == geohash.encode(6.5244, 3.3792)
+
+        event.latitude, event.longitude = 9.0765, 7.3986
+        event.save(update_fields=['latitude', 'longitude'])
+        event.refresh_from_db()
+        assert event.geohash == geohash.encode(9.0765, 7.3986)
+
+    def test_bbox_filter_matches_coordinate_scan(self):
+        for bbox in ['-130,25,-60,50', '-15,35,30,60', '100,-10,179.9,40', '-180,-90,180,90']:
+            min_lon, min_lat, max_lon, max_lat = [float(c) for c in bbox.split(',')]
+            expected = set(EventModel.objects.filter(
+                latitude__gte=min_lat, latitude__lte=max_lat,
+                longitude__gte=min_lon, longitude__lte=max_lon,
+            ).values_list('id', flat=True))
+
+            actual = set(filter_events(EventModel.objects.all(), {'bbox': bbox}).values_list('id', flat=True))
+            assert actual == expected
+
+    def test_backfill_command(self):
+        EventModel.objects.update(geohash='')
+
+        call_command('backfill_geohash', batch_size=50, stdout=io.StringIO())
+
+        assert not EventModel.objects.filter(geohash='').exists()
+        event = EventModel.objects.first()
+        assert event.geohash == geohash.encode(event.latitude, event.longitude)
+
+
+def test_reversed_bbox_does_not_walk_the_grid():
+    # Crosses the antimeridian; used to refine to precision 12 and ~1e8 cells
+    bbox = (170, -5, -170, 5)
+    assert geohash.cover_precision(bbox) == 1
+    assert geohash.bbox_ranges(bbox) == []
+    with pytest.raises(ValueError):
+        geohash.bbox_cells((-180, -90, 180, 90), 6)
+
+
+@pytest.mark.django_db
+def test_reversed_bbox_is_rejected():
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username='admin', password='pass1234', is_staff=True))
+    response = client.get('/api/v1/events/clusters/', {'bbox': '170,-10,-170,10', 'zoom': 5})
+
+    assert response.status_code == 400
+    assert 'bbox' in response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('path', ['/api/v1/admin/events/', '/api/v1/events/clusters/', '/api/v1/stats/timeseries/'])
+def test_non_finite_bbox_is_rejected(path):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username='admin', password='pass1234', is_staff=True))
+
+    for bbox in ['nan,0,1,1', '0,0,inf,1']:
+        response = client.get(path, {'bbox': bbox})
+        assert response.status_code == 400
+        assert 'bbox' in response.data
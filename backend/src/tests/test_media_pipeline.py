@@ -0,0 +1,183 @@
+import hashlib
+import io
+import time
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from rest_framework.test import APIClient
+
+from infrastructure import media_pipeline
+from infrastructure.media_pipeline import HEADER_BYTES
+from infrastructure.models import EventModel, MediaModel
+from inehss.models import FormTemplate, HazardReport, MediaAttachment
+from inehss.serializers import MediaAttachmentSerializer
+from interfaces.serializers import EventReportSerializer
+
+
+def _jpeg_bytes():
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = 'TestCam'  # Make
+    Image.new('RGB', (64, 64), 'red').save(buffer, 'jpeg', exif=exif)
+    return buffer.getvalue()
+
+
+def test_sniff_content_type():
+    assert media_pipeline.sniff_content_type(_jpeg_bytes()[:64]) == 'image/jpeg'
+    assert media_pipeline.sniff_content_type(b'\x00\x00\x00\x18ftypmp42') == 'video/mp4'
+    assert media_pipeline.sniff_content_type(b'RIFF\x00\x00\x00\x00WEBPVP8 ') == 'image/webp'
+    assert media_pipeline.sniff_content_type(b'%PDF-1.7') == 'application/pdf'
+    assert media_pipeline.sniff_content_type(b'hello') is None
+    assert media_pipeline.file_type_for('application/pdf') == 'document'
+
+
+@pytest.mark.django_db
+class TestMediaPipeline:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reporter', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/reports/'
+
+    def _post(self, content, name='photo.jpg', content_type='image/jpeg'):
+        upload = SimpleUploadedFile(name, content, content_type=content_type)
+        data = {'description': 'Oil sheen on the river', 'latitude': 6.5, 'longitude': 3.3, 'files': [upload]}
+        return self.client.post(self.url, data, format='multipart')
+
+    def test_report_creation_defers_processing(self, django_capture_on_commit_callbacks):
+        content = _jpeg_bytes()
+        with mock.patch('infrastructure.media_pipeline._broadcast') as broadcast:
+            with django_capture_on_commit_callbacks(execute=False) as callbacks:
+                response = self._post(content)
+
+            assert response.status_code == 201
+            media = MediaModel.objects.get()
+            assert media.processing_status == MediaModel.STATUS_PENDING
+            assert 'Make' not in media.metadata
+
+            for callback in callbacks:
+                callback()
+
+        media.refresh_from_db()
+        assert media.processing_status == MediaModel.STATUS_DONE
+        assert media.file_hash == hashlib.sha256(content).hexdigest()
+        assert media.metadata['content_type'] == 'image/jpeg'
+        assert media.metadata['Make'] == 'TestCam'
+        assert media.processed_at is not None
+        broadcast.assert_called_once()
+
+    def test_upload_handlers_hash_while_streaming(self, settings, upload_temp_dir, django_capture_on_commit_callbacks):
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 1024  # force the temporary-file handler
+        assert not upload_temp_dir.exists()  # created on first use
+        content = _jpeg_bytes() + b'\x00' * (HEADER_BYTES * 2)
+
+        with mock.patch('infrastructure.media_pipeline._broadcast'):
+            with django_capture_on_commit_callbacks(execute=False) as callbacks:
+                self._post(content)
+            media = MediaModel.objects.get()
+            # Hash was computed by the upload handler, before any processing ran
+            assert media.file_hash == hashlib.sha256(content).hexdigest()
+
+            with mock.patch('django.db.models.fields.files.FieldFile.open', side_effect=AssertionError('re-read')), \
+                    mock.patch('infrastructure.renditions.generate_renditions', return_value={}):
+                for callback in callbacks:
+                    callback()
+
+        media.refresh_from_db()
+        assert media.processing_status == MediaModel.STATUS_DONE
+        assert media.metadata['Make'] == 'TestCam'
+        assert media.file.size == len(content)
+        assert list(upload_temp_dir.iterdir()) == []
+
+    def test_type_is_sniffed_from_content(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            self._post(b'\x00\x00\x00\x18ftypmp42' + b'\x00' * 100, name='clip.bin', content_type='application/octet-stream')
+
+        media = MediaModel.objects.get()
+        assert media.file_type == 'video'
+        assert media.metadata['content_type'] == 'video/mp4'
+
+    def test_failure_is_recorded_and_retried(self):
+        event = EventModel.objects.create(description='x')
+        media = MediaModel.objects.create(event=event, file=SimpleUploadedFile('a.jpg', _jpeg_bytes()))
+        media.file.storage.delete(media.file.name)
+
+        media_pipeline.process_media(media.id)
+        media.refresh_from_db()
+        assert media.processing_status == MediaModel.STATUS_FAILED
+        assert media.processing_error
+
+        media.file.save('a.jpg', SimpleUploadedFile('a.jpg', _jpeg_bytes()), save=True)
+        call_command('process_media', '--failed', stdout=io.StringIO())
+        media.refresh_from_db()
+        assert media.processing_status == MediaModel.STATUS_DONE
+
+    def test_claimed_job_is_not_processed_twice(self):
+        event = EventModel.objects.create(description='x')
+        media = MediaModel.objects.create(
+            event=event, file=SimpleUploadedFile('a.jpg', _jpeg_bytes()),
+            processing_status=MediaModel.STATUS_PROCESSING,
+        )
+        assert media_pipeline.process_media(media.id) is None
+
+    def test_worker_pool(self, settings):
+        settings.MEDIA_PIPELINE_WORKERS = 1
+        with mock.patch('infrastructure.media_pipeline._run_in_worker') as run:
+            media_pipeline.submit('abc')
+            for _ in range(50):
+                if run.called:
+                    break
+                time.sleep(0.01)
+        run.assert_called_once_with(media_pipeline.process_media, 'abc', None)
+
+
+@pytest.mark.django_db
+class TestRenditions:
+    def _image(self, size=(2000, 1000)):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, 'blue').save(buffer, 'jpeg')
+        return SimpleUploadedFile('big.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_renditions_generated_and_exposed(self, rf):
+        event = EventModel.objects.create(description='x')
+        media = MediaModel.objects.create(event=event, file=self._image())
+
+        media = media_pipeline.process_media(media.id)
+
+        assert set(media.renditions) == {'thumb', 'medium'}
+        assert media.renditions['thumb'] == media.file.name.rsplit('.', 1)[0] + '.thumb.webp'
+        with media.file.storage.open(media.renditions['thumb']) as fh, Image.open(fh) as thumb:
+            assert thumb.format == 'WEBP'
+            assert thumb.size == (320, 160)
+        with media.file.storage.open(media.renditions['medium']) as fh, Image.open(fh) as medium:
+            assert medium.size == (1280, 640)
+
+        data = EventReportSerializer(event, context={'request': rf.get('/')}).data
+        urls = data['media_attachments'][0]['renditions']
+        assert urls['thumb'].startswith('http://testserver/media/cas/')
+
+    def test_renditions_are_cached_by_content(self):
+        event = EventModel.objects.create(description='x')
+        first = MediaModel.objects.create(event=event, file=self._image())
+        second = MediaModel.objects.create(event=event, file=self._image())
+        media_pipeline.process_media(first.id)
+
+        with mock.patch('PIL.Image.Image.thumbnail') as thumbnail:
+            second = media_pipeline.process_media(second.id)
+
+        thumbnail.assert_not_called()
+        assert second.renditions == MediaModel.objects.get(pk=first.pk).renditions
+
+    def test_attachment_renditions(self):
+        form = FormTemplate.objects.create(name='Public Hazard Form', form_type='public')
+        report = HazardReport.objects.create(form_template=form)
+        attachment = MediaAttachment.objects.create(report=report, file=self._image(), file_type='image', original_filename='big.jpg')
+
+        media_pipeline.process_attachment(attachment.id)
+
+        attachment.refresh_from_db()
+        assert MediaAttachmentSerializer(attachment).data['renditions']['medium'].endswith('.medium.webp')
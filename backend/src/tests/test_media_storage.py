@@ -0,0 +1,116 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel, MediaBlob, MediaModel
+from infrastructure.storage import ContentAddressedStorage, cas_name, content_addressed_storage
+from inehss.models import FormTemplate, HazardReport, MediaAttachment
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+SHA = 'ab' * 32  # not the real digest; proves the handler-supplied value is used
+
+
+@pytest.mark.django_db
+def test_identical_content_is_written_once(media_root):
+    storage = ContentAddressedStorage()
+    first = storage.save('a/photo.PNG', ContentFile(PNG))
+    with mock.patch.object(ContentAddressedStorage, '_save') as save:
+        second = storage.save('b/other.png', ContentFile(PNG))
+
+    assert first == second
+    assert first.startswith('cas/') and first.endswith('.png')
+    save.assert_not_called()
+    assert len(list((media_root / 'cas').rglob('*.png'))) == 1
+
+
+def test_precomputed_hash_is_trusted():
+    content = ContentFile(PNG)
+    content.sha256 = SHA
+    assert content_addressed_storage.save('x.png', content) == cas_name(SHA, 'x.png')
+
+
+@pytest.mark.django_db
+class TestMediaDeduplication:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='officer', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        form = FormTemplate.objects.create(name='Public Hazard Form', form_type='public')
+        self.event = EventModel.objects.create(description='x', latitude=6.5, longitude=3.3)
+        self.report = HazardReport.objects.create(form_template=form, event=self.event)
+
+    def _upload(self):
+        upload = SimpleUploadedFile('site.png', PNG, content_type='image/png')
+        return self.client.post('/api/v1/inehss/attachments/', {'file': upload, 'report': str(self.report.id)}, format='multipart')
+
+    def test_sync_and_duplicates_share_one_blob(self, media_root):
+        assert self._upload().status_code == 201
+        assert self._upload().status_code == 201
+
+        attachments = list(MediaAttachment.objects.all())
+        media = list(MediaModel.objects.all())
+        assert len(attachments) == 2 and len(media) == 2
+        names = {row.file.name for row in attachments + media}
+        assert len(names) == 1
+        assert {row.file_hash for row in attachments + media} == {attachments[0].file_hash}
+        assert len([p for p in media_root.rglob('*') if p.is_file()]) == 1
+
+        blob = MediaBlob.objects.get()
+        assert blob.ref_count == 4
+        assert blob.size == len(PNG)
+
+    def test_gc_removes_unreferenced_blobs(self, media_root):
+        self._upload()
+        name = MediaAttachment.objects.get().file.name
+
+        call_command('gc_media_blobs', '--grace-hours', '0', stdout=io.StringIO())
+        assert content_addressed_storage.exists(name)
+
+        self.event.delete()  # cascades to the synced MediaModel
+        MediaAttachment.objects.all().delete()
+        assert MediaBlob.objects.get().ref_count == 0
+
+        call_command('gc_media_blobs', '--grace-hours', '0', '--dry-run', stdout=io.StringIO())
+        assert content_addressed_storage.exists(name)
+
+        call_command('gc_media_blobs', '--grace-hours', '0', stdout=io.StringIO())
+        assert not content_addressed_storage.exists(name)
+        assert not MediaBlob.objects.exists()
+
+    def test_reused_blob_outlives_gc(self):
+        self._upload()
+        name = MediaAttachment.objects.get().file.name
+        self.event.delete()
+        MediaAttachment.objects.all().delete()
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+
+        # Same bytes arrive again; the row referencing them is not saved yet
+        assert content_addressed_storage.save('again.png', ContentFile(PNG)) == name
+        call_command('gc_media_blobs', '--grace-hours', '1', stdout=io.StringIO())
+
+        assert content_addressed_storage.exists(name)
+        assert MediaBlob.objects.exists()
+
+    def test_collected_blob_is_written_again(self):
+        self._upload()
+        name = MediaAttachment.objects.get().file.name
+        content_addressed_storage.delete(name)  # the collector won the race
+
+        assert content_addressed_storage.save('again.png', ContentFile(PNG)) == name
+        assert content_addressed_storage.exists(name)
+
+    def test_recount_repairs_drift(self):
+        self._upload()
+        MediaBlob.objects.update(ref_count=0)
+
+        call_command('gc_media_blobs', '--recount', '--grace-hours', '0', stdout=io.StringIO())
+
+        assert MediaBlob.objects.get().ref_count == 2
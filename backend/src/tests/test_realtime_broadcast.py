@@ -0,0 +1,224 @@
+import time
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel
+from interfaces import broadcast
+from interfaces.consumers import EventConsumer
+
+
+def create_event(title, **fields):
+    return EventModel.objects.create(title=title, description='Broadcast', latitude=6.5, longitude=3.4, **fields)
+
+
+@pytest.fixture
+def published():
+    with mock.patch('interfaces.broadcast.publish_batch') as publish_batch:
+        yield publish_batch
+
+
+def sent(publish_batch):
+    return [message for call in publish_batch.call_args_list for message in call.args[0]]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBroadcastBuffer:
+    @pytest.fixture(autouse=True)
+    def inline_broadcasts(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 0
+
+    def test_changes_before_a_flush_are_coalesced(self, settings, published):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        with transaction.atomic():
+            event = create_event('Draft')
+            event.title = 'Final'
+            event.save()
+        assert not published.called
+
+        broadcast.buffer.flush()
+        messages = sent(published)
+        assert [(m['type'], m['event']['title']) for m in messages] == [('event_created', 'Final')]
+
+    def test_rolled_back_writes_are_not_announced(self, published):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                create_event('Never committed')
+                raise RuntimeError
+
+        assert not published.called
+
+    def test_flush_serializes_all_events_in_fixed_queries(self, settings, published, django_assert_num_queries):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        for i in range(5):
+            create_event(f'Event {i}')
+
+        # Events and media, then the watermark (two) and marking them flushed
+        with django_assert_num_queries(5):
+            broadcast.buffer.flush()
+
+        assert len(sent(published)) == 5
+
+    def test_size_limit_wakes_background_flusher(self, settings, published):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        settings.REALTIME_BATCH_SIZE = 3
+        for i in range(3):
+            create_event(f'Event {i}')
+
+        for _ in range(100):
+            if published.called:
+                break
+            broadcast.buffer._full.wait(0.05)
+        assert len(sent(published)) == 3
+
+    def test_pending_changes_are_flushed_at_exit(self, settings, published):
+        # A management command exiting before the daemon flusher wakes
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        create_event('Last one')
+        assert not published.called
+
+        broadcast._flush_at_exit()
+        assert [m['event']['title'] for m in sent(published)] == ['Last one']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumer_receives_one_frame_per_batch(settings):
+    settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+    settings.REALTIME_BATCH_SIZE = 2
+
+    async def scenario():
+        communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        for i in range(3):
+            await database_sync_to_async(create_event)(f'Event {i}')
+        await database_sync_to_async(broadcast.buffer.flush)()
+
+        first = await communicator.receive_json_from()
+        second = await communicator.receive_json_from()
+        assert [len(first['messages']), len(second['messages'])] == [2, 1]
+        assert {m['type'] for m in first['messages'] + second['messages']} == {'event_created'}
+        assert await communicator.receive_nothing()
+        await communicator.disconnect()
+
+    async_to_sync(scenario)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_background_flush_wakes_consumers_promptly(settings):
+    # The in-memory layer only wakes consumers when sent to from their own loop
+    settings.REALTIME_BATCH_INTERVAL_MS = 100
+
+    async def scenario():
+        communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        started = time.monotonic()
+        await database_sync_to_async(create_event)('Flood')
+        frame = await communicator.receive_json_from(timeout=5)
+        elapsed = time.monotonic() - started
+
+        assert [m['event']['title'] for m in frame['messages']] == ['Flood']
+        assert elapsed < 1
+        await communicator.disconnect()
+
+    with mock.patch.object(broadcast, 'buffer', broadcast.BroadcastBuffer()):
+        async_to_sync(scenario)()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventPatches:
+    @pytest.fixture(autouse=True)
+    def batched_broadcasts(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+
+    def setup_method(self):
+        self.event = create_event('Flood', severity='high')
+        broadcast.buffer.flush()
+
+    def test_version_is_bumped_by_broadcast_changes_only(self, published):
+        assert self.event.version == 1
+        self.event.title = 'Flash flood'
+        self.event.save(update_fields=['title'])
+        self.event.save()
+        EventModel.objects.get(pk=self.event.pk).save()
+
+        assert EventModel.objects.get(pk=self.event.pk).version == 2
+
+    def test_stale_copies_get_versions_of_their_own(self, published):
+        first = EventModel.objects.get(pk=self.event.pk)
+        second = EventModel.objects.get(pk=self.event.pk)
+        first.status = 'verified'
+        first.save()
+        second.trust_score = 0.8
+        second.save(update_fields=['trust_score'])
+
+        assert (first.version, second.version) == (2, 3)
+        assert EventModel.objects.get(pk=self.event.pk).version == 3
+        broadcast.buffer.flush()
+        assert [m['version'] for m in sent(published)] == [3]
+
+    def test_status_action_sends_patch_without_loading_the_event(self, published, django_assert_num_queries):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', password='pass1234', is_staff=True))
+        response = client.post(f'/api/v1/admin/events/{self.event.pk}/verify/')
+        assert response.data['version'] == 2
+
+        # Only the watermark (two) and marking the entry flushed
+        with django_assert_num_queries(3):
+            broadcast.buffer.flush()
+        assert sent(published) == [{
+            'type': 'event_patch', 'id': str(self.event.pk),
+            'base_version': 1, 'version': 2, 'changes': {'status': 'verified'},
+        }]
+
+    def test_consecutive_patches_merge(self, published):
+        event = EventModel.objects.get(pk=self.event.pk)
+        event.status = 'escalated'
+        event.save()
+        event.trust_score = 0.9
+        event.save()
+        broadcast.buffer.flush()
+
+        [message] = sent(published)
+        assert (message['base_version'], message['version']) == (1, 3)
+        assert message['changes'] == {'status': 'escalated', 'trust_score': 0.9}
+
+    def test_routing_change_sends_full_update(self, published):
+        event = EventModel.objects.get(pk=self.event.pk)
+        event.status = 'escalated'
+        event.save()
+        event.severity = 'critical'
+        event.save()
+        broadcast.buffer.flush()
+
+        [message] = sent(published)
+        assert message['type'] == 'event_updated'
+        assert message['event']['severity'] == 'critical'
+        assert message['event']['version'] == 3
+
+    def test_unchanged_save_is_not_broadcast(self, published):
+        EventModel.objects.get(pk=self.event.pk).save()
+        broadcast.buffer.flush()
+
+        assert not published.called
+
+    def test_retrieve_returns_current_version(self):
+        self.event.status = 'verified'
+        self.event.save()
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', password='pass1234', is_staff=True))
+        response = client.get(f'/api/v1/admin/events/{self.event.pk}/')
+
+        assert response.status_code == 200
+        assert response.data['version'] == 2
+        assert client.get('/api/v1/admin/events/not-a-uuid/').status_code == 404
+        assert client.get(f"/api/v1/admin/events/{'-' * 36}/").status_code == 404
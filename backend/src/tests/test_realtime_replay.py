@@ -0,0 +1,181 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.utils import timezone
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+
+from infrastructure.models import ChangeLogEntry, EventModel
+from inehss.models import FormTemplate, HazardReport
+from interfaces.broadcast import BroadcastBuffer, replay
+from interfaces.consumers import EventConsumer
+
+
+def create_event(title, latitude=6.5, longitude=3.4, **fields):
+    return EventModel.objects.create(
+        title=title, description='Replay', latitude=latitude, longitude=longitude, **fields
+    )
+
+
+@pytest.fixture(autouse=True)
+def inline_broadcasts(settings):
+    settings.REALTIME_BATCH_INTERVAL_MS = 0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplay:
+    def test_gap_is_coalesced_into_current_state(self):
+        create_event('Seen')
+        since = ChangeLogEntry.latest_seq()
+        kept = create_event('Flood')
+        kept.status = 'verified'
+        kept.save()
+        create_event('Gone').delete()
+        form = FormTemplate.objects.create(name='Public', schema=[{'name': 'summary'}])
+        report = HazardReport.objects.create(form_template=form, data={'summary': 'Spill'}, priority='high')
+
+        messages, routes, seq = replay(since, limit=100)
+
+        assert seq == ChangeLogEntry.latest_seq()
+        assert [m['type'] for m in messages] == ['event_created', 'event_deleted', 'hazard_report_changed']
+        assert messages[0]['event']['status'] == 'verified'
+        assert messages[0]['event']['version'] == 2
+        assert routes[1] is None
+        assert messages[2]['report']['tracking_id'] == report.tracking_id
+        assert routes[2]['severity'] == 'high'
+
+    def test_up_to_date_client_gets_nothing(self):
+        create_event('Flood')
+
+        assert replay(ChangeLogEntry.latest_seq(), limit=100) == ([], [], ChangeLogEntry.latest_seq())
+
+    def test_trimmed_or_too_long_gap_needs_resync(self, settings, monkeypatch):
+        settings.CHANGE_LOG_SIZE = 3
+        monkeypatch.setattr(ChangeLogEntry, 'TRIM_EVERY', 1)
+        since = ChangeLogEntry.latest_seq()
+        for i in range(5):
+            create_event(f'Event {i}')
+
+        assert ChangeLogEntry.objects.count() == 3
+        assert replay(since, limit=100)[0] is None
+        assert replay(ChangeLogEntry.latest_seq() - 3, limit=2)[0] is None
+        assert len(replay(ChangeLogEntry.latest_seq() - 3, limit=3)[0]) == 3
+        # A sequence number from before a database reset
+        assert replay(ChangeLogEntry.latest_seq() + 10, limit=100)[0] is None
+
+    def test_seq_is_assigned_in_commit_order(self):
+        create_event('Seen')
+        since = ChangeLogEntry.latest_seq()
+        with transaction.atomic():
+            slow = create_event('Slow writer')
+            # Nothing a client could resume past until this commits
+            assert ChangeLogEntry.latest_seq() == since
+            quick = create_event('Quick writer')
+        create_event('After')
+
+        entries = list(ChangeLogEntry.objects.filter(seq__gt=since).order_by('seq').values_list('object_id', flat=True))
+        assert entries[:2] == [str(slow.pk), str(quick.pk)]
+        assert len(entries) == 3
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWatermark:
+    def _logged_by(self, buffer, title):
+        # Another worker process: its own buffer, sharing the change log
+        with mock.patch('interfaces.broadcast.buffer', buffer):
+            create_event(title)
+        return ChangeLogEntry.latest_seq()
+
+    def test_out_of_order_flushes_never_skip_a_change(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        first, second = BroadcastBuffer(), BroadcastBuffer()
+        first_seq = self._logged_by(first, 'Logged first')
+        second_seq = self._logged_by(second, 'Logged second')
+
+        with mock.patch('interfaces.broadcast.publish_batch') as publish:
+            second.flush()
+            # first_seq is still in flight: resuming past it would lose it
+            assert publish.call_args.args[3] == first_seq - 1
+
+            first.flush()
+            assert publish.call_args.args[3] == second_seq
+        assert not ChangeLogEntry.objects.filter(flushed=False).exists()
+
+    def test_entries_of_a_dead_process_stop_holding_it_back(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 60_000
+        lost_seq = self._logged_by(BroadcastBuffer(), 'Never flushed')
+        latest = self._logged_by(BroadcastBuffer(), 'Flushed')
+
+        assert ChangeLogEntry.watermark([latest]) == lost_seq - 1
+        ChangeLogEntry.objects.filter(seq=lost_seq).update(
+            created_at=timezone.now() - timedelta(seconds=settings.REALTIME_FLUSH_GRACE_SECONDS + 1)
+        )
+        assert ChangeLogEntry.watermark([latest]) == latest
+
+
+async def _receive_seq_frames(communicator):
+    welcome = await communicator.receive_json_from()
+    assert welcome['type'] == 'connection_established'
+    return welcome['seq']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConsumerResume:
+    def test_live_frames_carry_seq(self):
+        async def scenario():
+            communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+            await communicator.connect()
+            await _receive_seq_frames(communicator)
+
+            await database_sync_to_async(create_event)('Flood')
+            frame = await communicator.receive_json_from()
+
+            assert frame['seq'] == await database_sync_to_async(ChangeLogEntry.latest_seq)()
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_reconnect_replays_only_the_gap(self):
+        async def scenario():
+            create = database_sync_to_async(create_event)
+            await create('Before')
+            since = await database_sync_to_async(ChangeLogEntry.latest_seq)()
+            await create('Lagos', severity='high')
+            await create('Abuja', latitude=9.0, longitude=7.4, severity='high')
+
+            communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+            await communicator.connect()
+            assert await _receive_seq_frames(communicator) == since + 2
+
+            await communicator.send_json_to({'type': 'subscribe', 'bbox': [2.7, 6.3, 4.4, 6.8]})
+            assert (await communicator.receive_json_from())['type'] == 'subscribed'
+            await communicator.send_json_to({'type': 'resume', 'resume_from': since})
+            frame = await communicator.receive_json_from()
+
+            assert frame['replay'] is True
+            assert frame['seq'] == since + 2
+            assert [m['event']['title'] for m in frame['messages']] == ['Lagos']
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_resume_from_query_string_and_resync(self):
+        async def scenario():
+            await database_sync_to_async(create_event)('Seen')
+            since = await database_sync_to_async(ChangeLogEntry.latest_seq)()
+            for i in range(3):
+                await database_sync_to_async(create_event)(f'Event {i}')
+            # The first change after `since` has been trimmed away
+            await database_sync_to_async(ChangeLogEntry.objects.filter(seq__lte=since + 1).delete)()
+
+            communicator = WebsocketCommunicator(EventConsumer.as_asgi(), f'/ws/events/?resume_from={since}')
+            await communicator.connect()
+            await _receive_seq_frames(communicator)
+
+            assert await communicator.receive_json_from() == {'type': 'resync_required', 'seq': since + 3}
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
@@ -0,0 +1,140 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+
+from application.services import EventReportingService
+from infrastructure.models import EventModel
+from interfaces.consumers import EventConsumer
+from interfaces.subscriptions import ALL_GROUP, Subscription, route_groups
+
+
+def route(lat=6.5, lon=3.4, region_code='NGA.25.3_1', severity='high', category='flood'):
+    return {'latitude': lat, 'longitude': lon, 'region_code': region_code, 'severity': severity, 'category': category}
+
+
+class TestSubscription:
+    def test_small_bbox_routes_by_grid_cells(self):
+        subscription = Subscription(bbox='2.7,6.3,4.4,6.8', min_severity='high')
+
+        assert subscription.groups() == ['events_cell_2_6', 'events_cell_3_6', 'events_cell_4_6']
+        assert subscription.matches(route())
+        assert not subscription.matches(route(severity='medium'))
+        assert not subscription.matches(route(lon=4.5))
+        assert not subscription.matches(route(lat=None, lon=None))
+
+    def test_publisher_and_subscriber_groups_meet_once(self):
+        event_groups = set(route_groups(route()))
+        subscriptions = [
+            Subscription(bbox=[2.7, 6.3, 4.4, 6.8]),
+            Subscription(regions=['NGA', 'NGA.25', 'NGA.25.3_1']),
+            Subscription(categories=['Flood']),
+            Subscription(min_severity='medium'),
+            Subscription(),
+        ]
+
+        for subscription in subscriptions:
+            assert len(event_groups & set(subscription.groups())) == 1
+            assert subscription.matches(route())
+
+    def test_regions_drop_covered_descendants(self):
+        subscription = Subscription(regions=['NGA.25.3_1', 'NGA.25', 'NGA.1'])
+
+        assert subscription.regions == ['NGA.1', 'NGA.25']
+        assert subscription.matches(route(region_code='NGA.25'))
+        assert not subscription.matches(route(region_code='NGA.2'))
+
+    def test_large_bbox_falls_back_to_other_filters(self):
+        assert Subscription(bbox=[-180, -90, 180, 90], min_severity='critical').groups() == ['events_severity_critical']
+        assert Subscription(bbox=[-180, -90, 180, 90]).groups() == [ALL_GROUP]
+        assert Subscription(min_severity='low').groups() == [ALL_GROUP]
+
+    @pytest.mark.parametrize('data', [
+        {'bbox': '1,2,3'},
+        {'bbox': [5, 0, 1, 1]},
+        {'bbox': 'nan,0,1,1'},
+        {'min_severity': 'extreme'},
+        {'regions': ['NGA 25']},
+    ])
+    def test_invalid_filters_are_rejected(self, data):
+        with pytest.raises(ValueError):
+            Subscription.from_message(data)
+
+
+async def _connect(subscribe=None):
+    communicator = WebsocketCommunicator(EventConsumer.as_asgi(), '/ws/events/')
+    connected, _ = await communicator.connect()
+    assert connected
+    assert (await communicator.receive_json_from())['type'] == 'connection_established'
+    if subscribe is not None:
+        await communicator.send_json_to(subscribe)
+        assert (await communicator.receive_json_from())['type'] == 'subscribed'
+    return communicator
+
+
+def titles(frame):
+    assert frame['type'] == 'events_batch'
+    return [message['event']['title'] for message in frame['messages']]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventConsumerRouting:
+    @pytest.fixture(autouse=True)
+    def inline_broadcasts(self, settings):
+        settings.REALTIME_BATCH_INTERVAL_MS = 0
+
+    def test_events_reach_only_matching_connections(self):
+        async def scenario():
+            everything = await _connect()
+            lagos = await _connect({'type': 'subscribe', 'bbox': [2.7, 6.3, 4.4, 6.8], 'min_severity': 'high'})
+            abuja = await _connect({'type': 'subscribe_region', 'region': 'NGA.15'})
+
+            await database_sync_to_async(EventModel.objects.create)(
+                title='Flood', description='Lekki', severity='critical', latitude=6.45, longitude=3.5,
+            )
+
+            assert titles(await everything.receive_json_from()) == ['Flood']
+            assert titles(await lagos.receive_json_from()) == ['Flood']
+            assert await abuja.receive_nothing()
+
+            await database_sync_to_async(EventModel.objects.create)(
+                title='Minor', description='Lekki', severity='low', latitude=6.45, longitude=3.5,
+            )
+
+            assert titles(await everything.receive_json_from()) == ['Minor']
+            assert await lagos.receive_nothing()
+
+            await lagos.send_json_to({'type': 'unsubscribe'})
+            assert (await lagos.receive_json_from())['type'] == 'unsubscribed'
+            for communicator in (everything, lagos, abuja):
+                await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_bulk_insert_frames_carry_only_matching_events(self):
+        async def scenario():
+            lagos = await _connect({'type': 'subscribe', 'bbox': '2.7,6.3,4.4,6.8'})
+            rows = [
+                {'description': 'In box', 'latitude': 6.5, 'longitude': 3.4},
+                {'description': 'Out of box', 'latitude': 9.0, 'longitude': 7.4},
+                {'description': 'Same cell, out of box', 'latitude': 6.9, 'longitude': 3.4},
+            ]
+            await database_sync_to_async(EventReportingService.bulk_create_events)(rows)
+
+            frame = await lagos.receive_json_from()
+            assert frame['type'] == 'events_batch'
+            assert [m['type'] for m in frame['messages']] == ['event_created']
+            assert [m['event']['description'] for m in frame['messages']] == ['In box']
+            assert await lagos.receive_nothing()
+            await lagos.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_invalid_subscription_keeps_feed(self):
+        async def scenario():
+            communicator = await _connect()
+            await communicator.send_json_to({'type': 'subscribe', 'min_severity': 'extreme'})
+            assert (await communicator.receive_json_from())['type'] == 'error'
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel
+from infrastructure.regions import RegionIndex, get_region_index, region_ancestor
+from inehss.models import FormTemplate, HazardReport
+
+SQUARE = {'type': 'Polygon', 'coordinates': [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]], [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]]}
+INNER = {'type': 'MultiPolygon', 'coordinates': [[[[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]]]}
+
+
+def test_region_ancestor():
+    assert region_ancestor('NGA.25.15_1', 'country') == 'NGA'
+    assert region_ancestor('NGA.25.15_1', 'state') == 'NGA.25'
+    assert region_ancestor('NGA.25.15_1', 'lga') == 'NGA.25.15_1'
+    assert region_ancestor('GBR', 'state') == ''
+    assert region_ancestor('', 'country') == ''
+
+
+def test_index_prefers_earlier_layers_and_respects_holes():
+    index = RegionIndex()
+    index.add('AAA.1.1_1', INNER)
+    index.add('AAA', SQUARE)
+    index.finalize()
+
+    assert index.lookup(2, 2) == 'AAA.1.1_1'
+    assert index.lookup(8, 8) == 'AAA'
+    assert index.lookup(5, 5) == ''  # inside the hole
+    assert index.lookup(20, 20) == ''
+    assert index.lookup(None, 2) == ''
+
+
+def test_shipped_boundaries():
+    index = get_region_index()
+
+    assert index.lookup(6.52, 3.37).startswith('NGA.25.')
+    assert index.names['NGA.25'] == 'Lagos'
+    assert index.lookup(51.5, -0.12) == 'GBR'
+    assert index.lookup(0, -30) == ''
+
+
+@pytest.mark.django_db
+class TestRegionCodes:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/stats/regions/'
+
+        EventModel.objects.create(description='x', latitude=6.52, longitude=3.37, severity='critical', category='flood')
+        EventModel.objects.create(description='x', latitude=6.60, longitude=3.35, severity='low', category='fire')
+        EventModel.objects.create(description='x', latitude=9.07, longitude=7.39, severity='high', category='flood')
+        EventModel.objects.create(description='x', latitude=51.5, longitude=-0.12, severity='low', category='flood')
+        EventModel.objects.create(description='x', latitude=0, longitude=-30, category='flood')
+        form = FormTemplate.objects.create(name='Public Hazard Form', form_type='public')
+        HazardReport.objects.create(form_template=form, latitude=6.52, longitude=3.37)
+
+    def test_codes_assigned_on_save(self):
+        event = EventModel.objects.get(latitude=51.5)
+        assert event.region_code == 'GBR'
+        assert HazardReport.objects.get().region_code.startswith('NGA.25.')
+
+        event.latitude, event.longitude = 6.52, 3.37
+        event.save(update_fields=['latitude', 'longitude'])
+        event.refresh_from_db()
+        assert event.region_code.startswith('NGA.25.')
+
+    def test_country_counts(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == 200
+        regions = {r['code']: r for r in response.json()['regions']}
+        assert set(regions) == {'NGA', 'GBR'}
+        assert regions['NGA']['events'] == 3
+        assert regions['NGA']['severity']['critical'] == 1
+        assert regions['NGA']['hazard_reports'] == 1
+        assert regions['NGA']['name'] == 'Nigeria'
+
+    def test_state_counts_under_parent(self):
+        response = self.client.get(self.url, {'level': 'state', 'parent': 'NGA', 'category': 'flood'})
+
+        regions = {r['name']: r['events'] for r in response.json()['regions']}
+        assert regions == {'Lagos': 1, 'Federal Capital Territory': 1}
+
+    def test_invalid_level(self):
+        assert self.client.get(self.url, {'level': 'planet'}).status_code == 400
+
+    def test_backfill_command(self):
+        EventModel.objects.update(region_code='')
+        HazardReport.objects.update(region_code='')
+
+        call_command('backfill_regions', stdout=io.StringIO())
+
+        assert EventModel.objects.get(latitude=51.5).region_code == 'GBR'
+        assert EventModel.objects.filter(region_code='').count() == 1
+        assert HazardReport.objects.get().region_code.startswith('NGA.25.')
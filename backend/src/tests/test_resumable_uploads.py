@@ -0,0 +1,201 @@
+import hashlib
+import io
+import os
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel, MediaModel
+from inehss import views
+from inehss.models import FormTemplate, HazardReport, MediaAttachment, UploadSession
+
+CONTENT = b'\x00\x00\x00\x18ftypmp42' + os.urandom(300 * 1024)
+
+
+@pytest.mark.django_db
+class TestResumableUploads:
+    def setup_method(self):
+        self.client = APIClient()
+        self.officer = User.objects.create_user(username='officer', password='pass1234')
+        form = FormTemplate.objects.create(name='Public Hazard Form', form_type='public')
+        self.event = EventModel.objects.create(description='x', latitude=6.5, longitude=3.3)
+        self.report = HazardReport.objects.create(form_template=form, event=self.event)
+        self.url = '/api/v1/inehss/uploads/'
+        # Anonymous reporters authorise uploads with the token from their submission
+        self.client.credentials(HTTP_UPLOAD_TOKEN=self.report.make_upload_token())
+
+    def _init(self, size=len(CONTENT), **extra):
+        data = {'filename': 'site-walk.mp4', 'content_type': 'video/mp4', 'size': size, 'report': str(self.report.id)}
+        data.update(extra)
+        return self.client.post(self.url, data, format='json')
+
+    def _patch(self, upload_id, offset, chunk):
+        return self.client.generic(
+            'PATCH', f'{self.url}{upload_id}/', chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunked_upload_with_resume(self, django_capture_on_commit_callbacks):
+        response = self._init()
+        assert response.status_code == 201
+        upload_id = response.json()['id']
+        assert response['Upload-Offset'] == '0'
+
+        first = CONTENT[:100 * 1024]
+        assert self._patch(upload_id, 0, first).status_code == 204
+
+        # A retry of a chunk that already arrived is rejected with the real offset
+        retry = self._patch(upload_id, 0, first)
+        assert retry.status_code == 409
+        assert retry.json()['offset'] == len(first)
+
+        head = self.client.head(f'{self.url}{upload_id}/')
+        assert head['Upload-Offset'] == str(len(first))
+        assert head['Upload-Length'] == str(len(CONTENT))
+
+        early = self.client.post(f'{self.url}{upload_id}/finalize/')
+        assert early.status_code == 409
+
+        assert self._patch(upload_id, len(first), CONTENT[len(first):]).status_code == 204
+
+        with django_capture_on_commit_callbacks(execute=True):
+            done = self.client.post(f'{self.url}{upload_id}/finalize/')
+        assert done.status_code == 201
+
+        attachment = MediaAttachment.objects.get()
+        assert attachment.file_hash == hashlib.sha256(CONTENT).hexdigest()
+        assert attachment.file_size == len(CONTENT)
+        assert attachment.file_type == 'video'
+        assert attachment.file.read() == CONTENT
+        assert not os.path.exists(UploadSession.objects.get().partial_path)
+
+        media = MediaModel.objects.get()
+        assert media.event == self.event
+        assert media.file.name == attachment.file.name
+        assert media.processing_status == MediaModel.STATUS_DONE
+
+        # Finalize is idempotent
+        again = self.client.post(f'{self.url}{upload_id}/finalize/')
+        assert again.status_code == 200
+        assert again.json()['id'] == str(attachment.id)
+
+    def test_rejects_invalid_sessions_and_chunks(self):
+        assert self._init(content_type='application/x-msdownload').status_code == 400
+        assert self._init(size=0).status_code == 400
+        assert self.client.post(self.url, {'filename': 'a.mp4', 'content_type': 'video/mp4', 'size': 10}, format='json').status_code == 401
+
+        upload_id = self._init(size=10).json()['id']
+        assert self._patch(upload_id, 0, b'x' * 11).status_code == 400
+        assert self.client.generic('PATCH', f'{self.url}{upload_id}/', b'x', content_type='application/offset+octet-stream').status_code == 400
+
+    def test_sessions_are_private_to_their_owner(self):
+        self.client.force_authenticate(user=self.officer)
+        upload_id = self._init().json()['id']
+
+        other = User.objects.create_user(username='other', password='pass1234')
+        self.client.force_authenticate(user=other)
+        assert self.client.head(f'{self.url}{upload_id}/').status_code == 404
+
+    def test_cleanup_discards_stale_sessions(self):
+        upload_id = self._init().json()['id']
+        self._patch(upload_id, 0, CONTENT[:1024])
+        session = UploadSession.objects.get()
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=session.updated_at - timedelta(days=4))
+
+        call_command('cleanup_upload_sessions', stdout=io.StringIO())
+
+        assert not UploadSession.objects.exists()
+        assert not os.path.exists(session.partial_path)
+
+    def test_anonymous_uploads_need_the_report_token(self):
+        form = FormTemplate.objects.create(name='Other', form_type='public')
+        other = HazardReport.objects.create(form_template=form)
+
+        assert self._init(report=str(other.id)).status_code == 401
+        upload_id = self._init().json()['id']
+
+        self.client.credentials()
+        assert self._init().status_code == 401
+        assert self.client.head(f'{self.url}{upload_id}/').status_code == 404
+        assert self._patch(upload_id, 0, b'x').status_code == 404
+
+    def test_submitted_report_returns_upload_token(self):
+        self.client.credentials()
+        response = self.client.post('/api/v1/inehss/reports/', {
+            'form_template': str(FormTemplate.objects.get().id), 'data': {}, 'latitude': 6.5, 'longitude': 3.3,
+        }, format='json')
+
+        assert response.status_code == 201
+        assert HazardReport.upload_token_matches(response.json()['id'], response.json()['upload_token'])
+
+    def test_open_sessions_are_capped(self, settings):
+        settings.RESUMABLE_UPLOAD_MAX_OPEN_SESSIONS = 2
+        settings.RESUMABLE_UPLOAD_MAX_OPEN_BYTES = 3000
+
+        assert self._init(size=1000).status_code == 201
+        assert self._init(size=2001).status_code == 429
+        assert self._init(size=2000).status_code == 201
+        assert self._init(size=1).status_code == 429
+
+    def test_session_creation_has_its_own_throttle(self):
+        with mock.patch('rest_framework.throttling.ScopedRateThrottle.THROTTLE_RATES', {'upload_sessions': '1/hour', 'uploads': '100/hour'}):
+            upload_id = self._init(size=10).json()['id']
+            assert self._init(size=10).status_code == 429
+            assert self._patch(upload_id, 0, b'x' * 10).status_code == 204
+
+    def test_concurrent_chunk_at_same_offset_is_rejected(self):
+        upload_id = self._init(size=10).json()['id']
+        session = UploadSession.objects.get()
+        spool = views.tempfile.TemporaryFile
+
+        def racing_spool(**kwargs):
+            # Another PATCH at offset 0 lands while this one is still receiving
+            with open(session.partial_path, 'r+b') as fh:
+                fh.write(b'a' * 4)
+            UploadSession.objects.filter(pk=session.pk).update(offset=4)
+            return spool(**kwargs)
+
+        with mock.patch('inehss.views.tempfile.TemporaryFile', racing_spool):
+            response = self._patch(upload_id, 0, b'b' * 6)
+
+        assert response.status_code == 409
+        assert response.json()['offset'] == 4
+        with open(session.partial_path, 'rb') as fh:
+            assert fh.read() == b'a' * 4
+
+    def test_concurrent_finalize_builds_one_attachment(self, django_capture_on_commit_callbacks):
+        upload_id = self._init(size=len(CONTENT)).json()['id']
+        self._patch(upload_id, 0, CONTENT)
+        save = MediaAttachment.save
+        racing = []
+
+        def racing_save(attachment, *args, **kwargs):
+            # A retry arrives while the first request is still hashing the file
+            racing.append(self.client.post(f'{self.url}{upload_id}/finalize/'))
+            return save(attachment, *args, **kwargs)
+
+        with mock.patch.object(MediaAttachment, 'save', racing_save):
+            with django_capture_on_commit_callbacks(execute=True):
+                first = self.client.post(f'{self.url}{upload_id}/finalize/')
+
+        assert first.status_code == 201
+        assert racing[0].status_code == 409
+        assert MediaAttachment.objects.count() == 1
+        retry = self.client.post(f'{self.url}{upload_id}/finalize/')
+        assert retry.status_code == 200
+        assert retry.json()['id'] == first.json()['id']
+
+    def test_failed_finalize_can_be_retried(self):
+        upload_id = self._init(size=10).json()['id']
+        self._patch(upload_id, 0, b'x' * 10)
+
+        with mock.patch.object(MediaAttachment, 'save', side_effect=OSError('disk full')):
+            with pytest.raises(OSError):
+                self.client.post(f'{self.url}{upload_id}/finalize/')
+
+        assert UploadSession.objects.get().status == 'uploading'
+        assert not MediaAttachment.objects.exists()
@@ -0,0 +1,138 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from infrastructure.auth import UserProfile
+from infrastructure.models import AIInteractionLog, EventModel, MediaModel
+from inehss.models import FormSubmission, FormTemplate, HazardReport, OfficerAssignment
+from interfaces.views import EventListAdminView
+
+
+@pytest.mark.django_db
+class TestEventListFieldsets:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.factory = APIRequestFactory()
+        self.url = '/api/v1/admin/events/'
+
+        for i in range(3):
+            event = EventModel.objects.create(
+                title=f'Event {i}', description='A long description', severity='high',
+                latitude=6.5, longitude=3.3,
+            )
+            MediaModel.objects.create(event=event, file=ContentFile(f'img {i}'.encode(), name='a.jpg'))
+
+    def _list_view(self, params=None):
+        request = self.factory.get(self.url, params)
+        force_authenticate(request, user=self.user)
+        return EventListAdminView.as_view()(request)
+
+    def test_fields_limits_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._list_view({'fields': 'id,latitude,longitude,severity'})
+
+        assert response.status_code == 200
+        assert set(response.data['results'][0]) == {'id', 'latitude', 'longitude', 'severity'}
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        assert '"description"' not in sql
+        assert 'event_media' not in sql
+
+    def test_expand_adds_prefetched_relation(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._list_view({'fields': 'id', 'expand': 'media_attachments'})
+
+        row = response.data['results'][0]
+        assert set(row) == {'id', 'media_attachments'}
+        assert len(row['media_attachments']) == 1
+        # validators + count + page + one media prefetch, whatever the page size
+        assert len(ctx.captured_queries) == 4
+
+    def test_default_response_is_unchanged(self):
+        response = self._list_view()
+
+        row = response.data['results'][0]
+        assert 'description' in row
+        assert len(row['media_attachments']) == 1
+
+    def test_keyset_mode_with_fields(self):
+        response = self._list_view({'fields': 'id', 'mode': 'cursor', 'limit': 2})
+
+        assert response.status_code == 200
+        assert set(response.data['results'][0]) == {'id'}
+        assert response.data['next']
+
+    def test_admin_events_endpoint_fields(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'fields': 'id,severity', 'mode': 'cursor', 'limit': 2})
+
+        assert set(response.data['results'][0]) == {'id', 'severity'}
+        assert response.data['next']
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        assert '"description"' not in sql
+
+
+@pytest.mark.django_db
+class TestINEHSSFieldsets:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='pass1234', is_staff=True)
+        self.client.force_authenticate(user=self.admin)
+        form = FormTemplate.objects.create(name='Public', form_type='public', schema=[{'name': 'summary'}])
+        self.report = HazardReport.objects.create(form_template=form, data={'summary': 'Spill'}, latitude=6.5, longitude=3.3)
+        assignment = OfficerAssignment.objects.create(
+            report=self.report, officer=self.admin,
+            inspection_form=FormTemplate.objects.create(name='Inspection', form_type='officer'),
+        )
+        FormSubmission.objects.create(assignment=assignment, submitted_by=self.admin, data={'notes': 'ok'})
+
+    def test_hazard_report_fields(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/inehss/reports/', {'fields': 'id,tracking_id,status'})
+
+        assert set(response.data['results'][0]) == {'id', 'tracking_id', 'status'}
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        assert 'inehss_mediaattachment' not in sql
+        assert '"data"' not in sql
+
+    def test_hazard_report_detail_fields(self):
+        response = self.client.get(f'/api/v1/inehss/reports/{self.report.id}/', {'fields': 'id,form_template'})
+
+        assert set(response.data) == {'id', 'form_template'}
+        assert response.data['form_template']['name'] == 'Public'
+
+    def test_submission_fields_follow_relations(self):
+        response = self.client.get('/api/v1/inehss/submissions/', {'fields': 'id,submitted_by_username'})
+
+        row = response.data['results'][0]
+        assert row == {'id': row['id'], 'submitted_by_username': 'admin'}
+
+    def test_fields_ignored_on_writes(self):
+        client = APIClient()
+        response = client.post(
+            '/api/v1/inehss/reports/?fields=id',
+            {'form_template': str(self.report.form_template_id), 'data': {'summary': 'x'}},
+            format='json',
+        )
+
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db
+class TestAIInteractionLogFieldsets:
+    def test_fields(self):
+        analyst = User.objects.create_user(username='analyst', password='pass1234')
+        UserProfile.objects.create(user=analyst, role='analyst')
+        AIInteractionLog.objects.create(user=analyst, prompt_redacted='p', response_text='r')
+        client = APIClient()
+        client.force_authenticate(user=analyst)
+
+        response = client.get('/api/v1/ai-interactions/', {'fields': 'id,username,confidence_label'})
+
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        assert set(rows[0]) == {'id', 'username', 'confidence_label'}
+        assert rows[0]['username'] == 'analyst'
@@ -0,0 +1,74 @@
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from rest_framework.test import APIClient
+
+from application.services import EventStatsService
+from infrastructure.models import EventModel
+
+
+@pytest.mark.django_db
+class TestStatsSummary:
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/stats/summary/'
+
+        EventModel.objects.create(description='a', severity='critical', status='verified')
+        EventModel.objects.create(description='b', severity='high')
+        EventModel.objects.create(description='c', severity='low')
+
+    def test_summary_counts(self):
+        data = self.client.get(self.url).json()
+
+        assert data['active_reports'] == 3
+        assert data['critical_sectors'] == 1
+        assert data['sensor_integrity'] == pytest.approx(33.3)
+        assert data['global_heat_index'] == pytest.approx(0.3)
+
+    def test_snapshot_served_without_queries(self, django_assert_num_queries):
+        self.client.get(self.url)
+        # Warm call still authenticates via force_authenticate, so no queries at all
+        with django_assert_num_queries(0):
+            data = self.client.get(self.url).json()
+        assert data['active_reports'] == 3
+
+    def test_event_write_invalidates_snapshot(self, django_capture_on_commit_callbacks):
+        assert self.client.get(self.url).json()['critical_sectors'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            event = EventModel.objects.create(description='d', severity='critical')
+        assert self.client.get(self.url).json()['critical_sectors'] == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            event.delete()
+        assert self.client.get(self.url).json()['critical_sectors'] == 1
+
+    def test_invalidation_waits_for_commit(self, django_capture_on_commit_callbacks):
+        version = EventStatsService._current_version()
+        with django_capture_on_commit_callbacks() as callbacks:
+            EventModel.objects.create(description='d', severity='critical')
+            # Still the pre-commit version, so no read can cache under the next one
+            assert EventStatsService._current_version() == version
+
+        for callback in callbacks:
+            callback()
+        assert EventStatsService._current_version() != version
+
+    def test_invalidation_reaches_other_workers(self, django_capture_on_commit_callbacks):
+        # Another worker process: its own cache client on the shared directory
+        other_worker = FileBasedCache(settings.CACHES['default']['LOCATION'], {})
+        with mock.patch('application.services.cache', other_worker):
+            assert EventStatsService.get_summary()['critical'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            EventModel.objects.create(description='d', severity='critical')
+
+        with mock.patch('application.services.cache', other_worker):
+            assert EventStatsService.get_summary()['critical'] == 2
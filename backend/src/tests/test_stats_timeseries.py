@@ -0,0 +1,70 @@
+import io
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from infrastructure.models import EventModel
+
+
+def _at(day, hour):
+    return datetime(2026, 3, day, hour, 30, tzinfo=dt_timezone.utc)
+
+
+@pytest.mark.django_db
+class TestStatsTimeseries:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/stats/timeseries/'
+
+        fixtures = [
+            (_at(1, 9), 'high', 'flood', 6.5),
+            (_at(1, 9), 'low', 'flood', 6.5),
+            (_at(1, 14), 'critical', 'fire', 51.5),
+            (_at(3, 8), 'low', 'flood', 6.5),
+        ]
+        for created_at, severity, category, lat in fixtures:
+            event = EventModel.objects.create(description='x', severity=severity, category=category, latitude=lat, longitude=3.3)
+            EventModel.objects.filter(pk=event.pk).update(created_at=created_at)
+        # Timestamps were rewritten with update(), so recount the buckets
+        call_command('rebuild_event_counters', stdout=io.StringIO())
+
+    def test_daily_series_is_zero_filled(self):
+        response = self.client.get(self.url, {'bucket': 'day', 'from': '2026-03-01', 'to': '2026-03-03'})
+
+        assert response.status_code == 200
+        series = response.json()['series']
+        assert [point['total'] for point in series] == [3, 0, 1]
+        assert series[0]['severity'] == {'low': 1, 'medium': 0, 'high': 1, 'critical': 1}
+        assert series[0]['bucket'].startswith('2026-03-01T00:00:00')
+
+    def test_daily_counters_match_event_scan(self):
+        params = {'bucket': 'day', 'from': '2026-03-01', 'to': '2026-03-03', 'category': 'flood'}
+        from_counters = self.client.get(self.url, params).json()['series']
+        from_events = self.client.get(self.url, {**params, 'bbox': '-180,-90,180,90'}).json()['series']
+
+        assert from_counters == from_events
+        assert [point['total'] for point in from_counters] == [2, 0, 1]
+
+    def test_hourly_series_with_bbox(self):
+        response = self.client.get(self.url, {
+            'bucket': 'hour',
+            'from': '2026-03-01T08:00:00Z',
+            'to': '2026-03-01T15:00:00Z',
+            'bbox': '2,4,15,14',
+        })
+
+        series = response.json()['series']
+        assert len(series) == 8
+        totals = {point['bucket'][11:13]: point['total'] for point in series}
+        assert totals['09'] == 2
+        assert totals['14'] == 0  # the fire event is outside the bbox
+
+    def test_invalid_parameters(self):
+        assert self.client.get(self.url, {'bucket': 'week'}).status_code == 400
+        assert self.client.get(self.url, {'from': 'yesterday'}).status_code == 400
+        assert self.client.get(self.url, {'bucket': 'hour', 'from': '2020-01-01', 'to': '2026-01-01'}).status_code == 400
@@ -0,0 +1,128 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from infrastructure import mvt
+from infrastructure.models import EventModel
+from inehss.models import FormTemplate, HazardReport
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data):
+    """Yield (field_number, wire_type, value) for a protobuf message."""
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        else:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        yield field, wire_type, value
+
+
+def _decode_layers(tile):
+    layers = {}
+    for field, _, layer_bytes in _fields(tile):
+        assert field == 3
+        name, features, keys, values = None, [], [], []
+        for layer_field, _, value in _fields(layer_bytes):
+            if layer_field == 1:
+                name = value.decode()
+            elif layer_field == 2:
+                features.append(value)
+            elif layer_field == 3:
+                keys.append(value.decode())
+            elif layer_field == 4:
+                values.append(next(_fields(value))[2])
+        decoded = []
+        for feature in features:
+            props = {}
+            for feature_field, _, value in _fields(feature):
+                if feature_field == 2:
+                    tags, pos = [], 0
+                    while pos < len(value):
+                        tag, pos = _read_varint(value, pos)
+                        tags.append(tag)
+                    for k, v in zip(tags[::2], tags[1::2]):
+                        props[keys[k]] = values[v].decode() if isinstance(values[v], bytes) else values[v]
+            decoded.append(props)
+        layers[name] = decoded
+    return layers
+
+
+def test_project_tile_corners():
+    assert mvt.project(85.05112878, -180.0, 0, 0, 0) == (0, 0)
+    assert mvt.project(-85.05112878, 180.0, 0, 0, 0) == (4096, 4096)
+    min_lon, min_lat, max_lon, max_lat = mvt.tile_bounds(1, 1, 0)
+    assert (min_lon, max_lon) == (0.0, 180.0)
+    assert min_lat == pytest.approx(0.0, abs=1e-9)
+
+
+@pytest.mark.django_db
+class TestVectorTiles:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='analyst', password='pass1234')
+        self.client.force_authenticate(user=self.user)
+
+        EventModel.objects.create(title='Lagos spill', description='x', latitude=6.52, longitude=3.37, severity='critical')
+        EventModel.objects.create(title='Lagos dump', description='x', latitude=6.5201, longitude=3.3701, severity='low')
+        EventModel.objects.create(title='London', description='x', latitude=51.5, longitude=-0.12, severity='high')
+        form = FormTemplate.objects.create(name='Public Hazard Form', form_type='public')
+        HazardReport.objects.create(form_template=form, latitude=9.07, longitude=7.39, priority='high')
+
+    def test_world_tile_contains_both_layers(self):
+        response = self.client.get('/api/v1/tiles/0/0/0.mvt')
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/vnd.mapbox-vector-tile'
+        assert response['ETag']
+        layers = _decode_layers(response.content)
+        # The two Lagos events share a pixel at zoom 0; the critical one wins
+        titles = sorted(f['title'] for f in layers['events'])
+        assert titles == ['Lagos spill', 'London']
+        assert layers['hazard_reports'][0]['priority'] == 'high'
+
+    def test_tile_excludes_other_regions(self):
+        # z=3 tile covering Nigeria (x=4, y=3)
+        layers = _decode_layers(self.client.get('/api/v1/tiles/3/4/3.mvt').content)
+        assert {f['title'] for f in layers['events']} == {'Lagos spill'}
+
+    def test_if_none_match_returns_304(self):
+        first = self.client.get('/api/v1/tiles/0/0/0.mvt')
+        second = self.client.get('/api/v1/tiles/0/0/0.mvt', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert second.status_code == 304
+        assert second.content == b''
+
+    def test_revalidation_skips_encoding(self):
+        etag = self.client.get('/api/v1/tiles/0/0/0.mvt')['ETag']
+
+        with mock.patch('interfaces.views.mvt.encode_tile') as encode_tile:
+            response = self.client.get('/api/v1/tiles/0/0/0.mvt', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['Cache-Control'] == 'private, max-age=60'
+        assert not encode_tile.called
+
+        EventModel.objects.filter(title='London').update(severity='critical', updated_at=timezone.now())
+        assert self.client.get('/api/v1/tiles/0/0/0.mvt', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_invalid_tile_coordinates(self):
+        assert self.client.get('/api/v1/tiles/1/2/0.mvt').status_code == 400
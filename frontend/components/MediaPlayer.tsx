@@ -45,7 +45,8 @@ const MediaPlayer: React.FC<MediaPlayerProps> = ({ media, className = '' }) => {
     };
 
     const renderMedia = (item: MediaAttachment, isFullscreen = false) => {
-        const url = getMediaUrl(item.file);
+        // Inline views load the medium rendition; the lightbox shows the original
+        const url = getMediaUrl(isFullscreen ? item.file : (item.renditions?.medium || item.file));
         const containerClass = isFullscreen
             ? 'max-h-[80vh] max-w-[90vw]'
             : 'w-full h-48 object-cover rounded-lg';
@@ -146,7 +147,7 @@ const MediaPlayer: React.FC<MediaPlayerProps> = ({ media, className = '' }) => {
                                 }`}
                         >
                             {item.file_type === 'image' ? (
-                                <img src={getMediaUrl(item.file)} alt="" className="w-full h-full object-cover" />
+                                <img src={getMediaUrl(item.renditions?.thumb || item.file)} alt="" className="w-full h-full object-cover" />
                             ) : (
                                 <div className="w-full h-full bg-slate-800 flex items-center justify-center">
                                     <span className="text-[8px] text-slate-400 uppercase">{item.file_type}</span>
@@ -1,19 +1,41 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { IntelligenceEvent, EventType, EventSeverity } from '../types';
+import { EventPatch } from '../services/eventService';
 
 interface WebSocketMessage {
     type: string;
     event?: any;
+    media?: any;
     event_id?: string;
     message?: string;
     level?: string;
     verified?: boolean;
+    messages?: WebSocketMessage[];
+    id?: string;
+    seq?: number | null;
+    replay?: boolean;
+    action?: string;
+    report?: any;
+}
+
+// Server-side feed filter; all given criteria must match
+export interface RealtimeSubscription {
+    bbox?: [number, number, number, number]; // minLon, minLat, maxLon, maxLat
+    regions?: string[];
+    min_severity?: 'low' | 'medium' | 'high' | 'critical';
+    categories?: string[];
 }
 
 interface UseRealtimeEventsOptions {
     onEventCreated?: (event: IntelligenceEvent) => void;
     onEventUpdated?: (event: IntelligenceEvent) => void;
+    onEventPatched?: (patch: EventPatch) => void;
+    onEventDeleted?: (eventId: string) => void;
+    onHazardReportChanged?: (report: any, action: string) => void;
+    // The missed changes could not be replayed; reload everything
+    onResyncRequired?: () => void;
     onEventVerified?: (eventId: string, verified: boolean) => void;
+    onMediaProcessed?: (media: any) => void;
     onSystemAlert?: (message: string, level: string) => void;
 }
 
@@ -26,6 +48,10 @@ export function useRealtimeEvents(options: UseRealtimeEventsOptions = {}) {
     const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
     const reconnectAttemptsRef = useRef(0);
     const optionsRef = useRef(options);
+    const subscriptionRef = useRef<RealtimeSubscription | null>(null);
+    // Last change sequence number seen, so a reconnect only replays the gap
+    const lastSeqRef = useRef<number | null>(null);
+    const resumingRef = useRef(false);
 
     // Update options ref whenever options change
     useEffect(() => {
@@ -56,49 +82,106 @@ export function useRealtimeEvents(options: UseRealtimeEventsOptions = {}) {
                 setIsConnected(true);
                 setConnectionError(null);
                 reconnectAttemptsRef.current = 0;
+                // Filters live on the connection, so restore them after a reconnect
+                if (subscriptionRef.current) {
+                    ws.send(JSON.stringify({ type: 'subscribe', ...subscriptionRef.current }));
+                }
+                if (lastSeqRef.current !== null) {
+                    resumingRef.current = true;
+                    ws.send(JSON.stringify({ type: 'resume', resume_from: lastSeqRef.current }));
+                }
+            };
+
+            const handleMessage = (data: WebSocketMessage) => {
+                const currentOptions = optionsRef.current;
+
+                if (typeof data.seq === 'number') {
+                    // While resuming, only the replay (or resync_required) may move the sequence
+                    const isResumeReply = data.replay || data.type === 'resync_required';
+                    if (isResumeReply) resumingRef.current = false;
+                    if (!resumingRef.current || isResumeReply) {
+                        lastSeqRef.current = Math.max(lastSeqRef.current ?? 0, data.seq);
+                    }
+                }
+
+                switch (data.type) {
+                    case 'connection_established':
+                        console.log('[WebSocket] ', data.message);
+                        break;
+
+                    case 'resync_required':
+                        lastSeqRef.current = data.seq ?? null;
+                        if (currentOptions.onResyncRequired) {
+                            currentOptions.onResyncRequired();
+                        }
+                        break;
+
+                    case 'event_deleted':
+                        if (data.id && currentOptions.onEventDeleted) {
+                            currentOptions.onEventDeleted(data.id);
+                        }
+                        break;
+
+                    case 'hazard_report_changed':
+                        if (data.report && currentOptions.onHazardReportChanged) {
+                            currentOptions.onHazardReportChanged(data.report, data.action || 'updated');
+                        }
+                        break;
+
+                    case 'event_created':
+                        if (data.event && currentOptions.onEventCreated) {
+                            currentOptions.onEventCreated(transformEvent(data.event));
+                        }
+                        break;
+
+                    case 'events_batch':
+                        // Buffered broadcasts, each shaped like a standalone message
+                        data.messages?.forEach(handleMessage);
+                        break;
+
+                    case 'event_updated':
+                        if (data.event && currentOptions.onEventUpdated) {
+                            currentOptions.onEventUpdated(transformEvent(data.event));
+                        }
+                        break;
+
+                    case 'event_patch':
+                        // Only the changed fields; see applyEventPatch
+                        if (currentOptions.onEventPatched) {
+                            currentOptions.onEventPatched(data as unknown as EventPatch);
+                        }
+                        break;
+
+                    case 'event_verified':
+                        if (data.event_id && currentOptions.onEventVerified) {
+                            currentOptions.onEventVerified(data.event_id, data.verified || false);
+                        }
+                        break;
+
+                    case 'media_processed':
+                        if (data.media && currentOptions.onMediaProcessed) {
+                            currentOptions.onMediaProcessed(data.media);
+                        }
+                        break;
+
+                    case 'system_alert':
+                        if (data.message && currentOptions.onSystemAlert) {
+                            currentOptions.onSystemAlert(data.message, data.level || 'info');
+                        }
+                        break;
+
+                    case 'pong':
+                        // Heartbeat response
+                        break;
+
+                    default:
+                    // console.log('[WebSocket] Unknown message type:', data.type);
+                }
             };
 
             ws.onmessage = (event) => {
                 try {
-                    const data: WebSocketMessage = JSON.parse(event.data);
-                    const currentOptions = optionsRef.current;
-
-                    switch (data.type) {
-                        case 'connection_established':
-                            console.log('[WebSocket] ', data.message);
-                            break;
-
-                        case 'event_created':
-                            if (data.event && currentOptions.onEventCreated) {
-                                currentOptions.onEventCreated(transformEvent(data.event));
-                            }
-                            break;
-
-                        case 'event_updated':
-                            if (data.event && currentOptions.onEventUpdated) {
-                                currentOptions.onEventUpdated(transformEvent(data.event));
-                            }
-                            break;
-
-                        case 'event_verified':
-                            if (data.event_id && currentOptions.onEventVerified) {
-                                currentOptions.onEventVerified(data.event_id, data.verified || false);
-                            }
-                            break;
-
-                        case 'system_alert':
-                            if (data.message && currentOptions.onSystemAlert) {
-                                currentOptions.onSystemAlert(data.message, data.level || 'info');
-                            }
-                            break;
-
-                        case 'pong':
-                            // Heartbeat response
-                            break;
-
-                        default:
-                        // console.log('[WebSocket] Unknown message type:', data.type);
-                    }
+                    handleMessage(JSON.parse(event.data));
                 } catch (err) {
                     console.error('[WebSocket] Failed to parse message:', err);
                 }
@@ -158,15 +241,19 @@ export function useRealtimeEvents(options: UseRealtimeEventsOptions = {}) {
         }
     }, []);
 
-    const subscribeToRegion = useCallback((region: string) => {
+    const subscribe = useCallback((subscription: RealtimeSubscription | null) => {
+        subscriptionRef.current = subscription;
         if (wsRef.current?.readyState === WebSocket.OPEN) {
-            wsRef.current.send(JSON.stringify({
-                type: 'subscribe_region',
-                region
-            }));
+            wsRef.current.send(JSON.stringify(
+                subscription ? { type: 'subscribe', ...subscription } : { type: 'unsubscribe' }
+            ));
         }
     }, []);
 
+    const subscribeToRegion = useCallback((region: string) => {
+        subscribe({ regions: [region] });
+    }, [subscribe]);
+
     // Connect on mount
     useEffect(() => {
         connect();
@@ -184,6 +271,7 @@ export function useRealtimeEvents(options: UseRealtimeEventsOptions = {}) {
         connectionError,
         connect,
         disconnect,
+        subscribe,
         subscribeToRegion
     };
 }
@@ -209,7 +297,8 @@ function transformEvent(backendEvent: any): IntelligenceEvent {
             trust_score: backendEvent.trust_score,
             media: backendEvent.media_attachments
         },
-        media_attachments: backendEvent.media_attachments
+        media_attachments: backendEvent.media_attachments,
+        version: backendEvent.version
     };
 }
 
@@ -1,8 +1,8 @@
-import React, { useState, useMemo, useEffect } from 'react';
+import React, { useState, useMemo, useEffect, useRef } from 'react';
 import api from '../services/api';
 import { IntelligenceEvent } from '../types';
 import { useNavigate } from 'react-router-dom';
-import { fetchEvents } from '../services/eventService';
+import { applyEventPatch, fetchEvent, fetchEvents } from '../services/eventService';
 import { authService } from '../services/authService';
 import { useRealtimeEvents } from '../hooks/useRealtimeEvents'; // Import hook
 import EventFeed from '../components/EventFeed';
@@ -29,24 +29,61 @@ const AdminDashboard: React.FC = () => {
     const [searchQuery, setSearchQuery] = useState('');
     const [isSearchVisible, setIsSearchVisible] = useState(false);
     const navigate = useNavigate();
+    // Latest events for realtime handlers, which outlive a single render
+    const eventsRef = useRef<IntelligenceEvent[]>([]);
+    eventsRef.current = events;
 
     const handleLogout = () => {
         authService.logout();
         navigate('/login');
     };
 
+    const loadEvents = async () => {
+        try {
+            const data = await fetchEvents();
+            // Strict adherence to real data only
+            setEvents(data);
+        } catch (error) {
+            console.error("Failed to load events", error);
+        } finally {
+            setIsLoading(false);
+        }
+    };
+
     // Real-time Event Hook
     const { isConnected } = useRealtimeEvents({
         onEventCreated: (newEvent) => {
-            setEvents(prev => [newEvent, ...prev]);
+            // A replay after reconnecting may repeat events that are already loaded
+            setEvents(prev => prev.some(e => e.id === newEvent.id)
+                ? prev.map(e => e.id === newEvent.id ? newEvent : e)
+                : [newEvent, ...prev]);
             // Optional: Show notification toast
             console.log('New Event Received:', newEvent.title);
         },
         onEventUpdated: (updatedEvent) => {
             setEvents(prev => prev.map(e => e.id === updatedEvent.id ? updatedEvent : e));
         },
+        onEventPatched: (patch) => {
+            const current = eventsRef.current.find(e => e.id === patch.id);
+            if (!current) return;
+            if (applyEventPatch(current, patch)) {
+                setEvents(prev => prev.map(e => e.id === patch.id ? applyEventPatch(e, patch) || e : e));
+            } else {
+                // A version gap means an update was missed: reload just this event
+                fetchEvent(patch.id).then(fresh => {
+                    if (fresh) setEvents(prev => prev.map(e => e.id === fresh.id ? fresh : e));
+                });
+            }
+        },
+        onEventDeleted: (eventId) => {
+            setEvents(prev => prev.filter(e => e.id !== eventId));
+        },
         onEventVerified: (eventId, verified) => {
             setEvents(prev => prev.map(e => e.id === eventId ? { ...e, verified } : e));
+        },
+        // Missed too much while disconnected to replay: fall back to a full reload
+        onResyncRequired: () => {
+            loadEvents();
         }
     });
 
@@ -70,17 +107,6 @@ const AdminDashboard: React.FC = () => {
     }, []);
 
     useEffect(() => {
-        const loadEvents = async () => {
-            try {
-                const data = await fetchEvents();
-                // Strict adherence to real data only
-                setEvents(data);
-            } catch (error) {
-                console.error("Failed to load events", error);
-            } finally {
-                setIsLoading(false);
-            }
-        };
         loadEvents();
     }, []);
 
@@ -7,6 +7,7 @@ import React, { useState, useEffect } from 'react';
 import DynamicFormRenderer from '../components/DynamicFormRenderer';
 import {
     getMyAssignments,
+    getAssignment,
     acceptAssignment,
     startAssignment,
     submitAssignmentForReview,
@@ -81,6 +82,14 @@ const OfficerDashboard: React.FC<OfficerDashboardProps> = ({ authToken, userName
         }
     };
 
+    const handleOpenAssignment = async (assignmentId: string) => {
+        try {
+            setSelectedAssignment(await getAssignment(assignmentId, authToken));
+        } catch {
+            setError('Failed to load assignment');
+        }
+    };
+
     const handleSubmitForReview = async (assignmentId: string) => {
         try {
             await submitAssignmentForReview(assignmentId, authToken);
@@ -453,7 +462,7 @@ const OfficerDashboard: React.FC<OfficerDashboardProps> = ({ authToken, userName
                                         )}
                                         {['accepted', 'in_progress', 'revision_needed'].includes(assignment.status) && (
                                             <button
-                                                onClick={() => setSelectedAssignment(assignment)}
+                                                onClick={() => handleOpenAssignment(assignment.id)}
                                                 className="px-4 py-2 bg-blue-600 hover:bg-blue-500 text-white rounded-lg text-sm transition-all"
                                             >
                                                 Start Inspection
@@ -477,7 +486,7 @@ const OfficerDashboard: React.FC<OfficerDashboardProps> = ({ authToken, userName
                                         )}
                                         {assignment.status === 'completed' && (
                                             <button
-                                                onClick={() => setSelectedAssignment(assignment)}
+                                                onClick={() => handleOpenAssignment(assignment.id)}
                                                 className="px-4 py-2 bg-slate-600 hover:bg-slate-500 text-white rounded-lg text-sm transition-all"
                                             >
                                                 View
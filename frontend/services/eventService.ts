@@ -14,9 +14,18 @@ export interface BackendEvent {
     altitude: number | null;
     media_attachments: any[];
     trust_score: number;
+    version: number;
     created_at: string;
 }
 
+// Changed fields of one event, moving it from base_version to version
+export interface EventPatch {
+    id: string;
+    base_version: number;
+    version: number;
+    changes: Partial<BackendEvent>;
+}
+
 const mapSeverity = (severity: string): EventSeverity => {
     switch (severity?.toUpperCase()) {
         case 'LOW': return EventSeverity.LOW;
@@ -67,29 +76,64 @@ const transformBackendEvent = (backendEvent: BackendEvent): IntelligenceEvent =>
             trust_score: backendEvent.trust_score,
             media: backendEvent.media_attachments
         },
-        media_attachments: backendEvent.media_attachments
+        media_attachments: backendEvent.media_attachments,
+        version: backendEvent.version
     };
 };
 
-export const fetchEvents = async (): Promise<IntelligenceEvent[]> => {
+// Returns null when the event is not at the patch's base version (an update was missed)
+export const applyEventPatch = (event: IntelligenceEvent, patch: EventPatch): IntelligenceEvent | null => {
+    if (event.version !== patch.base_version) return null;
+
+    const changes = patch.changes;
+    const updated: IntelligenceEvent = { ...event, version: patch.version };
+    if (changes.title !== undefined) updated.title = changes.title || 'Untitled Event';
+    if (changes.description !== undefined) updated.description = changes.description;
+    if (changes.status !== undefined) updated.verified = changes.status === 'VERIFIED';
+    if (changes.trust_score !== undefined) {
+        updated.metadata = { ...event.metadata, trust_score: changes.trust_score };
+    }
+    return updated;
+};
+
+export const fetchEvent = async (eventId: string): Promise<IntelligenceEvent | null> => {
     try {
-        const response = await api.get<any>('/admin/events/');
-        console.log('API Response:', response);
+        const response = await api.get<BackendEvent>(`/admin/events/${eventId}/`);
+        return transformBackendEvent(response.data);
+    } catch (error) {
+        console.error(`Error fetching event ${eventId}:`, error);
+        return null;
+    }
+};
 
-        let eventData = response.data;
+interface EventPage {
+    next: string | null;
+    results: BackendEvent[];
+}
 
-        // Handle DRF Pagination (if response.data is an object with 'results')
-        if (eventData && typeof eventData === 'object' && !Array.isArray(eventData) && eventData.results) {
-            eventData = eventData.results;
-        }
+// Most recent events loaded on start; newer ones arrive over the WebSocket
+export const DASHBOARD_EVENT_LIMIT = 500;
+const EVENT_PAGE_SIZE = 100;
 
-        // Validate response structure
-        if (!eventData || !Array.isArray(eventData)) {
-            console.error('Invalid API response format: Expected array, got:', eventData);
-            return [];
-        }
+// One keyset page, newest first; pass the returned cursor to get the next one
+export const fetchEventPage = async (cursor?: string | null): Promise<{ events: IntelligenceEvent[]; cursor: string | null }> => {
+    const response = await api.get<EventPage>('/admin/events/', {
+        params: { mode: 'cursor', count: 'false', limit: EVENT_PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    const next = response.data.next ? new URL(response.data.next).searchParams.get('cursor') : null;
+    return { events: response.data.results.map(transformBackendEvent), cursor: next };
+};
 
-        return eventData.map(transformBackendEvent);
+export const fetchEvents = async (maxEvents: number = DASHBOARD_EVENT_LIMIT): Promise<IntelligenceEvent[]> => {
+    try {
+        const events: IntelligenceEvent[] = [];
+        let cursor: string | null = null;
+        do {
+            const page = await fetchEventPage(cursor);
+            events.push(...page.events);
+            cursor = page.cursor;
+        } while (cursor && events.length < maxEvents);
+        return events.slice(0, maxEvents);
     } catch (error) {
         console.error('Error fetching events:', error);
         // Return empty array gracefully for demo
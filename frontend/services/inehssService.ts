@@ -122,6 +122,14 @@ export async function getMyAssignments(token: string): Promise<OfficerAssignment
     return response.data;
 }
 
+// The list returns summaries; fetch the detail for the full report and form schema
+export async function getAssignment(assignmentId: string, token: string): Promise<OfficerAssignment> {
+    const response = await axios.get(`${API_BASE}/assignments/${assignmentId}/`, {
+        headers: { Authorization: `Bearer ${token}` }
+    });
+    return response.data;
+}
+
 export async function startAssignment(assignmentId: string, token: string): Promise<void> {
     await axios.post(`${API_BASE}/assignments/${assignmentId}/start/`, {}, {
         headers: { Authorization: `Bearer ${token}` }
@@ -25,6 +25,8 @@ export interface MediaAttachment {
   file_type: 'image' | 'video' | 'audio';
   file_hash: string;
   metadata: Record<string, any>;
+  renditions?: { thumb?: string; medium?: string };  // Downscaled WebP copies of images
+  processing_status?: 'pending' | 'processing' | 'done' | 'failed';
   created_at: string;
 }
 
@@ -42,6 +44,7 @@ export interface IntelligenceEvent {
   verified: boolean;
   metadata: Record<string, any>;
   media_attachments?: MediaAttachment[];
+  version?: number;
 }
 
 export interface AgentResponse {